@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Сравнение кодеков JSON на ответе claim_bulk / claim_search из 1000 заявок
+и на теле запроса claim_create (``collections.defaultdict``)
+
+Сравниваются установленные кодеки: json (стандартная библиотека), orjson, ujson.
+
+    python benchmarks/bench_codec.py [количество заявок]
+"""
+import collections
+import copy
+import json
+import os
+import sys
+import timeit
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from yacargo.codec import CODECS  # noqa: E402
+
+CLAIM = os.path.join(ROOT, 'tests', 'data', 'claim_info.json')
+
+
+def bulk_response(count):
+    with open(CLAIM, encoding='utf-8') as file:
+        claim = json.load(file)
+    claims = []
+    for i in range(count):
+        item = copy.deepcopy(claim)
+        item['id'] = '{:032x}'.format(i)
+        claims.append(item)
+    return {'claims': claims}
+
+
+def create_body(claim):
+    body = collections.defaultdict(dict)
+    body['items'] = claim['items']
+    body['route_points'] = claim['route_points']
+    body['emergency_contact'] = claim['emergency_contact']
+    body['client_requirements']['taxi_class'] = 'cargo'
+    body['comment'] = 'Позвонить за час'
+    return body
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    response = bulk_response(count)
+    raw = json.dumps(response, ensure_ascii=False).encode('utf-8')
+    body = create_body(response['claims'][0])
+    print('response: {} claims, {:.1f} MB'.format(count, len(raw) / 1024 / 1024))
+    print('{:8} {:>14} {:>14} {:>16}'.format('codec', 'decode, ms', 'encode, ms', 'create body, us'))
+
+    for name, factory in CODECS.items():
+        try:
+            codec = factory()
+        except ImportError:
+            print('{:8} not installed'.format(name))
+            continue
+        decode = min(timeit.repeat(lambda: codec.loads(raw), number=1, repeat=5))
+        encode = min(timeit.repeat(lambda: codec.encode(response), number=1, repeat=5))
+        small = min(timeit.repeat(lambda: codec.encode(body), number=1000, repeat=5)) / 1000
+        print('{:8} {:>14.1f} {:>14.1f} {:>16.1f}'.format(name, decode * 1000, encode * 1000, small * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Сравнение памяти, занимаемой заявками SearchedClaimMP (вместе с собранными items и route_points)
+
+* strict+dict - тело в collections.defaultdict (сборка через from_dict) и __dict__ у каждого экземпляра
+* trusted+dict - тело - json ответа сервера (from_response), __dict__ у каждого экземпляра
+* trusted+slots - тело - json ответа сервера (from_response), экземпляры со __slots__
+* compact - то же, тело переведено в CompactBody (``compact()``)
+
+    python benchmarks/bench_memory.py [количество заявок]
+"""
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from yacargo import objects  # noqa: E402
+
+CLAIM = os.path.join(ROOT, 'tests', 'data', 'claim_info.json')
+
+# Наследник без __slots__ получает __dict__ - так выглядели экземпляры до перехода на __slots__
+LEGACY = {name: type(name, (cls,), {}) for name, cls in vars(objects).items()
+          if isinstance(cls, type) and issubclass(cls, objects.YCBase) and cls is not objects.YCBase}
+
+
+def strict_dict_claim(item):
+    claim = LEGACY['SearchedClaimMP'].from_dict(item)
+    claim._cache = {'items': [LEGACY['CargoItemMP'].from_dict(i) for i in item['items']],
+                    'route_points': [LEGACY['ResponseCargoPointMP'].from_dict(i) for i in item['route_points']]}
+    return claim
+
+
+def trusted_dict_claim(item):
+    claim = LEGACY['SearchedClaimMP'].from_response(item)
+    claim._cache = {'items': [LEGACY['CargoItemMP'].from_response(i) for i in item['items']],
+                    'route_points': [LEGACY['ResponseCargoPointMP'].from_response(i) for i in item['route_points']]}
+    return claim
+
+
+def trusted_slots_claim(item):
+    claim = objects.SearchedClaimMP.from_response(item)
+    claim.items, claim.route_points
+    return claim
+
+
+def compact_claim(item):
+    claim = objects.SearchedClaimMP.from_response(item).compact()
+    claim.items, claim.route_points
+    return claim
+
+
+LAYOUTS = (('strict+dict', strict_dict_claim),
+           ('trusted+dict', trusted_dict_claim),
+           ('trusted+slots', trusted_slots_claim),
+           ('compact', compact_claim))
+
+
+def measure(build, raw, count):
+    gc.collect()
+    tracemalloc.start()
+    claims = [build(json.loads(raw)) for _ in range(count)]
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del claims
+    return size
+
+
+def main(count):
+    with open(CLAIM, encoding='utf-8') as f:
+        raw = f.read()
+    print('claims: {}'.format(count))
+    print('{:<14} {:>10} {:>13}'.format('layout', 'total, MB', 'per claim, B'))
+    for name, build in LAYOUTS:
+        size = measure(build, raw, count)
+        print('{:<14} {:>10.1f} {:>13.0f}'.format(name, size / 2 ** 20, size / count))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Накладные расходы метрик на один запрос ``YCAPI._request``
+
+Сеть исключена: сессия возвращает готовый ответ ``claim_info``, поэтому разница
+между клиентом без метрик и с метриками - это стоимость замеров и записи в :class:`yacargo.metrics.Metrics`.
+
+    python benchmarks/bench_metrics.py [количество запросов]
+"""
+import datetime
+import os
+import sys
+import timeit
+
+import requests
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from yacargo import YCAPI  # noqa: E402
+from yacargo.metrics import Metrics  # noqa: E402
+
+CLAIM = os.path.join(ROOT, 'tests', 'data', 'claim_info.json')
+RESOURCES = ['/b2b/cargo/integration/v2/claims/info', '/b2b/cargo/integration/v1/claims/performer-position',
+             '/b2b/cargo/integration/v2/claims/search', '/b2b/cargo/integration/v1/claims/journal']
+
+
+class ReplaySession:
+    def __init__(self, content):
+        self.content = content
+
+    def request(self, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = self.content
+        response.elapsed = datetime.timedelta(milliseconds=20)
+        return response
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with open(CLAIM, 'rb') as file:
+        content = file.read()
+
+    print('{:10} {:>14}'.format('client', 'us / request'))
+    results = {}
+    for name, metrics in (('plain', None), ('metrics', Metrics())):
+        api = YCAPI('token', metrics=metrics, codec='json')
+        api.session = ReplaySession(content)
+
+        def run():
+            for i in range(count):
+                api._request(RESOURCES[i % len(RESOURCES)], {'claim_id': 'claim'}, None)
+
+        results[name] = min(timeit.repeat(run, number=1, repeat=5)) / count * 1e6
+        print('{:10} {:>14.2f}'.format(name, results[name]))
+
+    print('overhead: {:.2f} us / request'.format(results['metrics'] - results['plain']))
+    print('render:   {:.1f} us'.format(min(timeit.repeat(metrics.render, number=100, repeat=5)) / 100 * 1e6))
+
+
+if __name__ == '__main__':
+    main()
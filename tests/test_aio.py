@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import hashlib
+import io
+import os
+import tempfile
+from unittest import TestCase
+
+from aiohttp import web
+
+from yacargo import TIMEOUT
+from yacargo.aio import AsyncYCAPI, _client_timeout
+from yacargo.exceptions import BaseAPIError, NetworkAPIError
+from yacargo.metrics import Metrics
+from yacargo.objects import PerformerPositionResponse
+from yacargo.retry import RetryPolicy
+
+
+class LocalAsyncYCAPI(AsyncYCAPI):
+    base_url = None
+
+    def _url(self, resource):
+        return self.base_url + resource
+
+
+FAILED = []
+
+
+async def performer_position(request):
+    await asyncio.sleep(0.05)
+    if request.query['claim_id'] == 'missing':
+        return web.json_response({'code': 'not_found', 'message': 'Claim not found'}, status=404)
+    if request.query['claim_id'] == 'flaky' and not FAILED:
+        FAILED.append(request.query['claim_id'])
+        return web.Response(text='<html>Bad Gateway</html>', status=502)
+    return web.json_response({'position': {'lat': 55.7, 'lon': 37.6, 'timestamp': 1600000000, 'speed': 1.5}})
+
+
+REPORT = b'claim_id;status\n' * 10000
+
+
+async def report(request):
+    if request.query['report_id'] == 'missing':
+        return web.json_response({'code': 'not_found', 'message': 'Task not found'}, status=404)
+    response = web.StreamResponse(headers={'Content-Length': str(len(REPORT))})
+    await response.prepare(request)
+    for start in range(0, len(REPORT), 4096):
+        await response.write(REPORT[start:start + 4096])
+    return response
+
+
+class TestAsyncYCAPI(TestCase):
+    def run_with_server(self, scenario, **kwargs):
+        async def main():
+            app = web.Application()
+            FAILED.clear()
+            app.router.add_get('/b2b/cargo/integration/v1/claims/performer-position', performer_position)
+            app.router.add_get('/b2b/cargo/integration/v1/order-report/report', report)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            try:
+                async with LocalAsyncYCAPI('token', retry=RetryPolicy(backoff=0), **kwargs) as api:
+                    api.base_url = 'http://127.0.0.1:{}'.format(port)
+                    return await scenario(api)
+            finally:
+                await runner.cleanup()
+
+        return asyncio.run(main())
+
+    def test_performer_position(self):
+        async def scenario(api):
+            return await api.performer_position(claim_id='claim')
+
+        position = self.run_with_server(scenario)
+        self.assertIsInstance(position, PerformerPositionResponse)
+        self.assertEqual(position.json()['position']['lat'], 55.7)
+
+    def test_concurrent_requests(self):
+        async def scenario(api):
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            result = await asyncio.gather(*[api.performer_position(claim_id=str(i)) for i in range(50)])
+            return result, loop.time() - started
+
+        result, elapsed = self.run_with_server(scenario)
+        self.assertEqual(len(result), 50)
+        self.assertLess(elapsed, 50 * 0.05)
+
+    def test_api_error(self):
+        async def scenario(api):
+            with self.assertRaises(BaseAPIError) as ctx:
+                await api.performer_position(claim_id='missing')
+            return ctx.exception
+
+        self.assertEqual(self.run_with_server(scenario).code, 'not_found')
+
+    def test_server_error_retried(self):
+        async def scenario(api):
+            return await api.performer_position(claim_id='flaky')
+
+        self.assertEqual(self.run_with_server(scenario).json()['position']['lat'], 55.7)
+
+    def test_report_download_stream(self):
+        progress = []
+
+        async def scenario(api):
+            buffer = io.BytesIO()
+            result = await api.report_download(report_id='report', file=buffer, chunk_size=1024,
+                                               progress=lambda done, total: progress.append((done, total)),
+                                               checksum='sha256')
+            return result, buffer.getvalue()
+
+        result, content = self.run_with_server(scenario)
+        self.assertEqual(content, REPORT)
+        self.assertEqual(result.size, len(REPORT))
+        self.assertEqual(result.checksum, hashlib.sha256(REPORT).hexdigest())
+        self.assertEqual(progress[-1], (len(REPORT), len(REPORT)))
+        self.assertGreater(len(progress), 1)
+
+    def test_report_download_error(self):
+        path = os.path.join(tempfile.mkdtemp(), 'report.csv')
+
+        async def scenario(api):
+            with self.assertRaises(BaseAPIError) as ctx:
+                await api.report_download(report_id='missing', file=path)
+            return ctx.exception
+
+        self.assertEqual(self.run_with_server(scenario).code, 'not_found')
+        self.assertFalse(os.path.exists(path))
+
+    def test_report_download_unwritable(self):
+        path = os.path.join(tempfile.mkdtemp(), 'missing', 'report.csv')
+
+        async def scenario(api):
+            with self.assertRaises(FileNotFoundError):
+                await api.report_download(report_id='report', file=path)
+
+        self.run_with_server(scenario)
+
+    def test_truncated_body(self):
+        connections = []
+
+        async def handle(reader, writer):
+            connections.append(writer)
+            await reader.readuntil(b'\r\n\r\n')
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 100\r\n\r\n'
+                         b'{"position": ')
+            await writer.drain()
+            writer.close()
+
+        async def main():
+            server = await asyncio.start_server(handle, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                async with LocalAsyncYCAPI('token', retry=RetryPolicy(max_attempts=2, backoff=0)) as api:
+                    api.base_url = 'http://127.0.0.1:{}'.format(port)
+                    with self.assertRaises(NetworkAPIError):
+                        await api.performer_position(claim_id='claim')
+                    # ошибка тела ответа повторяется как сетевая
+                    self.assertEqual(len(connections), 2)
+                    with self.assertRaises(NetworkAPIError):
+                        await api.report_download(report_id='report', file=io.BytesIO())
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        asyncio.run(main())
+
+    def test_default_timeout(self):
+        async def scenario(api):
+            return api._get_session().timeout
+
+        timeout = self.run_with_server(scenario)
+        self.assertEqual((timeout.sock_connect, timeout.sock_read), TIMEOUT)
+        self.assertEqual(_client_timeout(5).sock_read, 5)
+        self.assertIsNone(_client_timeout(None).sock_read)
+
+    def test_metrics(self):
+        metrics = Metrics()
+
+        async def scenario(api):
+            await asyncio.gather(*(api.performer_position(claim_id='claim') for _ in range(3)))
+            with self.assertRaises(BaseAPIError):
+                await api.performer_position(claim_id='missing')
+            await api.report_download(report_id='report', file=io.BytesIO())
+            with self.assertRaises(BaseAPIError):
+                await api.report_download(report_id='missing', file=io.BytesIO())
+
+        self.run_with_server(scenario, metrics=metrics)
+        text = metrics.render()
+        position = '/b2b/cargo/integration/v1/claims/performer-position'
+        report = '/b2b/cargo/integration/v1/order-report/report'
+        self.assertIn('yacargo_requests_total{{resource="{}",method="GET",status="200"}} 3'.format(position), text)
+        self.assertIn('yacargo_api_errors_total{{resource="{}",code="not_found"}} 1'.format(position), text)
+        self.assertIn('yacargo_requests_total{{resource="{}",method="GET",status="200"}} 1'.format(report), text)
+        self.assertIn('yacargo_api_errors_total{{resource="{}",code="not_found"}} 1'.format(report), text)
+        received = int(text.split('yacargo_received_bytes_total{{resource="{}"}} '.format(report))[1].split()[0])
+        self.assertGreater(received, len(REPORT))
+        self.assertIn('yacargo_request_duration_seconds_count{{resource="{}",phase="connect"}}'.format(position), text)
+
+    def test_metrics_network_error(self):
+        metrics = Metrics()
+
+        async def main():
+            async with LocalAsyncYCAPI('token', retry=RetryPolicy(max_attempts=1), metrics=metrics) as api:
+                api.base_url = 'http://127.0.0.1:1'
+                with self.assertRaises(NetworkAPIError):
+                    await api.performer_position(claim_id='claim')
+
+        asyncio.run(main())
+        self.assertIn('yacargo_network_errors_total{resource="/b2b/cargo/integration/v1/claims/performer-position"} 1',
+                      metrics.render())
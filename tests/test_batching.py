@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from yacargo.batching import AsyncClaimInfoBatcher, ClaimInfoBatcher
+from yacargo.exceptions import BaseAPIError
+
+
+class FakeBulkResponse:
+    def __init__(self, claims):
+        self.claims = claims
+
+    def json(self):
+        return {'claims': self.claims}
+
+
+class FakeAPI:
+    def __init__(self, known):
+        self.known = known
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def claim_bulk(self, claim_ids=None):
+        with self.lock:
+            self.calls.append(list(claim_ids))
+        return FakeBulkResponse([{'id': claim_id} for claim_id in claim_ids if claim_id in self.known])
+
+
+class FakeAsyncAPI(FakeAPI):
+    async def claim_bulk(self, claim_ids=None):
+        return FakeAPI.claim_bulk(self, claim_ids)
+
+
+class TestClaimInfoBatcher(TestCase):
+    def test_coalesce(self):
+        api = FakeAPI({'a', 'b', 'c'})
+        batcher = ClaimInfoBatcher(api, window=0.05)
+        with ThreadPoolExecutor(6) as pool:
+            result = list(pool.map(batcher.claim_info, ['a', 'b', 'c', 'a', 'b', 'c']))
+        self.assertEqual([claim.id for claim in result], ['a', 'b', 'c', 'a', 'b', 'c'])
+        self.assertEqual(len(api.calls), 1)
+        self.assertEqual(sorted(api.calls[0]), ['a', 'b', 'c'])
+
+    def test_max_batch(self):
+        api = FakeAPI({'a', 'b'})
+        batcher = ClaimInfoBatcher(api, window=10, max_batch=1)
+        self.assertEqual(batcher.claim_info('a').id, 'a')
+        self.assertEqual(api.calls, [['a']])
+
+    def test_not_found(self):
+        batcher = ClaimInfoBatcher(FakeAPI(set()), window=0.001)
+        with self.assertRaises(BaseAPIError) as ctx:
+            batcher.claim_info('missing')
+        self.assertEqual(ctx.exception.code, 'not_found')
+
+    def test_async(self):
+        api = FakeAsyncAPI({'a', 'b'})
+
+        async def main():
+            batcher = AsyncClaimInfoBatcher(api, window=0.01)
+            return await asyncio.gather(batcher.claim_info('a'), batcher.claim_info('b'), batcher.claim_info('x'),
+                                        return_exceptions=True)
+
+        found_a, found_b, missing = asyncio.run(main())
+        self.assertEqual((found_a.id, found_b.id), ('a', 'b'))
+        self.assertIsInstance(missing, BaseAPIError)
+        self.assertEqual(len(api.calls), 1)
+
+    def test_async_send_cancelled(self):
+        class SlowAsyncAPI(FakeAPI):
+            async def claim_bulk(self, claim_ids=None):
+                await asyncio.sleep(10)
+
+        async def main():
+            batcher = AsyncClaimInfoBatcher(SlowAsyncAPI({'a'}), window=10)
+            waiter = asyncio.ensure_future(batcher.claim_info('a'))
+            await asyncio.sleep(0)
+            batcher.flush()
+            self.assertEqual(len(batcher._tasks), 1)
+            await asyncio.sleep(0)
+            for task in list(batcher._tasks):
+                task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await asyncio.wait_for(waiter, 1)
+            await asyncio.sleep(0)
+            self.assertEqual(batcher._tasks, set())
+
+        asyncio.run(main())
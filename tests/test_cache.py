@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+import copy
+import json
+import os
+import time
+from unittest import TestCase
+
+from yacargo import YCAPI
+from yacargo.cache import ClaimCache
+
+with open(os.path.join(os.path.dirname(__file__), 'data', 'claim_info.json'), encoding='utf-8') as file:
+    CLAIM = json.load(file)
+
+
+class JournalAPI(YCAPI):
+    def __init__(self, cache):
+        super().__init__('token', cache=cache)
+        self.requests = []
+        self.events = []
+
+    def _request(self, resource, params, body, method='post'):
+        self.requests.append(resource.rsplit('/', 1)[-1])
+        if resource.endswith('/journal'):
+            return {'cursor': 'c', 'events': self.events}
+        claim = copy.deepcopy(CLAIM)
+        claim['id'] = params['claim_id']
+        return claim
+
+
+def event(claim_id, revision):
+    return {'operation_id': 1, 'claim_id': claim_id, 'change_type': 'status_changed',
+            'updated_ts': '2020-01-01T00:00:00+00:00', 'new_status': 'accepted', 'revision': revision}
+
+
+class TestClaimCache(TestCase):
+    def test_hit_and_stats(self):
+        api = JournalAPI(ClaimCache())
+        first = api.claim_info(claim_id='a')
+        self.assertIs(api.claim_info(claim_id='a'), first)
+        self.assertEqual(api.requests, ['info'])
+        stats = api.cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.size), (1, 1, 1))
+
+    def test_lru_and_ttl(self):
+        cache = ClaimCache(maxsize=2, ttl=0.05)
+        api = JournalAPI(cache)
+        for claim_id in ('a', 'b', 'a', 'c'):
+            api.claim_info(claim_id=claim_id)
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        time.sleep(0.06)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats().evictions, 2)
+
+    def test_journal_invalidation(self):
+        api = JournalAPI(ClaimCache())
+        api.claim_info(claim_id='a')
+        api.claim_info(claim_id='b')
+        api.events = [event('a', CLAIM['revision']), event('b', CLAIM['revision'] + 1)]
+        api.claim_journal()
+        self.assertIsNotNone(api.cache.get('a'))
+        self.assertIsNone(api.cache.get('b'))
+        self.assertEqual(api.cache.stats().invalidations, 1)
+
+    def test_write_eviction(self):
+        api = JournalAPI(ClaimCache())
+        api.claim_info(claim_id='a')
+        api.claim_cancel(claim_id='a', version=1, cancel_state='free')
+        api.claim_info(claim_id='a')
+        self.assertEqual(api.requests, ['info', 'cancel', 'info'])
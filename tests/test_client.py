@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+import errno
+import gc
+import io
+import os
+import tempfile
+import threading
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+
+import requests
+
+from yacargo import YCAPI
+from yacargo.exceptions import BaseAPIError, BulkRequestError, InputParamError, NetworkAPIError
+
+
+class FakePage:
+    def __init__(self, claims):
+        self.claims = claims
+
+
+class FakeSearchAPI(YCAPI):
+    def __init__(self, total):
+        super().__init__('token')
+        self.total = total
+        self.offsets = []
+        self.threads = set()
+
+    def search_active(self, offset=None, limit=None):
+        self.offsets.append(offset)
+        self.threads.add(threading.get_ident())
+        return FakePage(list(range(offset, min(offset + limit, self.total))))
+
+    def claim_search(self, offset=None, limit=None, **kwargs):
+        self.kwargs = kwargs
+        return self.search_active(offset=offset, limit=limit)
+
+
+class TestPagination(TestCase):
+    def test_iter_search_active(self):
+        api = FakeSearchAPI(25)
+        self.assertEqual(list(api.iter_search_active(limit=10)), list(range(25)))
+        self.assertEqual(api.offsets, [0, 10, 20])
+        self.assertNotIn(threading.get_ident(), api.threads)
+
+    def test_iter_claim_search_exact_pages(self):
+        api = FakeSearchAPI(20)
+        self.assertEqual(len(list(api.iter_claim_search(limit=10, created_from='2020-01-01T00:00:00+00:00'))), 20)
+        self.assertEqual(api.offsets, [0, 10, 20])
+        self.assertEqual(api.kwargs['created_from'], '2020-01-01T00:00:00+00:00')
+
+    def test_page_limit(self):
+        api = FakeSearchAPI(10)
+        for limit in (0, -1, 1001):
+            with self.assertRaises(InputParamError):
+                api.iter_search_active(limit=limit)
+            with self.assertRaises(InputParamError):
+                api.iter_claim_search(limit=limit)
+        self.assertEqual(api.offsets, [])
+
+    def test_prefetch(self):
+        api = FakeSearchAPI(100)
+        iterator = api.iter_search_active(limit=10)
+        next(iterator)
+        iterator.close()
+        self.assertLessEqual(len(api.offsets), 2)
+
+
+class FakeClaim:
+    def __init__(self, claim_id, created_ts):
+        self.id = claim_id
+        self.created_ts = created_ts
+
+
+class FakeShardedAPI(YCAPI):
+    def __init__(self, claims, fail_at=None, error=None):
+        super().__init__('token')
+        self.claims = claims
+        self.error = error or NetworkAPIError()
+        self.fail_at = set(fail_at or ())
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def claim_search(self, offset=None, limit=None, created_from=None, created_to=None, **kwargs):
+        with self.lock:
+            self.calls.append((created_from, offset))
+            if (created_from, offset) in self.fail_at:
+                self.fail_at.discard((created_from, offset))
+                raise self.error
+        found = [claim for claim in self.claims if created_from <= claim.created_ts <= created_to]
+        return FakePage(found[offset:offset + limit])
+
+
+class TestShardedSearch(TestCase):
+    def setUp(self):
+        self.claims = [FakeClaim('c{}'.format(day), '2020-01-{:02d}T12:00:00+00:00'.format(day)) for day in range(1, 31)]
+
+    def test_merge_order_and_dedup(self):
+        claims = self.claims + [FakeClaim('edge', '2020-01-16T00:00:00+00:00')]
+        api = FakeShardedAPI(sorted(claims, key=lambda claim: claim.created_ts))
+        result = list(api.claim_search_sharded(created_from='2020-01-01T00:00:00+00:00',
+                                               created_to='2020-01-31T00:00:00+00:00',
+                                               shards=6, limit=2))
+        self.assertEqual([claim.created_ts for claim in result], sorted(claim.created_ts for claim in claims))
+        self.assertEqual(len({claim.id for claim in result}), len(result))
+
+    def test_failed_page_retries_only_its_shard(self):
+        api = FakeShardedAPI(self.claims, fail_at=[('2020-01-01T00:00:00+00:00', 2)])
+        result = list(api.claim_search_sharded(created_from='2020-01-01T00:00:00+00:00',
+                                               created_to='2020-01-31T00:00:00+00:00',
+                                               shards=3, limit=2))
+        self.assertEqual(len(result), 30)
+        first_shard = [offset for created_from, offset in api.calls if created_from == '2020-01-01T00:00:00+00:00']
+        self.assertEqual(first_shard.count(0), 1)
+        self.assertEqual(first_shard.count(2), 2)
+
+    def test_retries_exhausted(self):
+        api = FakeShardedAPI(self.claims, fail_at=[('2020-01-01T00:00:00+00:00', 0)])
+        with self.assertRaises(NetworkAPIError):
+            list(api.claim_search_sharded(created_from='2020-01-01T00:00:00+00:00',
+                                          created_to='2020-01-31T00:00:00+00:00',
+                                          shards=3, retries=0))
+
+    def test_client_error_not_retried(self):
+        api = FakeShardedAPI(self.claims, fail_at=[('2020-01-01T00:00:00+00:00', 0)],
+                             error=BaseAPIError({'code': 'validation_error'}))
+        with self.assertRaises(BaseAPIError):
+            list(api.claim_search_sharded(created_from='2020-01-01T00:00:00+00:00',
+                                          created_to='2020-01-31T00:00:00+00:00',
+                                          shards=1, retries=3))
+        self.assertEqual(len(api.calls), 1)
+
+    def test_merge_order_across_offsets(self):
+        claims = [FakeClaim('moscow', '2020-01-01T10:00:00+03:00'), FakeClaim('utc', '2020-01-01T08:30:00+00:00')]
+        api = FakeShardedAPI(claims)
+        result = list(api.claim_search_sharded(created_from='2020-01-01T00:00:00+00:00',
+                                               created_to='2020-01-02T00:00:00+00:00', shards=1))
+        self.assertEqual([claim.id for claim in result], ['moscow', 'utc'])
+
+    def test_zero_limit(self):
+        with self.assertRaises(InputParamError):
+            FakeShardedAPI(self.claims).claim_search_sharded(created_from='2020-01-01T00:00:00+00:00',
+                                                             created_to='2020-01-31T00:00:00+00:00', limit=0)
+
+
+class FakeBulkAPI(YCAPI):
+    def __init__(self, failing=()):
+        super().__init__('token')
+        self.failing = set(failing)
+        self.chunks = []
+        self.lock = threading.Lock()
+
+    def claim_bulk(self, claim_ids=None):
+        with self.lock:
+            self.chunks.append(list(claim_ids))
+        if self.failing & set(claim_ids):
+            raise NetworkAPIError()
+        return FakePage([FakeClaim(claim_id, '') for claim_id in claim_ids])
+
+
+class TestBulkMany(TestCase):
+    def test_chunks_and_dedup(self):
+        api = FakeBulkAPI()
+        ids = ['c{}'.format(i) for i in range(2500)] * 2
+        result = list(api.claim_bulk_many(ids, max_workers=3))
+        self.assertEqual(sorted(claim.id for claim in result), sorted(set(ids)))
+        self.assertEqual(sorted(len(chunk) for chunk in api.chunks), [500, 1000, 1000])
+
+    def test_partial_failure(self):
+        api = FakeBulkAPI(failing={'c1500'})
+        ids = ['c{}'.format(i) for i in range(2500)]
+        received = []
+        with self.assertRaises(BulkRequestError) as ctx:
+            for claim in api.claim_bulk_many(ids):
+                received.append(claim.id)
+        self.assertEqual(len(received), 1500)
+        [(chunk, exception)] = ctx.exception.failures
+        self.assertIn('c1500', chunk)
+        self.assertIsInstance(exception, NetworkAPIError)
+
+    def test_streaming_window(self):
+        pages = []
+
+        class TrackingAPI(FakeBulkAPI):
+            def claim_bulk(self, claim_ids=None):
+                page = super().claim_bulk(claim_ids)
+                pages.append(weakref.ref(page))
+                return page
+
+        api = TrackingAPI()
+        alive = []
+        for claim in api.claim_bulk_many(['c{}'.format(i) for i in range(20000)], max_workers=2):
+            if claim.id.endswith('999'):
+                gc.collect()
+                alive.append(sum(page() is not None for page in pages))
+                self.assertLessEqual(len(api.chunks), len(alive) + 4)
+        self.assertEqual(len(alive), 20)
+        self.assertLessEqual(max(alive), 5)
+
+    def test_on_error(self):
+        failures = []
+        api = FakeBulkAPI(failing={'c0'})
+        result = list(api.claim_bulk_many(['c0', 'c1'], on_error=lambda chunk, exc: failures.append(chunk)))
+        self.assertEqual(result, [])
+        self.assertEqual(failures, [['c0', 'c1']])
+
+
+class FakeStream:
+    def __init__(self, chunks, fail=False):
+        self.chunks = chunks
+        self.fail = fail
+        self.status_code = 200
+        self.headers = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def iter_content(self, chunk_size):
+        for chunk in self.chunks:
+            yield chunk
+        if self.fail:
+            raise requests.ConnectionError('connection reset')
+
+
+class FakeSession:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def request(self, **kwargs):
+        return self.stream
+
+
+class TestDownload(TestCase):
+    def test_claim_document_to_path(self):
+        api = YCAPI('token')
+        api.session = FakeSession(FakeStream([b'%PDF', b'-1.4']))
+        path = os.path.join(tempfile.mkdtemp(), 'act.pdf')
+        result = api.claim_document(claim_id='c', document_type='act', version=1, status='new', file=path)
+        self.assertEqual(result.size, 8)
+        self.assertIsNone(result.checksum)
+        with open(path, 'rb') as file:
+            self.assertEqual(file.read(), b'%PDF-1.4')
+
+    def test_partial_file_removed(self):
+        api = YCAPI('token')
+        api.session = FakeSession(FakeStream([b'%PDF'], fail=True))
+        path = os.path.join(tempfile.mkdtemp(), 'act.pdf')
+        with self.assertRaises(NetworkAPIError):
+            api.claim_document(claim_id='c', document_type='act', version=1, status='new', file=path)
+        self.assertFalse(os.path.exists(path))
+
+    def test_file_errors_not_network(self):
+        api = YCAPI('token')
+        api.session = FakeSession(FakeStream([b'%PDF']))
+        path = os.path.join(tempfile.mkdtemp(), 'missing', 'act.pdf')
+        with self.assertRaises(FileNotFoundError):
+            api.claim_document(claim_id='c', document_type='act', version=1, status='new', file=path)
+
+        class FullDisk(io.BytesIO):
+            def write(self, chunk):
+                raise OSError(errno.ENOSPC, 'No space left on device')
+
+        with self.assertRaises(OSError) as ctx:
+            api.report_download(report_id='report', file=FullDisk())
+        self.assertEqual(ctx.exception.errno, errno.ENOSPC)
+        self.assertNotIsInstance(ctx.exception, NetworkAPIError)
+
+
+class CapturingSession(FakeSession):
+    def request(self, **kwargs):
+        self.kwargs = kwargs
+        return self.stream
+
+
+class TestSession(TestCase):
+    def test_timeouts(self):
+        api = YCAPI('token', timeout=(1, 5), timeouts={'/v2/claims/search': 60})
+        self.assertEqual(api._timeout('/b2b/cargo/integration/v2/claims/search'), 60)
+        self.assertEqual(api._timeout('/b2b/cargo/integration/v2/claims/info'), (1, 5))
+
+        api.session = CapturingSession(FakeStream([b'%PDF']))
+        api.report_download(report_id='report', file=io.BytesIO())
+        self.assertEqual(api.session.kwargs['timeout'], (1, 5))
+
+    def test_warmup(self):
+        accepted = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                accepted.append(self.client_address)
+                super().setup()
+
+            def do_GET(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                payload = b'{"position": {"lat": 55.7, "lon": 37.6}}'
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            class LocalAPI(YCAPI):
+                def _url(self, resource):
+                    return 'http://127.0.0.1:{}{}'.format(server.server_address[1], resource)
+
+            api = LocalAPI('token', pool_maxsize=4)
+            self.assertEqual(api.warmup(), 4)
+            pool = api._pool(api._url('/'))
+            connections = [conn for conn in pool.pool.queue if conn is not None]
+            self.assertEqual(len(connections), 4)
+            self.assertTrue(all(conn.sock is not None for conn in connections))
+
+            warmed = {conn.sock.getsockname() for conn in connections}
+            for _ in range(3):
+                api.performer_position(claim_id='claim')
+            self.assertEqual(len(api.adapter.poolmanager.pools), 1)
+            self.assertEqual(len(accepted), 4)
+            self.assertTrue(set(accepted) <= warmed)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_warmup_pool_matches_requests(self):
+        api = YCAPI('token')
+        url = api._url('/')
+        self.assertTrue(url.startswith('https://'))
+        pool = api._pool(url)
+        verify = api.session.merge_environment_settings(url, {}, None, None, None)['verify']
+        self.assertIs(pool, api.adapter.get_connection_with_tls_context(
+            requests.Request('POST', url + 'b2b/cargo/integration/v2/claims/info').prepare(), verify=verify))
+        self.assertEqual(len(api.adapter.poolmanager.pools), 1)
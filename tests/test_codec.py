@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+import collections
+import json
+from unittest import TestCase
+
+from yacargo import YCAPI
+from yacargo.codec import JSONCodec, get_codec
+from yacargo.exceptions import InputParamError
+
+
+class TestCodec(TestCase):
+    def test_auto_detect(self):
+        try:
+            import orjson  # noqa: F401
+        except ImportError:
+            self.skipTest('orjson is not installed')
+        self.assertEqual(get_codec().name, 'orjson')
+        self.assertEqual(YCAPI('token').codec.name, 'orjson')
+
+    def test_encode_defaultdict(self):
+        body = collections.defaultdict(dict)
+        body['route_points'] = [{'address': {'fullname': 'Москва'}}]
+        body['client_requirements']['taxi_class'] = 'cargo'
+        for name in ('json', 'orjson'):
+            try:
+                codec = get_codec(name)
+            except ImportError:
+                continue
+            data = codec.encode(body)
+            self.assertIsInstance(data, bytes)
+            self.assertEqual(json.loads(data.decode('utf-8')), body)
+
+    def test_custom(self):
+        codec = JSONCodec(json.dumps, json.loads, 'custom')
+        self.assertIs(get_codec(codec), codec)
+        self.assertEqual(codec.loads(codec.encode({'a': 1})), {'a': 1})
+        with self.assertRaises(InputParamError):
+            get_codec('simplejson')
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+import copy
+import datetime
+import json
+import os
+import tempfile
+import time
+from unittest import TestCase, skipIf
+
+from yacargo.columnar import ColumnarBatch, ParquetWriter
+from yacargo.objects import SearchedClaimMP
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+with open(os.path.join(os.path.dirname(__file__), 'data', 'claim_info.json'), encoding='utf-8') as file:
+    CLAIM = json.load(file)
+
+
+def claims(count):
+    result = []
+    for i in range(count):
+        item = copy.deepcopy(CLAIM)
+        item['id'] = 'claim-{}'.format(i)
+        item['pricing']['final_price'] = '{}.50'.format(i)
+        result.append(item)
+    del result[-1]['eta']
+    return result
+
+
+class TestColumnar(TestCase):
+    @skipIf(not hasattr(time, 'tzset'), 'time.tzset is not available')
+    def test_naive_ts_is_utc(self):
+        item = copy.deepcopy(CLAIM)
+        item['created_ts'] = '2020-01-01T00:00:00'
+        tz = os.environ.get('TZ')
+        os.environ['TZ'] = 'Europe/Moscow'
+        time.tzset()
+        try:
+            created = ColumnarBatch([item]).columns['claims']['created_ts']
+        finally:
+            if tz is None:
+                del os.environ['TZ']
+            else:
+                os.environ['TZ'] = tz
+            time.tzset()
+        self.assertEqual(created, [datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)])
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_numpy(self):
+        items = claims(3)
+        batch = ColumnarBatch([SearchedClaimMP.from_response(items[0]), SearchedClaimMP.from_response(items[1]).compact(),
+                               items[2]])
+        arrays = batch.to_numpy()
+
+        self.assertEqual(arrays['claims']['claim_id'].tolist(), ['claim-0', 'claim-1', 'claim-2'])
+        self.assertEqual(arrays['claims']['final_price'].tolist(), [0.5, 1.5, 2.5])
+        self.assertEqual(arrays['claims']['version'].dtype, np.int64)
+        self.assertTrue(np.isnan(arrays['claims']['eta'][2]))
+        self.assertEqual(arrays['claims']['created_ts'][0], np.datetime64('2020-01-01T00:00:00'))
+        self.assertFalse(np.isnat(arrays['claims']['due'][0]))
+
+        points = arrays['points']
+        self.assertEqual(points['claim_id'].tolist(), ['claim-0', 'claim-0', 'claim-1', 'claim-1', 'claim-2', 'claim-2'])
+        self.assertEqual(points['lat'][:2].tolist(), [55.73552, 55.707368])
+        self.assertEqual(points['type'][:2].tolist(), ['source', 'destination'])
+        self.assertEqual(arrays['items']['cost_value'].tolist(), [2.0, 2.0, 2.0])
+
+    @skipIf(pandas is None, 'pandas is not installed')
+    def test_pandas(self):
+        frames = ColumnarBatch(claims(2)).to_pandas()
+        merged = frames['points'].merge(frames['claims'], on='claim_id')
+        self.assertEqual(len(merged), 4)
+        self.assertEqual(frames['claims']['created_ts'][0],
+                         pandas.Timestamp(datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)))
+
+    @skipIf(pq is None, 'pyarrow is not installed')
+    def test_parquet_streaming(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with ParquetWriter(directory, batch_size=4) as writer:
+                self.assertEqual(writer.write(iter(claims(5))), 5)
+                self.assertEqual(writer.write(claims(5)[:2]), 2)
+            self.assertEqual(writer.rows, 7)
+
+            table = pq.read_table(os.path.join(directory, 'claims.parquet'))
+            self.assertEqual(table.num_rows, 7)
+            self.assertEqual(pq.ParquetFile(os.path.join(directory, 'claims.parquet')).num_row_groups, 2)
+            self.assertEqual(table.column('final_price').to_pylist()[:5], [0.5, 1.5, 2.5, 3.5, 4.5])
+            self.assertEqual(pq.read_table(os.path.join(directory, 'points.parquet')).num_rows, 14)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import copy
+import datetime
+import json
+import os
+import pickle
+import threading
+import time
+from unittest import TestCase
+
+from yacargo import YCAPI
+from yacargo.exceptions import BaseAPIError
+from yacargo.objects import CargoItemMP, CargoPointMP
+
+with open(os.path.join(os.path.dirname(__file__), 'data', 'claim_info.json'), encoding='utf-8') as file:
+    CLAIM = json.load(file)
+
+
+def route_points():
+    points = []
+    for item in CLAIM['route_points']:
+        point = copy.deepcopy(item)
+        point['point_id'] = point.pop('id')
+        points.append(CargoPointMP.from_dict(point))
+    return points
+
+
+def claim_kwargs(comment):
+    return {'items': [CargoItemMP.from_dict(item) for item in CLAIM['items']],
+            'route_points': route_points(),
+            'emergency_contact_name': 'Рик',
+            'emergency_contact_phone': '+79099999999',
+            'client_requirements_taxi_class': 'cargo',
+            'callback_properties_callback_url': 'https://example.com/callback',
+            'comment': comment}
+
+
+class FakeCreateAPI(YCAPI):
+    def __init__(self):
+        super().__init__('token')
+        self.request_ids = []
+        self.lock = threading.Lock()
+
+    def _request(self, resource, params, body, method='post'):
+        time.sleep(0.01 * (int(body['comment']) % 3))
+        with self.lock:
+            self.request_ids.append(params['request_id'])
+        if body['comment'] == '4':
+            raise BaseAPIError({'code': 'validation_error', 'message': 'Bad claim'})
+        claim = copy.deepcopy(CLAIM)
+        claim['comment'] = body['comment']
+        return claim
+
+
+class TestCreateMany(TestCase):
+    def test_order_and_errors(self):
+        api = FakeCreateAPI()
+        claims = [claim_kwargs(str(i)) for i in range(10)]
+        claims[7]['client_requirements_taxi_class'] = None
+        result = list(api.create_many(claims, max_workers=4))
+        self.assertEqual(len(result), 10)
+        self.assertEqual([r.claim.comment for r in result if r.claim is not None], ['0', '1', '2', '3', '5', '6', '8', '9'])
+        self.assertIsInstance(result[4].error, BaseAPIError)
+        self.assertIn('taxi_class', str(result[7].error))
+        # неверная заявка не отправляется
+        self.assertEqual(len(api.request_ids), 9)
+
+    def test_deterministic_request_id(self):
+        api = FakeCreateAPI()
+        first = [r.request_id for r in api.create_many([claim_kwargs('0'), claim_kwargs('1')])]
+        second = [r.request_id for r in api.create_many([claim_kwargs('0'), claim_kwargs('1')])]
+        other = [r.request_id for r in api.create_many([claim_kwargs('0')], namespace='wave-2')]
+        self.assertEqual(first, second)
+        self.assertNotEqual(first[0], first[1])
+        self.assertNotEqual(first[0], other[0])
+        self.assertEqual(len(first[0]), 32)
+        explicit = dict(claim_kwargs('0'), request_id='fixed')
+        self.assertEqual(next(api.create_many([explicit])).request_id, 'fixed')
+
+    def test_process_pool(self):
+        self.assertIsInstance(pickle.loads(pickle.dumps(route_points()))[0], CargoPointMP)
+        api = FakeCreateAPI()
+        api._request = lambda resource, params, body, method='post': copy.deepcopy(CLAIM)
+        result = list(api.create_many([claim_kwargs(str(i)) for i in range(300)], max_workers=16, processes=2))
+        self.assertEqual(len(result), 300)
+        self.assertTrue(all(r.error is None for r in result))
+
+    def test_unserializable_value_is_per_claim_error(self):
+        api = FakeCreateAPI()
+        claims = [claim_kwargs('0'), dict(claim_kwargs('1'), due=datetime.datetime.now()), claim_kwargs('2')]
+        result = list(api.create_many(claims))
+        self.assertEqual(len(result), 3)
+        self.assertIsNone(result[0].error)
+        self.assertIsInstance(result[1].error, TypeError)
+        self.assertIsNone(result[2].error)
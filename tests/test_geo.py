@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import copy
+import json
+import os
+import random
+from unittest import TestCase, skipIf
+
+from yacargo.objects import SearchedClaimMP
+from yacargo.tracking import distance
+
+try:
+    from yacargo.geo import GeoIndex
+except ImportError:
+    GeoIndex = None
+
+with open(os.path.join(os.path.dirname(__file__), 'data', 'claim_info.json'), encoding='utf-8') as file:
+    CLAIM = json.load(file)
+
+
+def claim(claim_id, source, destination):
+    item = copy.deepcopy(CLAIM)
+    item['id'] = claim_id
+    item['route_points'][0]['address']['coordinates'] = [source[1], source[0]]
+    item['route_points'][1]['address']['coordinates'] = [destination[1], destination[0]]
+    return item
+
+
+def random_claims(count, seed=1):
+    rnd = random.Random(seed)
+    point = lambda: (55.75 + rnd.uniform(-0.3, 0.3), 37.6 + rnd.uniform(-0.5, 0.5))
+    return [claim('claim-{}'.format(i), point(), point()) for i in range(count)]
+
+
+def brute_within(claims, lat, lon, radius, point_type=None):
+    found = []
+    for item in claims:
+        for point in item['route_points']:
+            if point_type is not None and point['type'] != point_type:
+                continue
+            point_lon, point_lat = point['address']['coordinates']
+            value = distance(lat, lon, point_lat, point_lon)
+            if value <= radius:
+                found.append((value, item['id'], point['id']))
+    return sorted(found)
+
+
+@skipIf(GeoIndex is None, 'numpy is not installed')
+class TestGeoIndex(TestCase):
+    def test_within_matches_brute_force(self):
+        claims = random_claims(500)
+        index = GeoIndex(claims, cell_size=0.02)
+        self.assertEqual(len(index), 1000)
+        for radius in (500, 2000, 15000):
+            expected = brute_within(claims, 55.75, 37.6, radius, 'source')
+            matches = index.within(55.75, 37.6, radius, point_type='source')
+            self.assertEqual([(m.claim_id, m.point_id) for m in matches], [(e[1], e[2]) for e in expected])
+            for match, item in zip(matches, expected):
+                self.assertAlmostEqual(match.distance, item[0], delta=1e-3)
+                self.assertEqual(match.type, 'source')
+
+    def test_bbox_and_nearest(self):
+        claims = random_claims(300)
+        index = GeoIndex(SearchedClaimMP.from_response(item) for item in claims)
+
+        inside = {(m.claim_id, m.point_id) for m in index.bbox(55.7, 37.5, 55.8, 37.7)}
+        expected = {(item['id'], point['id']) for item in claims for point in item['route_points']
+                    if 55.7 <= point['address']['coordinates'][1] <= 55.8
+                    and 37.5 <= point['address']['coordinates'][0] <= 37.7}
+        self.assertEqual(inside, expected)
+
+        nearest = index.nearest(55.0, 37.0, k=3)
+        expected = brute_within(claims, 55.0, 37.0, 10 ** 7)[:3]
+        self.assertEqual([(m.claim_id, m.point_id) for m in nearest], [(e[1], e[2]) for e in expected])
+        self.assertEqual(index.nearest(55.0, 37.0, k=1, point_type='return'), [])
+
+    def test_incremental_update(self):
+        index = GeoIndex([claim('a', (55.75, 37.6), (55.76, 37.61)), claim('b', (55.75, 37.6), (56.5, 38.5))])
+        self.assertEqual(index.claims_within(55.75, 37.6, 100, point_type='source'), ['a', 'b'])
+
+        index.update([claim('b', (56.0, 38.0), (56.5, 38.5))])
+        self.assertEqual(index.claims_within(55.75, 37.6, 100), ['a'])
+        self.assertEqual(index.claims_within(56.0, 38.0, 100), ['b'])
+        self.assertEqual(len(index), 4)
+
+        index.remove(['a'])
+        self.assertNotIn('a', index)
+        self.assertEqual(len(index), 2)
+        self.assertEqual(len(index._lat), 2)
+        self.assertEqual(index.claims_within(56.5, 38.5, 100), ['b'])
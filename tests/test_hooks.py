@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import logging
+from unittest import TestCase
+
+from yacargo import YCAPI
+from yacargo.hooks import CurlHook, Hook
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+    content = b'{"position": {"lat": 55.7, "lon": 37.6, "timestamp": 1600000000}}'
+
+
+class FakeSession:
+    def request(self, **kwargs):
+        return FakeResponse()
+
+
+class Recorder(Hook):
+    def __init__(self):
+        self.events = []
+
+    def request(self, method, url, params, body, headers):
+        self.events.append(('request', method, params))
+
+    def response(self, method, url, status, headers, data, elapsed):
+        self.events.append(('response', status, elapsed >= 0))
+
+
+class TestHooks(TestCase):
+    def test_hooks_called(self):
+        recorder = Recorder()
+        api = YCAPI('token', hooks=[recorder])
+        api.session = FakeSession()
+        api.performer_position(claim_id='claim')
+        self.assertEqual(recorder.events, [('request', 'get', {'claim_id': 'claim'}), ('response', 200, True)])
+
+    def test_curl_redacts_authorization(self):
+        api = YCAPI('secret-token')
+        command = CurlHook().render('post', 'https://b2b.taxi.yandex.net/b2b/cargo/integration/v2/claims/info',
+                                    {'claim_id': 'claim'}, {'version': 1}, api.headers)
+        self.assertNotIn('secret-token', command)
+        self.assertIn("'Authorization: ***'", command)
+        self.assertIn('claims/info?claim_id=claim', command)
+        self.assertIn('\'{"version": 1}\'', command)
+
+    def test_curl_only_when_enabled(self):
+        hook = CurlHook()
+        hook.render = None
+        logger = logging.getLogger('yaCargo')
+        level = logger.level
+        logger.setLevel(logging.INFO)
+        try:
+            hook.request('get', 'https://b2b.taxi.yandex.net/', {}, {}, {})
+        finally:
+            logger.setLevel(level)
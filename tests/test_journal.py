@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+from unittest import TestCase
+
+from yacargo import YCAPI
+from yacargo.journal import Checkpoint, FileCheckpointStore, JournalConsumer, MemoryCheckpointStore, \
+    SQLiteCheckpointStore
+
+
+def event(operation_id, claim_id='claim'):
+    return {'operation_id': operation_id, 'claim_id': claim_id, 'change_type': 'status_changed',
+            'updated_ts': '2020-01-01T00:00:00+00:00', 'new_status': 'accepted', 'revision': operation_id}
+
+
+class FakeJournalAPI(YCAPI):
+    # курсор -> (события, следующий курсор)
+    PAGES = {None: ([event(1), event(2)], 'c1'),
+             'c1': ([event(2), event(3)], 'c2'),
+             'c2': ([], 'c2')}
+
+    def __init__(self):
+        super().__init__('token')
+        self.cursors = []
+
+    def _request(self, resource, params, body, method='post'):
+        cursor = body.get('cursor')
+        self.cursors.append(cursor)
+        events, next_cursor = self.PAGES[cursor]
+        return {'cursor': next_cursor, 'events': events}
+
+
+class TestJournalConsumer(TestCase):
+    def consume(self, store, count):
+        consumer = JournalConsumer(FakeJournalAPI(), store, min_interval=0, max_interval=0)
+        result = []
+        for item in consumer:
+            result.append(item.operation_id)
+            if len(result) == count:
+                consumer.stop()
+                break
+        return result
+
+    def test_dedup_and_checkpoint(self):
+        store = MemoryCheckpointStore()
+        self.assertEqual(self.consume(store, 3), [1, 2, 3])
+        # страница c1 не была дочитана генератором - курсор не сдвинулся
+        self.assertEqual(store.load().cursor, 'c1')
+        self.assertEqual(store.load().seen, [1, 2])
+
+    def test_resume_after_crash(self):
+        store = MemoryCheckpointStore()
+        self.assertEqual(self.consume(store, 1), [1])
+        self.assertEqual(store.load(), Checkpoint(None, []))
+        # событие 1 не подтверждено и приходит повторно
+        self.assertEqual(self.consume(store, 3), [1, 2, 3])
+
+    def test_stores(self):
+        directory = tempfile.mkdtemp()
+        for store in (FileCheckpointStore(os.path.join(directory, 'journal.json')),
+                      SQLiteCheckpointStore(os.path.join(directory, 'journal.sqlite'))):
+            self.assertEqual(store.load(), Checkpoint(None, []))
+            store.save(Checkpoint('c1', [1, 2]))
+            self.assertEqual(store.load(), Checkpoint('c1', [1, 2]))
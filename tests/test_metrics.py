@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+
+from yacargo import YCAPI
+from yacargo.exceptions import BaseAPIError, NetworkAPIError
+from yacargo.metrics import Metrics
+
+POSITION = '/b2b/cargo/integration/v1/claims/performer-position'
+INFO = '/b2b/cargo/integration/v2/claims/info'
+REPORT = '/b2b/cargo/integration/v1/order-report/report'
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _reply(self, status, data):
+        payload = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path.startswith(REPORT):
+            if 'missing' in self.path:
+                return self._reply(404, {'code': 'not_found', 'message': 'Task not found'})
+            payload = b'claim_id;status\n' * 1000
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+        self._reply(200, {'position': {'lat': 55.7, 'lon': 37.6, 'timestamp': 1, 'speed': 0, 'direction': 0}})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self._reply(404, {'code': 'not_found', 'message': 'Claim not found'})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestMetrics(TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        port = self.server.server_address[1]
+
+        class LocalAPI(YCAPI):
+            def _url(self, resource):
+                return 'http://127.0.0.1:{}{}'.format(port, resource)
+
+        self.metrics = Metrics(buckets=(0.1, 1))
+        self.api = LocalAPI('token', metrics=self.metrics)
+
+    def tearDown(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def test_render(self):
+        for _ in range(3):
+            self.api.performer_position(claim_id='claim')
+        with self.assertRaises(BaseAPIError):
+            self.api.claim_info(claim_id='claim')
+        text = self.metrics.render()
+
+        self.assertIn('yacargo_requests_total{{resource="{}",method="GET",status="200"}} 3'.format(POSITION), text)
+        self.assertIn('yacargo_requests_total{{resource="{}",method="POST",status="404"}} 1'.format(INFO), text)
+        self.assertIn('yacargo_api_errors_total{{resource="{}",code="not_found"}} 1'.format(INFO), text)
+        self.assertIn('yacargo_request_duration_seconds_count{{resource="{}",phase="server"}} 3'.format(POSITION),
+                      text)
+        self.assertIn('yacargo_request_duration_seconds_bucket{{resource="{}",phase="parse",le="+Inf"}} 3'.format(
+            POSITION), text)
+        # соединение одно на все запросы (keep-alive)
+        connects = [line for line in text.splitlines()
+                    if line.startswith('yacargo_request_duration_seconds_count') and 'phase="connect"' in line]
+        self.assertEqual(sum(int(line.rsplit(' ', 1)[1]) for line in connects), 1)
+        self.assertRegex(text, r'yacargo_received_bytes_total\{{resource="{}"\}} [1-9]'.format(POSITION))
+        self.assertRegex(text, r'yacargo_sent_bytes_total\{{resource="{}"\}} [1-9]'.format(INFO))
+
+    def test_download(self):
+        buffer = io.BytesIO()
+        self.api.report_download(report_id='report', file=buffer)
+        with self.assertRaises(BaseAPIError):
+            self.api.report_download(report_id='missing', file=io.BytesIO())
+        text = self.metrics.render()
+
+        self.assertIn('yacargo_requests_total{{resource="{}",method="GET",status="200"}} 1'.format(REPORT), text)
+        self.assertIn('yacargo_requests_total{{resource="{}",method="GET",status="404"}} 1'.format(REPORT), text)
+        self.assertIn('yacargo_api_errors_total{{resource="{}",code="not_found"}} 1'.format(REPORT), text)
+        received = int(text.split('yacargo_received_bytes_total{{resource="{}"}} '.format(REPORT))[1].split()[0])
+        self.assertGreater(received, len(buffer.getvalue()))
+        self.assertIn('yacargo_request_duration_seconds_count{{resource="{}",phase="transfer"}} 2'.format(REPORT),
+                      text)
+
+    def test_network_error_and_serve(self):
+        self.tearDown()
+        self.server = None
+        with self.assertRaises(NetworkAPIError):
+            self.api._request(POSITION, {'claim_id': 'claim'}, None, method='get')
+
+        exporter = self.metrics.serve(port=0)
+        try:
+            url = 'http://127.0.0.1:{}/metrics'.format(exporter.server_address[1])
+            with urllib.request.urlopen(url) as response:
+                text = response.read().decode('utf-8')
+                self.assertTrue(response.headers['Content-Type'].startswith('text/plain; version=0.0.4'))
+        finally:
+            exporter.shutdown()
+            exporter.server_close()
+        self.assertIn('yacargo_network_errors_total{{resource="{}"}} 1'.format(POSITION), text)
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import copy
+import json
+import os
+from unittest import TestCase, mock
+
+from typeguard import check_type
+
+from yacargo import YCAPI, objects
+from yacargo.exceptions import InputParamError
+from yacargo.objects import List, ResponseCargoPointMP, SearchClaimsResponseMP, SearchedClaimMP, TimeInterval, validate_fields
+
+with open(os.path.join(os.path.dirname(__file__), 'data', 'claim_info.json'), encoding='utf-8') as f:
+    CLAIM = json.load(f)
+
+
+class FakeAPI(YCAPI):
+    def _request(self, resource, params, body, filename='', method='post'):
+        return copy.deepcopy(CLAIM)
+
+
+class TestFromResponse(TestCase):
+    def test_wraps_body(self):
+        claim = SearchedClaimMP.from_response(CLAIM)
+        self.assertIs(claim.json(), CLAIM)
+        self.assertEqual(claim.id, CLAIM['id'])
+        self.assertEqual([point.id for point in claim.route_points], [1, 2])
+        self.assertIsInstance(claim.route_points[0], ResponseCargoPointMP)
+
+    def test_skips_validation(self):
+        with mock.patch('yacargo.objects.validate_fields') as validate:
+            SearchClaimsResponseMP.from_response({'claims': [CLAIM] * 10}).claims
+        validate.assert_not_called()
+
+    def test_strict_round_trip(self):
+        claim = SearchedClaimMP.from_dict(CLAIM)
+        self.assertEqual(json.loads(json.dumps(claim.json())), CLAIM)
+
+    def test_strict_rejects_wrong_type(self):
+        broken = copy.deepcopy(CLAIM)
+        broken['route_points'][0]['visit_order'] = '1'
+        with self.assertRaises(InputParamError):
+            SearchedClaimMP.from_dict(broken)
+
+    def test_client_modes(self):
+        with mock.patch.object(SearchedClaimMP, 'from_dict', wraps=SearchedClaimMP.from_dict) as from_dict:
+            FakeAPI('token').claim_info(claim_id=CLAIM['id'])
+            from_dict.assert_not_called()
+            FakeAPI('token', strict=True).claim_info(claim_id=CLAIM['id'])
+            from_dict.assert_called_once()
+
+
+class TestNestedCache(TestCase):
+    def test_built_once(self):
+        claim = SearchedClaimMP.from_response(CLAIM)
+        with mock.patch.object(ResponseCargoPointMP, 'from_response', wraps=ResponseCargoPointMP.from_response) as build:
+            first = claim.route_points
+            for i in range(len(CLAIM['route_points'])):
+                self.assertIs(claim.route_points[i], first[i])
+        self.assertEqual(build.call_count, len(CLAIM['route_points']))
+
+    def test_missing_optional(self):
+        claim = SearchedClaimMP.from_response({'id': 'x'})
+        self.assertIsNone(claim.error_messages)
+
+
+class TestCompact(TestCase):
+    def test_no_instance_dict(self):
+        claim = SearchedClaimMP.from_response(CLAIM)
+        self.assertFalse(hasattr(claim, '__dict__'))
+        self.assertFalse(hasattr(claim.route_points[0], '__dict__'))
+
+    def test_compact_keeps_api(self):
+        claim = SearchedClaimMP.from_response(copy.deepcopy(CLAIM))
+        plain = {name: getattr(claim, name) for name in ('id', 'status', 'created_ts', 'revision')}
+        claim.compact()
+        self.assertEqual({name: getattr(claim, name) for name in plain}, plain)
+        self.assertEqual(claim.json(), CLAIM)
+        self.assertEqual(claim.route_points[1].visit_order, CLAIM['route_points'][1]['visit_order'])
+        self.assertEqual(claim.items[0].title, CLAIM['items'][0]['title'])
+
+
+class TestValidators(TestCase):
+    def test_same_errors_as_typeguard(self):
+        cases = [('x', int), (True, str), ('1', float), (1, bool), ((1.0, 2.0), List['float']),
+                 ([1.0, 'a'], List['float']), ([{}], List['ResponseCargoPointMP'])]
+        for value, field_type in cases:
+            with self.assertRaises(TypeError) as expected:
+                check_type('field', value, field_type, globals=vars(objects))
+            with self.assertRaises(InputParamError) as ctx:
+                validate_fields('field', value, field_type)
+            self.assertEqual(str(ctx.exception), str(expected.exception))
+
+    def test_values(self):
+        self.assertEqual(validate_fields('field', 1, float), 1)
+        self.assertEqual(validate_fields('field', True, int), True)
+        interval = TimeInterval(type='strict_match', _from='2020-01-01T00:00:00+00:00', to='2020-01-02T00:00:00+00:00')
+        self.assertEqual(validate_fields('field', [interval], List['TimeInterval']), [interval.json()])
+
+
+class TestNestedProperties(TestCase):
+    def test_paths(self):
+        claim = SearchedClaimMP.from_response(CLAIM)
+        self.assertEqual(claim.pricing_final_price, '12.50')
+        self.assertEqual(claim.emergency_contact_phone, '+79826810246')
+        self.assertEqual(claim.route_points[0].address_coordinates, [37.642474, 55.73552])
+        self.assertEqual(claim.route_points[1].address_fullname, CLAIM['route_points'][1]['address']['fullname'])
+        self.assertEqual(claim.route_points[0].payment_on_delivery_is_paid, True)
+        self.assertEqual(claim.items[0].size_length, 0.1)
+
+    def test_compact(self):
+        claim = SearchedClaimMP.from_response(copy.deepcopy(CLAIM)).compact()
+        self.assertEqual(claim.pricing_final_price, '12.50')
+        self.assertEqual(claim.route_points[0].address_coordinates, [37.642474, 55.73552])
+
+    def test_explicit_null(self):
+        broken = copy.deepcopy(CLAIM)
+        broken['pricing'] = {'offer': None, 'currency_rules': None}
+        broken['emergency_contact'] = None
+        broken['items'][0]['size'] = None
+        claim = SearchedClaimMP.from_response(broken)
+        self.assertIsNone(claim.pricing_offer_price)
+        self.assertIsNone(claim.pricing_currency_rules_code)
+        self.assertIsNone(claim.pricing_final_price)
+        self.assertIsNone(claim.emergency_contact_phone)
+        self.assertIsNone(claim.items[0].size_length)
+
+    def test_missing_lists(self):
+        claim = SearchedClaimMP.from_response({'id': 'x', 'client_requirements': {'taxi_class': 'express'},
+                                               'route_points': [{'id': 1, 'address': None}, {'id': 2}]})
+        self.assertIsNone(claim.client_requirements_cargo_options)
+        self.assertEqual([point.address_coordinates for point in claim.route_points], [None, None])
+        self.assertIsNone(SearchedClaimMP.from_response({'id': 'x'}).client_requirements_cargo_options)
+        self.assertEqual(SearchedClaimMP.from_response(CLAIM).client_requirements_cargo_options, [])
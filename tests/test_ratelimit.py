@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+from unittest import TestCase
+
+from yacargo import YCAPI
+from yacargo.ratelimit import FileTokenBucket, RateLimiter, TokenBucket
+
+
+class TestTokenBucket(TestCase):
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=10, burst=3)
+        delays = [bucket.reserve() for _ in range(5)]
+        self.assertEqual(delays[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(delays[3], 0.1, places=2)
+        self.assertAlmostEqual(delays[4], 0.2, places=2)
+
+    def test_file_bucket_shared(self):
+        path = os.path.join(tempfile.mkdtemp(), 'bucket')
+        first = FileTokenBucket(path, rate=10, burst=2)
+        second = FileTokenBucket(path, rate=10, burst=2)
+        self.assertEqual(first.reserve(), 0.0)
+        self.assertEqual(second.reserve(), 0.0)
+        self.assertAlmostEqual(first.reserve(), 0.1, places=2)
+
+
+class TestRateLimiter(TestCase):
+    def test_resource_match(self):
+        limiter = RateLimiter({'/v2/claims/search': 1, '/v2/claims/search/active': (5, 10), '*': 2})
+        self.assertEqual(limiter.bucket('/b2b/cargo/integration/v2/claims/search').rate, 1)
+        self.assertEqual(limiter.bucket('/b2b/cargo/integration/v2/claims/search/active').burst, 10)
+        self.assertEqual(limiter.bucket('/b2b/cargo/integration/v2/claims/info').rate, 2)
+        self.assertIsNone(RateLimiter({'/v2/claims/info': 1}).bucket('/b2b/cargo/integration/v1/claims/journal'))
+
+    def test_client_uses_bucket(self):
+        class LimitedAPI(YCAPI):
+            def _request(self, resource, params, body, method='post'):
+                return {'position': {'lat': 55.7, 'lon': 37.6, 'timestamp': 1600000000}}
+
+        api = LimitedAPI('token', rate_limit={'/v1/claims/performer-position': (1, 2)})
+        api.performer_position(claim_id='claim')
+        api.performer_position(claim_id='claim')
+        bucket = api.rate_limit.bucket('/b2b/cargo/integration/v1/claims/performer-position')
+        self.assertGreater(bucket.reserve(), 0.9)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import tempfile
+from unittest import TestCase
+
+from yacargo import YCAPI
+from yacargo.exceptions import ReportError
+from yacargo.reports import fetch_report
+
+CSV = 'claim_id;status;price\r\nc1;delivered;100.50\r\nc2;cancelled;0\r\n'.encode('utf-8-sig')
+
+
+class FakeReportAPI(YCAPI):
+    def __init__(self, statuses, authorization_key='token', test_server=False):
+        super().__init__(authorization_key, test_server=test_server)
+        self.statuses = list(statuses)
+        self.calls = []
+
+    def _request(self, resource, params, body, method='post'):
+        self.calls.append(resource.rsplit('/', 1)[-1])
+        if resource.endswith('/generate'):
+            return {'task_id': 'task-' + body['idempotency_token']}
+        return {'task_id': body['task_id'], 'status': self.statuses.pop(0)}
+
+    def _download(self, resource, params, body, method, file, chunk_size, progress, checksum):
+        self.calls.append('report')
+        file.write(CSV)
+
+
+class TestFetchReport(TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def test_pipeline_and_cache(self):
+        api = FakeReportAPI(['in_progress', 'retry', 'complete'])
+        report = fetch_report(api, '2020-01-01', '2020-01-02', cache_dir=self.cache_dir, poll_interval=0)
+        self.assertFalse(report.cached)
+        self.assertEqual(api.calls, ['generate', 'status', 'status', 'status', 'report'])
+        self.assertEqual(list(report.rows()), [{'claim_id': 'c1', 'status': 'delivered', 'price': '100.50'},
+                                               {'claim_id': 'c2', 'status': 'cancelled', 'price': '0'}])
+
+        again = api.fetch_report(since_date='2020-01-01', till_date='2020-01-02', cache_dir=self.cache_dir)
+        self.assertTrue(again.cached)
+        self.assertEqual(again.path, report.path)
+        self.assertEqual(len(api.calls), 5)
+
+    def test_cache_per_client(self):
+        first = fetch_report(FakeReportAPI(['complete']), '2020-01-01', '2020-01-02', cache_dir=self.cache_dir)
+        for api in (FakeReportAPI(['complete'], authorization_key='other'),
+                    FakeReportAPI(['complete'], test_server=True)):
+            report = fetch_report(api, '2020-01-01', '2020-01-02', cache_dir=self.cache_dir)
+            self.assertFalse(report.cached)
+            self.assertNotEqual(report.path, first.path)
+            self.assertEqual(api.calls, ['generate', 'status', 'report'])
+
+    def test_cache_token_and_period(self):
+        api = FakeReportAPI(['complete', 'complete'])
+        first = fetch_report(api, '2020-01-01', '2020-01-02', idempotency_token='t', cache_dir=self.cache_dir)
+        second = fetch_report(api, '2020-02-01', '2020-02-02', idempotency_token='t', cache_dir=self.cache_dir)
+        self.assertFalse(second.cached)
+        self.assertNotEqual(second.path, first.path)
+        self.assertTrue(fetch_report(api, '2020-01-01', '2020-01-02', idempotency_token='t',
+                                     cache_dir=self.cache_dir).cached)
+
+    def test_failed(self):
+        api = FakeReportAPI(['in_progress', 'failed'])
+        with self.assertRaises(ReportError) as ctx:
+            fetch_report(api, '2020-01-01', '2020-01-02', cache_dir=self.cache_dir, poll_interval=0)
+        self.assertEqual(ctx.exception.status, 'failed')
+
+    def test_timeout(self):
+        api = FakeReportAPI(['in_progress'] * 10)
+        with self.assertRaises(ReportError):
+            fetch_report(api, '2020-01-01', '2020-01-02', cache_dir=self.cache_dir, poll_interval=1, timeout=0.5)
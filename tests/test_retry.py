@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from yacargo import YCAPI
+from yacargo.exceptions import BaseAPIError, NetworkAPIError, ServerAPIError
+from yacargo.retry import RetryPolicy, is_idempotent
+
+
+class FlakyAPI(YCAPI):
+    def __init__(self, errors, policy):
+        super().__init__('token', retry=policy)
+        self.errors = list(errors)
+        self.calls = 0
+
+    def _request(self, resource, params, body, method='post'):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return {'position': {'lat': 55.7, 'lon': 37.6, 'timestamp': 1600000000}}
+
+
+def server_error(status=503, retry_after=None):
+    return ServerAPIError(status, {'code': None, 'message': 'Service unavailable'}, retry_after)
+
+
+class TestRetry(TestCase):
+    def test_read_retried(self):
+        api = FlakyAPI([NetworkAPIError(), server_error()], RetryPolicy(backoff=0))
+        position = api.performer_position(claim_id='claim')
+        self.assertEqual(position.json()['position']['lat'], 55.7)
+        self.assertEqual(api.calls, 3)
+
+    def test_attempts_exhausted(self):
+        api = FlakyAPI([server_error()] * 5, RetryPolicy(max_attempts=3, backoff=0))
+        with self.assertRaises(ServerAPIError):
+            api.performer_position(claim_id='claim')
+        self.assertEqual(api.calls, 3)
+
+    def test_client_error_not_retried(self):
+        api = FlakyAPI([BaseAPIError({'code': 'not_found', 'message': 'Claim not found'})], RetryPolicy(backoff=0))
+        with self.assertRaises(BaseAPIError):
+            api.performer_position(claim_id='claim')
+        self.assertEqual(api.calls, 1)
+
+    def test_write_not_retried(self):
+        api = FlakyAPI([NetworkAPIError()], RetryPolicy(backoff=0))
+        with self.assertRaises(NetworkAPIError):
+            api.voiceforwarding(claim_id='claim')
+        self.assertEqual(api.calls, 1)
+
+    def test_max_elapsed(self):
+        api = FlakyAPI([server_error(retry_after=60)], RetryPolicy(backoff=0, max_elapsed=1))
+        with self.assertRaises(ServerAPIError):
+            api.performer_position(claim_id='claim')
+        self.assertEqual(api.calls, 1)
+
+    def test_budget(self):
+        api = FlakyAPI([NetworkAPIError()] * 10, RetryPolicy(max_attempts=10, backoff=0, budget=2, budget_ratio=0))
+        with self.assertRaises(NetworkAPIError):
+            api.performer_position(claim_id='claim')
+        self.assertEqual(api.calls, 3)
+
+    def test_idempotency(self):
+        self.assertTrue(is_idempotent('/b2b/cargo/integration/v2/claims/info', {'claim_id': 'c'}, {}))
+        self.assertTrue(is_idempotent('/b2b/cargo/integration/v2/claims/create', {'request_id': 'r'}, {}))
+        self.assertTrue(is_idempotent('/b2b/cargo/integration/v1/claims/accept', {'claim_id': 'c'}, {'version': 1}))
+        self.assertFalse(is_idempotent('/b2b/cargo/integration/v2/claims/create', {}, {}))
+        self.assertFalse(is_idempotent('/b2b/cargo/integration/v1/driver-voiceforwarding', {}, {'claim_id': 'c'}))
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from yacargo import YCAPI
+from yacargo.exceptions import NetworkAPIError
+from yacargo.retry import RetryPolicy
+from yacargo.singleflight import AsyncSingleFlight
+
+
+class SlowAPI(YCAPI):
+    def __init__(self, error=None):
+        super().__init__('token', singleflight=True, retry=RetryPolicy(max_attempts=1))
+        self.error = error
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def _request(self, resource, params, body, method='post'):
+        with self.lock:
+            self.calls += 1
+        time.sleep(0.1)
+        if self.error is not None:
+            raise self.error
+        return {'position': {'lat': 55.7, 'lon': 37.6, 'timestamp': 1600000000}}
+
+
+class TestSingleFlight(TestCase):
+    def run_parallel(self, fn, count=8):
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(fn) for _ in range(count)]
+        return [future.exception() or future.result() for future in futures]
+
+    def test_shared_result(self):
+        api = SlowAPI()
+        result = self.run_parallel(lambda: api.performer_position(claim_id='claim'))
+        self.assertEqual(api.calls, 1)
+        self.assertEqual(api.singleflight.hits, 7)
+        self.assertTrue(all(position is result[0] for position in result))
+
+    def test_shared_exception(self):
+        api = SlowAPI(error=NetworkAPIError())
+        result = self.run_parallel(lambda: api.performer_position(claim_id='claim'))
+        self.assertEqual(api.calls, 1)
+        self.assertTrue(all(isinstance(error, NetworkAPIError) for error in result))
+
+    def test_different_keys(self):
+        api = SlowAPI()
+        counter = iter(range(100))
+        self.run_parallel(lambda: api.performer_position(claim_id=str(next(counter))), count=4)
+        self.assertEqual(api.calls, 4)
+        self.assertEqual(api.singleflight.hits, 0)
+
+    def test_writes_not_shared(self):
+        api = SlowAPI()
+        self.assertIsNone(api._shared('/b2b/cargo/integration/v1/claims/accept', {'claim_id': 'c'}, {'version': 1}, 'post'))
+
+    def test_async(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'position'
+
+        async def main():
+            return await asyncio.gather(*[flight.do('claim', fetch) for _ in range(10)])
+
+        self.assertEqual(asyncio.run(main()), ['position'] * 10)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((flight.flights, flight.hits), (1, 9))
+
+    def test_async_leader_cancelled(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'position'
+
+        async def main():
+            leader = asyncio.ensure_future(asyncio.wait_for(flight.do('claim', fetch), 0.01))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.do('claim', fetch))
+            with self.assertRaises(asyncio.TimeoutError):
+                await leader
+            return await follower
+
+        self.assertEqual(asyncio.run(main()), 'position')
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight._flights, {})
+
+    def test_async_shared_exception(self):
+        flight = AsyncSingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise NetworkAPIError()
+
+        async def main():
+            return await asyncio.gather(*[flight.do('claim', fetch) for _ in range(3)], return_exceptions=True)
+
+        self.assertTrue(all(isinstance(result, NetworkAPIError) for result in asyncio.run(main())))
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import copy
+import json
+import os
+from unittest import TestCase
+
+from yacargo import YCAPI
+from yacargo.exceptions import BulkRequestError, ServerAPIError
+from yacargo.objects import SearchedClaimMP
+from yacargo.store import ClaimStore
+
+with open(os.path.join(os.path.dirname(__file__), 'data', 'claim_info.json'), encoding='utf-8') as file:
+    CLAIM = json.load(file)
+
+
+def claim(claim_id, status='performer_found', revision=1, created_ts='2020-01-01T00:00:00+00:00', order='100'):
+    item = copy.deepcopy(CLAIM)
+    item.update(id=claim_id, status=status, revision=revision, created_ts=created_ts)
+    for point in item['route_points']:
+        point['external_order_id'] = order
+    return item
+
+
+class FakeStoreAPI(YCAPI):
+    def __init__(self, store):
+        super().__init__('token')
+        self.store = store
+        self.claims = {'a': claim('a', created_ts='2020-01-02T00:00:00+00:00', order='A-1'),
+                       'b': claim('b', status='pickuped')}
+        self.pages = []
+        self.bulk = []
+        self.bulk_failures = 0
+
+    def iter_search_active(self, limit=1000):
+        return (SearchedClaimMP.from_response(item) for item in list(self.claims.values()))
+
+    def claim_bulk_many(self, claim_ids=None, max_workers=4, on_error=None):
+        self.bulk.append(sorted(claim_ids))
+        if self.bulk_failures:
+            self.bulk_failures -= 1
+            raise BulkRequestError([(claim_ids, ServerAPIError(500, {}))])
+        return (SearchedClaimMP.from_response(self.claims[claim_id]) for claim_id in claim_ids)
+
+    def _request(self, resource, params, body, method='post'):
+        if not self.pages:
+            self.store.stop()
+            return {'cursor': body.get('cursor'), 'events': []}
+        return self.pages.pop(0)
+
+
+def event(operation_id, claim_id, revision):
+    return {'operation_id': operation_id, 'claim_id': claim_id, 'change_type': 'status_changed',
+            'updated_ts': '2020-01-01T00:00:00+00:00', 'new_status': 'delivered', 'revision': revision}
+
+
+class TestClaimStore(TestCase):
+    def setUp(self):
+        self.store = ClaimStore()
+        self.api = FakeStoreAPI(self.store)
+        self.assertEqual(self.store.seed(self.api), 2)
+
+    def test_queries(self):
+        self.assertEqual(self.store.count(), 2)
+        self.assertEqual([item.id for item in self.store.query(status='pickuped')], ['b'])
+        self.assertEqual([item.id for item in self.store.query()], ['b', 'a'])
+        self.assertEqual([item.id for item in self.store.query(created_from='2020-01-02')], ['a'])
+        self.assertEqual([item.id for item in self.store.query(external_order_id='A-1')], ['a'])
+        self.assertEqual(self.store.get('a').status, 'performer_found')
+        self.assertIsNone(self.store.get('missing'))
+
+    def test_follow_journal(self):
+        self.api.claims['b'] = claim('b', status='delivered', revision=2)
+        self.api.claims['c'] = claim('c', status='new', revision=1)
+        self.api.pages = [{'cursor': 'c1', 'events': [event(1, 'a', 1), event(2, 'b', 2), event(3, 'c', 1)]}]
+        self.store.follow(self.api, min_interval=0, max_interval=0)
+        # заявка a не изменилась - не догружается
+        self.assertEqual(self.api.bulk, [['b', 'c']])
+        self.assertEqual(self.store.get('b').status, 'delivered')
+        self.assertEqual(self.store.count(status=['new', 'delivered']), 2)
+        self.assertEqual(self.store.consumer.store.load().cursor, 'c1')
+
+    def test_old_revision_ignored(self):
+        self.store.upsert([claim('a', status='new', revision=0)])
+        self.assertEqual(self.store.get('a').status, 'performer_found')
+
+    def test_stale_revision_keeps_order_index(self):
+        self.store.upsert([claim('a', revision=5, order='NEW')])
+        self.assertEqual(self.store.upsert([claim('a', revision=3, order='OLD')]), 0)
+        self.assertEqual([item.id for item in self.store.query(external_order_id='NEW')], ['a'])
+        self.assertEqual(self.store.query(external_order_id='OLD'), [])
+        self.assertEqual(self.store.get('a').json()['revision'], 5)
+
+    def test_follow_retries_failed_bulk(self):
+        self.api.claims['b'] = claim('b', status='delivered', revision=2)
+        self.api.bulk_failures = 2
+        self.api.pages = [{'cursor': 'c1', 'events': [event(1, 'b', 2)]}]
+        self.store.follow(self.api, min_interval=0, max_interval=0)
+        self.assertEqual(self.api.bulk, [['b'], ['b'], ['b']])
+        self.assertEqual(self.store.get('b').status, 'delivered')
+        self.assertEqual(self.store.consumer.store.load().cursor, 'c1')
+
+    def test_stop_during_retry_keeps_cursor(self):
+        self.api.claims['b'] = claim('b', status='delivered', revision=2)
+        self.api.bulk_failures = 10 ** 6
+        self.api.pages = [{'cursor': 'c1', 'events': [event(1, 'b', 2)]}]
+        original = self.api.claim_bulk_many
+
+        def failing(claim_ids=None, max_workers=4, on_error=None):
+            if len(self.api.bulk) >= 3:
+                self.store.stop()
+            return original(claim_ids)
+
+        self.api.claim_bulk_many = failing
+        self.store.follow(self.api, min_interval=0, max_interval=0)
+        self.assertEqual(self.store.get('b').status, 'pickuped')
+        self.assertIsNone(self.store.consumer.store.load().cursor)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import threading
+from unittest import TestCase
+
+from yacargo import YCAPI
+from yacargo.exceptions import NetworkAPIError
+from yacargo.objects import PerformerPositionResponse, SearchedClaimMP
+from yacargo.tracking import PositionTracker, distance
+
+with open(os.path.join(os.path.dirname(__file__), 'data', 'claim_info.json'), encoding='utf-8') as file:
+    CLAIM = json.load(file)
+
+# непосещенная точка claim_info.json
+TARGET_LAT, TARGET_LON = 55.707368, 37.59086
+
+
+class FakeTrackingAPI(YCAPI):
+    def __init__(self, positions):
+        super().__init__('token')
+        self.positions = positions
+        self.calls = []
+        self._calls_lock = threading.Lock()
+
+    def performer_position(self, claim_id=None):
+        with self._calls_lock:
+            self.calls.append(claim_id)
+        position = self.positions[claim_id]
+        if position is None:
+            raise NetworkAPIError('timeout')
+        return PerformerPositionResponse.from_response({'position': position})
+
+
+def position(lat, lon, speed=0, direction=0, timestamp=1000):
+    return {'lat': lat, 'lon': lon, 'speed': speed, 'direction': direction, 'timestamp': timestamp}
+
+
+class TestPositionTracker(TestCase):
+    def test_distance(self):
+        self.assertAlmostEqual(distance(55.0, 37.0, 56.0, 37.0), 111195, delta=10)
+
+    def test_adaptive_intervals(self):
+        api = FakeTrackingAPI({'idle': position(55.75, 37.6),
+                               'near': position(TARGET_LAT + 0.001, TARGET_LON, speed=10),
+                               'far': position(TARGET_LAT + 0.1, TARGET_LON, speed=10),
+                               'broken': None})
+        tracker = PositionTracker(api, min_interval=5, max_interval=60)
+        for claim_id in api.positions:
+            tracker.track(SearchedClaimMP.from_response(dict(CLAIM, id=claim_id)))
+
+        self.assertEqual(tracker.poll(now=1000), 4)
+        self.assertEqual(tracker.due(now=1005), ['near'])
+        # ~11 км до точки на 10 м/с: следующий опрос не раньше чем через минуту
+        self.assertEqual(sorted(tracker.due(now=1060)), ['broken', 'far', 'idle', 'near'])
+        self.assertEqual(tracker.poll(now=1001), 0)
+        self.assertIsNone(tracker.position('broken', at=1000))
+
+    def test_interpolation(self):
+        api = FakeTrackingAPI({'north': position(55.0, 37.0, speed=10, direction=0),
+                               'east': position(55.0, 37.0, speed=10, direction=90)})
+        tracker = PositionTracker(api, max_interval=60)
+        tracker.track('north')
+        tracker.track('east')
+        tracker.poll(now=1000)
+
+        self.assertEqual(tracker.position('north', at=1000), (55.0, 37.0))
+        lat, lon = tracker.position('north', at=1010)
+        self.assertAlmostEqual(distance(55.0, 37.0, lat, lon), 100, delta=0.1)
+        self.assertGreater(lat, 55.0)
+        lat, lon = tracker.position('east', at=1010)
+        self.assertAlmostEqual(distance(55.0, 37.0, lat, lon), 100, delta=0.1)
+        self.assertGreater(lon, 37.0)
+        # экстраполяция не дальше max_interval
+        self.assertEqual(tracker.position('north', at=5000), tracker.position('north', at=1060))
+        self.assertEqual(set(tracker.positions(at=1010)), {'north', 'east'})
+        self.assertEqual(tracker.latest('north').position_speed, 10)
+
+    def test_untrack_reuses_slot(self):
+        api = FakeTrackingAPI({'a': position(55.0, 37.0), 'b': position(56.0, 38.0)})
+        tracker = PositionTracker(api)
+        tracker.track('a')
+        tracker.poll(now=1000)
+        tracker.untrack('a')
+        tracker.track('b')
+
+        self.assertEqual(len(tracker), 1)
+        self.assertEqual(len(tracker._lat), 1)
+        self.assertIsNone(tracker.position('b'))
+        self.assertEqual(tracker.due(now=1000), ['b'])
+        tracker.poll(now=1000)
+        self.assertEqual(tracker.position('b', at=1000), (56.0, 38.0))
@@ -2,18 +2,40 @@
 """
 Модуль с запросами для сервера API
 """
+import datetime
+import hashlib
+import itertools
+import json
+import os
 import socket
 import ssl
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ReadTimeout, SSLError
 
-from yacargo.exceptions import NotAuthorized, NetworkAPIError, InputParamError, BaseAPIError
+from yacargo.exceptions import NotAuthorized, NetworkAPIError, InputParamError, BaseAPIError, BulkRequestError, \
+    ServerAPIError
+from yacargo.codec import get_codec
+from yacargo.metrics import instrument, take_connect_time
 from yacargo.objects import *
+from yacargo.ratelimit import RateLimiter
+from yacargo.reports import CACHE_DIR, Report, fetch_report
+from yacargo.retry import READ_RESOURCES, RETRYABLE_ERRORS, RetryPolicy, is_idempotent
+from yacargo.singleflight import SingleFlight, request_key
 
 USER_AGENT = 'yacargo'
 DOMAIN = 'b2b.taxi.yandex.net'
 DOMAIN_TEST = 'b2b.taxi.tst.yandex.net'
+BULK_CHUNK_SIZE = 1000
+PROCESS_THRESHOLD = 256
+TIMEOUT = (3.05, 30)
+MIN_TS = datetime.datetime.min.replace(tzinfo=datetime.timezone.utc)
+JSON_HEADERS = {'Content-Type': 'application/json'}
 
 __title__ = 'yaCargo'
 __version__ = '0.0.6'
@@ -23,84 +45,243 @@ __license__ = 'Apache 2.0'
 logger = logging.getLogger('yaCargo')
 
 
-class YCAPI:
+Download = collections.namedtuple('Download', ['headers', 'size', 'checksum'])
+Download.__doc__ = """
+    Результат скачивания файла
+
+    :param headers: Заголовки ответа
+    :param int size: Количество записанных байт
+    :param Optional[str] checksum: Контрольная сумма (hexdigest), если была запрошена
+"""
+
+
+class _DownloadSink:
+    """
+    Запись скачиваемого файла блоками с подсчетом размера и контрольной суммы
+
+    :param file: Путь к файлу или открытый на запись файловый объект
+    :param progress: Функция ``progress(received, total)``
+    :param str checksum: Алгоритм контрольной суммы из :mod:`hashlib`
+    :param headers: Заголовки ответа
+    """
+
+    def __init__(self, file, progress, checksum, headers):
+        self.path = None if hasattr(file, 'write') else file
+        self.file = open(file, 'wb') if self.path is not None else file
+        self.progress = progress
+        self.hash = hashlib.new(checksum) if checksum else None
+        self.headers = headers
+        length = headers.get('Content-Length')
+        self.total = int(length) if length and length.isdigit() else None
+        self.size = 0
+
+    def write(self, chunk):
+        self.file.write(chunk)
+        self.size += len(chunk)
+        if self.hash is not None:
+            self.hash.update(chunk)
+        if self.progress is not None:
+            self.progress(self.size, self.total)
+
+    def close(self, failed=False):
+        """
+        :param bool failed: Скачивание прервано - недописанный файл удаляется
+        """
+        if self.path is not None:
+            self.file.close()
+            if failed:
+                os.remove(self.path)
+
+    def result(self):
+        """
+        :rtype: Download
+        """
+        return Download(self.headers, self.size, self.hash.hexdigest() if self.hash is not None else None)
+
+
+def _error_data(status_code, text):
+    """
+    Тело ответа с ошибкой: json сервера или текст ответа
+
+    :param int status_code: HTTP-код ответа
+    :param str text: Тело ответа
+
+    :rtype: dict
     """
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        data = {'code': None, 'message': 'HTTP {}: {}'.format(status_code, text[:200])}
+    return data
+
+
+def _retry_after(headers):
+    """
+    Значение заголовка Retry-After в секундах
+
+    :param headers: Заголовки ответа
+
+    :rtype: Optional[float]
+    """
+    value = headers.get('Retry-After') if headers is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class YCBaseAPI:
+    """
+
+    Базовый класс клиента: валидация параметров методов и сборка ответов.
+    Транспорт (``_call``) реализуется в наследниках.
 
     :param str authorization_key: Авторизационный ключ
     :param bool test_server: Использовать ли тестовый сервер?
+    :param bool strict: Проверять типы всех полей ответов сервера (медленно, для отладки)
+    :param RetryPolicy retry: Политика повторов запросов (по умолчанию :class:`yacargo.retry.RetryPolicy`)
+    :param rate_limit: Ограничения частоты запросов по ресурсам: :class:`yacargo.ratelimit.RateLimiter` или словарь для него
+    :param hooks: Обработчики запросов и ответов (:class:`yacargo.hooks.Hook`)
+    :param codec: Кодек JSON (:class:`yacargo.codec.JSONCodec` или название). По умолчанию - orjson, если установлен
+    :param bool singleflight: Объединять одинаковые одновременные запросы на чтение в один.
+        Все вызовы получают один и тот же объект ответа. Счетчики - в ``self.singleflight``
+    :param ClaimCache cache: Кэш ответов claim_info (:class:`yacargo.cache.ClaimCache`)
     """
 
-    def __init__(self, authorization_key=None, test_server=False):
+    _singleflight_class = None
+
+    def __init__(self, authorization_key=None, test_server=False, strict=False, retry=None, rate_limit=None, hooks=(),
+                 codec=None, singleflight=False, cache=None):
         if not authorization_key:
             raise NotAuthorized(
                 "You must provide authorization key to access cargo API!")
         self.test_server = test_server
-        self.session = requests.Session()
-        self.session.headers = {
+        self.strict = strict
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.rate_limit = RateLimiter(rate_limit) if isinstance(rate_limit, dict) else rate_limit
+        self.hooks = tuple(hooks)
+        self.codec = get_codec(codec)
+        self.singleflight = self._singleflight_class() if singleflight else None
+        self.cache = cache
+        self.headers = {
             'Host': DOMAIN_TEST if self.test_server else DOMAIN,
             'Authorization': 'Bearer {}'.format(authorization_key),
             'User-agent': USER_AGENT,
             'Accept-Language': 'ru'
         }
 
-    def _request(self, resource, params, body, filename='', method='post'):
+    def _url(self, resource):
+        """
+
+        :param str resource: Запрашиваемый ресурс
+
+        :return: Полный адрес ресурса
+        :rtype: str
+        """
+        return 'https://{}{}'.format(DOMAIN_TEST if self.test_server else DOMAIN, resource)
+
+    @staticmethod
+    def _check_status(status_code, data, headers=None):
+        """
+        Проверка кода ответа сервера
+
+        :param int status_code: HTTP-код ответа
+        :param dict data: Тело ответа
+        :param headers: Заголовки ответа
         """
+        if status_code == 403:
+            raise NotAuthorized(data)
+
+        if status_code == 429 or status_code >= 500:
+            raise ServerAPIError(status_code, data, _retry_after(headers))
+
+        if status_code in (400, 401, 404, 409):
+            raise BaseAPIError(data)
+
+    def _call(self, resource, params, body, method='post', response=None):
+        """
+        Выполнение запроса и сборка объекта ответа
 
         :param str resource: Запрашиваемый ресурс
         :param dict params: Параметры
         :param dict body: Тело запроса
-        :param str filename: Если указано - ответ будет сохранен в filename
+        :param str method: HTTP-метод
+        :param response: Класс объекта ответа (например, ``SearchedClaimMP``). Если не указан - возвращается тело ответа
 
-        :return:
+        :return: Объект ответа
         """
-        # if resource not in RESOURCES:
-        #    raise Exception('Resource "%s" unsupported' % resource)
+        raise NotImplementedError
 
-        url = 'https://{}{}'.format(DOMAIN_TEST if self.test_server else DOMAIN, resource)
+    def _shared(self, resource, params, body, method):
+        """
+        Ключ запроса для объединения одновременных вызовов или None, если запрос не объединяется
 
-        try:
-            logger.debug('Requesting resource %s', url)
-            logger.debug('Requesting params %s', params)
-            logger.debug('Requesting body %s', body)
-            req = self.session.request(
-                method=method,
-                url=url,
-                params=params,
-                json=body
-            )
+        :rtype: Optional[tuple]
+        """
+        if self.singleflight is None or resource not in READ_RESOURCES:
+            return None
+        return request_key(resource, method, params, body)
 
-        except (ConnectionError, ReadTimeout, SSLError, ssl.SSLError,
-                socket.error) as exception:
-            logger.error(exception)
-            raise NetworkAPIError()
-        else:
+    def _reserve(self, resource):
+        """
+        Время ожидания перед запросом по ограничению частоты
 
-            headers = ["'{0}: {1}'".format(k, v) for k, v in req.request.headers.items()]
-            headers = " -H ".join(sorted(headers))
-            command = "curl -H {headers} -d '{data}' '{uri}'".format(
-                data=req.request.body.decode() or "",
-                headers=headers,
-                uri=req.request.url,
-            )
-            logger.debug('CURL: %s', command)
-            logger.debug('Status code %d', req.status_code)
-            logger.debug('Received headers: %s', req.headers)
+        :param str resource: Запрашиваемый ресурс
 
-            if filename:
-                with open(filename, 'wb') as file:
-                    file.write(req.content)
-                return req.headers, True
+        :rtype: float
+        """
+        if self.rate_limit is None:
+            return 0.0
+        return self.rate_limit.reserve(resource)
 
-            data = req.json()
-            logger.debug('Received JSON: %s', data)
+    def _hook_request(self, method, url, params, body):
+        """
+        Вызов обработчиков перед запросом
+        """
+        for hook in self.hooks:
+            hook.request(method, url, params, body, self.headers)
 
-            if req.status_code == 403:
-                raise NotAuthorized(data)
+    def _hook_response(self, method, url, status, headers, data, started):
+        """
+        Вызов обработчиков после ответа
 
-            if req.status_code in (400, 401, 404, 409):
-                raise BaseAPIError(data)
+        :param float started: Время начала запроса (``time.monotonic``)
+        """
+        elapsed = time.monotonic() - started
+        for hook in self.hooks:
+            hook.response(method, url, status, headers, data, elapsed)
 
-            return data
+    def _build(self, response, item):
+        """
+        Сборка объекта ответа: с проверкой всех полей в режиме ``strict``, иначе без проверки
+
+        :param response: Класс объекта ответа
+        :param dict item: Тело ответа
+
+        :return: Объект ответа
+        """
+        if self.strict:
+            return response.from_dict(item)
+        return response.from_response(item)
+
+    def _download(self, resource, params, body, method, file, chunk_size, progress, checksum):
+        """
+        Потоковая запись ответа в файл
+
+        :param str resource: Запрашиваемый ресурс
+        :param dict params: Параметры
+        :param dict body: Тело запроса
+        :param str method: HTTP-метод
+        :param file: Путь к файлу или файловый объект
+        :param int chunk_size: Размер блока в байтах
+        :param progress: Функция ``progress(received, total)``
+        :param str checksum: Алгоритм контрольной суммы
+
+        :rtype: Download
+        """
+        raise NotImplementedError
 
     def claim_accept(self,
                      claim_id: str = None,
@@ -130,12 +311,7 @@ class YCAPI:
         if version is None:
             raise InputParamError("<version> (=>version) of <claim_accept> is a required parameter of <int> type")
 
-        item = self._request(resource="/b2b/cargo/integration/v1/claims/accept", params=params, body=body, method="post")
-        return CutClaimResponse(id=item.get("id", None),
-                                status=item.get("status", None),
-                                version=item.get("version", None),
-                                taxi_order_id=item.get("taxi_order_id", None),
-                                )
+        return self._call(resource="/b2b/cargo/integration/v1/claims/accept", params=params, body=body, method="post", response=CutClaimResponse)
 
     def claim_cancel(self,
                      claim_id: str = None,
@@ -179,19 +355,18 @@ class YCAPI:
         if cancel_state not in ['free', 'paid']:
             raise InputParamError("<cancel_state> of <claim_cancel> should be in ['free', 'paid']")
 
-        item = self._request(resource="/b2b/cargo/integration/v1/claims/cancel", params=params, body=body, method="post")
-        return CutClaimResponse(id=item.get("id", None),
-                                status=item.get("status", None),
-                                version=item.get("version", None),
-                                taxi_order_id=item.get("taxi_order_id", None),
-                                )
+        return self._call(resource="/b2b/cargo/integration/v1/claims/cancel", params=params, body=body, method="post", response=CutClaimResponse)
 
     def claim_document(self,
                        claim_id: str = None,
                        document_type: str = None,
                        version: int = None,
                        status: str = None,
-                       ) -> str:
+                       file=None,
+                       chunk_size: int = 65536,
+                       progress: Optional[Callable] = None,
+                       checksum: Optional[str] = None,
+                       ) -> Download:
         """
 
         Получение накладной или акта приема-передачи
@@ -205,6 +380,15 @@ class YCAPI:
 
         :param int version: Версия заявки *(Обязательный параметр)*
         :param str status: Статус заявки *(Обязательный параметр)*
+        :param file: Путь к файлу или открытый на запись файловый объект, куда будет записан ответ *(Обязательный параметр)*
+        :param int chunk_size: Размер блока чтения в байтах (65536)
+        :param Callable progress: Функция ``progress(received, total)``, вызывается после каждого блока. ``total`` - размер из Content-Length или None
+        :param Optional[str] checksum: Алгоритм контрольной суммы из :mod:`hashlib` (например, ``sha256``)
+
+        Ответ читается потоком блоками по ``chunk_size`` и не держится в памяти целиком.
+
+        :return: Заголовки ответа, количество байт и контрольная сумма (если запрошена)
+        :rtype: Download
 
         `Официальная документация /b2b/cargo/integration/v1/claims/document <https://yandex.ru/dev/taxi/doc/cargo-api/ref/v1/claims/IntegrationV1ClaimsDocument-docpage/>`_
         """
@@ -234,7 +418,13 @@ class YCAPI:
         if status is None:
             raise InputParamError("<status> (=>status) of <claim_document> is a required parameter of <str> type")
 
-        return self._request(resource="/b2b/cargo/integration/v1/claims/document", params=params, body=body, method="get")
+        if file is None:
+            raise InputParamError("<file> of <claim_document> is a required parameter")
+        if checksum is not None and checksum not in hashlib.algorithms_available:
+            raise InputParamError("<checksum> of <claim_document> should be in hashlib.algorithms_available")
+
+        return self._download(resource="/b2b/cargo/integration/v1/claims/document", params=params, body=body, method="get",
+                              file=file, chunk_size=chunk_size, progress=progress, checksum=checksum)
 
     def claim_journal(self,
                       cursor: str = None,
@@ -255,10 +445,7 @@ class YCAPI:
         if cursor is not None:
             body["cursor"] = validate_fields('cursor', cursor, str)
 
-        item = self._request(resource="/b2b/cargo/integration/v1/claims/journal", params=params, body=body, method="post")
-        return ClaimsJournalResponse(cursor=item.get("cursor", None),
-                                     events=item.get("events", None),
-                                     )
+        return self._call(resource="/b2b/cargo/integration/v1/claims/journal", params=params, body=body, method="post", response=ClaimsJournalResponse)
 
     def voiceforwarding(self,
                         claim_id: str = None,
@@ -281,11 +468,7 @@ class YCAPI:
         if claim_id is None:
             raise InputParamError("<claim_id> (=>claim_id) of <voiceforwarding> is a required parameter of <str> type")
 
-        item = self._request(resource="/b2b/cargo/integration/v1/driver-voiceforwarding", params=params, body=body, method="post")
-        return VoiceforwardingResponse(phone=item.get("phone", None),
-                                       ext=item.get("ext", None),
-                                       ttl_seconds=item.get("ttl_seconds", None),
-                                       )
+        return self._call(resource="/b2b/cargo/integration/v1/driver-voiceforwarding", params=params, body=body, method="post", response=VoiceforwardingResponse)
 
     def performer_position(self,
                            claim_id: str = None,
@@ -308,14 +491,7 @@ class YCAPI:
         if claim_id is None:
             raise InputParamError("<claim_id> (=>claim_id) of <performer_position> is a required parameter of <str> type")
 
-        item = self._request(resource="/b2b/cargo/integration/v1/claims/performer-position", params=params, body=body, method="get")
-        return PerformerPositionResponse(position_lat=item.get("position", {}).get("lat", None),
-                                         position_lon=item.get("position", {}).get("lon", None),
-                                         position_timestamp=item.get("position", {}).get("timestamp", None),
-                                         position_accuracy=item.get("position", {}).get("accuracy", None),
-                                         position_speed=item.get("position", {}).get("speed", None),
-                                         position_direction=item.get("position", {}).get("direction", None),
-                                         )
+        return self._call(resource="/b2b/cargo/integration/v1/claims/performer-position", params=params, body=body, method="get", response=PerformerPositionResponse)
 
     def report_generate(self,
                         since_date: str = None,
@@ -362,9 +538,7 @@ class YCAPI:
         if idempotency_token is None:
             raise InputParamError("<idempotency_token> (=>idempotency_token) of <report_generate> is a required parameter of <str> type")
 
-        item = self._request(resource="/b2b/cargo/integration/v1/order-report/generate", params=params, body=body, method="post")
-        return ClaimsReportGenerateResponse(task_id=item.get("task_id", None),
-                                            )
+        return self._call(resource="/b2b/cargo/integration/v1/order-report/generate", params=params, body=body, method="post", response=ClaimsReportGenerateResponse)
 
     def report_status(self,
                       task_id: str = None,
@@ -387,22 +561,15 @@ class YCAPI:
         if task_id is None:
             raise InputParamError("<task_id> (=>task_id) of <report_status> is a required parameter of <str> type")
 
-        item = self._request(resource="/b2b/cargo/integration/v1/order-report/status", params=params, body=body, method="post")
-        return ClaimsReportStatusResponse(task_id=item.get("task_id", None),
-                                          status=item.get("status", None),
-                                          author=item.get("author", None),
-                                          created_at=item.get("created_at", None),
-                                          request_since_date=item.get("request", {}).get("since_date", None),
-                                          request_till_date=item.get("request", {}).get("till_date", None),
-                                          request_lang=item.get("request", {}).get("lang", None),
-                                          request_department_id=item.get("request", {}).get("department_id", None),
-                                          request_idempotency_token=item.get("request", {}).get("idempotency_token", None),
-                                          url=item.get("url", None),
-                                          )
+        return self._call(resource="/b2b/cargo/integration/v1/order-report/status", params=params, body=body, method="post", response=ClaimsReportStatusResponse)
 
     def report_download(self,
                         report_id: str = None,
-                        ) -> str:
+                        file=None,
+                        chunk_size: int = 65536,
+                        progress: Optional[Callable] = None,
+                        checksum: Optional[str] = None,
+                        ) -> Download:
         """
 
         Получение файла отчета
@@ -410,6 +577,15 @@ class YCAPI:
         Возвращает файл отчета
 
         :param str report_id: Идентификатор отчета *(Обязательный параметр)*
+        :param file: Путь к файлу или открытый на запись файловый объект, куда будет записан ответ *(Обязательный параметр)*
+        :param int chunk_size: Размер блока чтения в байтах (65536)
+        :param Callable progress: Функция ``progress(received, total)``, вызывается после каждого блока. ``total`` - размер из Content-Length или None
+        :param Optional[str] checksum: Алгоритм контрольной суммы из :mod:`hashlib` (например, ``sha256``)
+
+        Ответ читается потоком блоками по ``chunk_size`` и не держится в памяти целиком.
+
+        :return: Заголовки ответа, количество байт и контрольная сумма (если запрошена)
+        :rtype: Download
 
         `Официальная документация /b2b/cargo/integration/v1/order-report/report <https://yandex.ru/dev/taxi/doc/cargo-api/ref/v1/reports/IntegrationV1OrderReportReport-docpage/>`_
         """
@@ -421,7 +597,13 @@ class YCAPI:
         if report_id is None:
             raise InputParamError("<report_id> (=>report_id) of <report_download> is a required parameter of <str> type")
 
-        return self._request(resource="/b2b/cargo/integration/v1/order-report/report", params=params, body=body, method="get")
+        if file is None:
+            raise InputParamError("<file> of <report_download> is a required parameter")
+        if checksum is not None and checksum not in hashlib.algorithms_available:
+            raise InputParamError("<checksum> of <report_download> should be in hashlib.algorithms_available")
+
+        return self._download(resource="/b2b/cargo/integration/v1/order-report/report", params=params, body=body, method="get",
+                              file=file, chunk_size=chunk_size, progress=progress, checksum=checksum)
 
     def claim_create(self,
                      request_id: str = None,
@@ -562,55 +744,7 @@ class YCAPI:
         if referral_source is not None:
             body["referral_source"] = validate_fields('referral_source', referral_source, str)
 
-        item = self._request(resource="/b2b/cargo/integration/v2/claims/create", params=params, body=body, method="post")
-        return SearchedClaimMP(id=item.get("id", None),
-                               corp_client_id=item.get("corp_client_id", None),
-                               yandex_uid=item.get("yandex_uid", None),
-                               items=item.get("items", None),
-                               route_points=item.get("route_points", None),
-                               current_point_id=item.get("current_point_id", None),
-                               status=item.get("status", None),
-                               version=item.get("version", None),
-                               error_messages=item.get("error_messages", None),
-                               emergency_contact_name=item.get("emergency_contact", {}).get("name", None),
-                               emergency_contact_phone=item.get("emergency_contact", {}).get("phone", None),
-                               skip_door_to_door=item.get("skip_door_to_door", None),
-                               skip_client_notify=item.get("skip_client_notify", None),
-                               skip_emergency_notify=item.get("skip_emergency_notify", None),
-                               skip_act=item.get("skip_act", None),
-                               optional_return=item.get("optional_return", None),
-                               eta=item.get("eta", None),
-                               created_ts=item.get("created_ts", None),
-                               updated_ts=item.get("updated_ts", None),
-                               taxi_offer_offer_id=item.get("taxi_offer", {}).get("offer_id", None),
-                               taxi_offer_price_raw=item.get("taxi_offer", {}).get("price_raw", None),
-                               taxi_offer_price=item.get("taxi_offer", {}).get("price", None),
-                               pricing_offer_offer_id=item.get("pricing", {}).get("offer", {}).get("offer_id", None),
-                               pricing_offer_price_raw=item.get("pricing", {}).get("offer", {}).get("price_raw", None),
-                               pricing_offer_price=item.get("pricing", {}).get("offer", {}).get("price", None),
-                               pricing_currency=item.get("pricing", {}).get("currency", None),
-                               pricing_currency_rules_code=item.get("pricing", {}).get("currency_rules", {}).get("code", None),
-                               pricing_currency_rules_text=item.get("pricing", {}).get("currency_rules", {}).get("text", None),
-                               pricing_currency_rules_template=item.get("pricing", {}).get("currency_rules", {}).get("template", None),
-                               pricing_currency_rules_sign=item.get("pricing", {}).get("currency_rules", {}).get("sign", None),
-                               pricing_final_price=item.get("pricing", {}).get("final_price", None),
-                               available_cancel_state=item.get("available_cancel_state", None),
-                               client_requirements_taxi_class=item.get("client_requirements", {}).get("taxi_class", None),
-                               client_requirements_cargo_type=item.get("client_requirements", {}).get("cargo_type", None),
-                               client_requirements_cargo_loaders=item.get("client_requirements", {}).get("cargo_loaders", None),
-                               client_requirements_cargo_options=item.get("client_requirements", {}).get("cargo_options", None),
-                               matched_cars=item.get("matched_cars", None),
-                               warnings=item.get("warnings", None),
-                               performer_info_courier_name=item.get("performer_info", {}).get("courier_name", None),
-                               performer_info_legal_name=item.get("performer_info", {}).get("legal_name", None),
-                               performer_info_car_model=item.get("performer_info", {}).get("car_model", None),
-                               performer_info_car_number=item.get("performer_info", {}).get("car_number", None),
-                               callback_properties_callback_url=item.get("callback_properties", {}).get("callback_url", None),
-                               due=item.get("due", None),
-                               shipping_document=item.get("shipping_document", None),
-                               comment=item.get("comment", None),
-                               revision=item.get("revision", None),
-                               )
+        return self._call(resource="/b2b/cargo/integration/v2/claims/create", params=params, body=body, method="post", response=SearchedClaimMP)
 
     def claim_edit(self,
                    claim_id: str = None,
@@ -758,55 +892,7 @@ class YCAPI:
         if referral_source is not None:
             body["referral_source"] = validate_fields('referral_source', referral_source, str)
 
-        item = self._request(resource="/b2b/cargo/integration/v2/claims/edit", params=params, body=body, method="post")
-        return SearchedClaimMP(id=item.get("id", None),
-                               corp_client_id=item.get("corp_client_id", None),
-                               yandex_uid=item.get("yandex_uid", None),
-                               items=item.get("items", None),
-                               route_points=item.get("route_points", None),
-                               current_point_id=item.get("current_point_id", None),
-                               status=item.get("status", None),
-                               version=item.get("version", None),
-                               error_messages=item.get("error_messages", None),
-                               emergency_contact_name=item.get("emergency_contact", {}).get("name", None),
-                               emergency_contact_phone=item.get("emergency_contact", {}).get("phone", None),
-                               skip_door_to_door=item.get("skip_door_to_door", None),
-                               skip_client_notify=item.get("skip_client_notify", None),
-                               skip_emergency_notify=item.get("skip_emergency_notify", None),
-                               skip_act=item.get("skip_act", None),
-                               optional_return=item.get("optional_return", None),
-                               eta=item.get("eta", None),
-                               created_ts=item.get("created_ts", None),
-                               updated_ts=item.get("updated_ts", None),
-                               taxi_offer_offer_id=item.get("taxi_offer", {}).get("offer_id", None),
-                               taxi_offer_price_raw=item.get("taxi_offer", {}).get("price_raw", None),
-                               taxi_offer_price=item.get("taxi_offer", {}).get("price", None),
-                               pricing_offer_offer_id=item.get("pricing", {}).get("offer", {}).get("offer_id", None),
-                               pricing_offer_price_raw=item.get("pricing", {}).get("offer", {}).get("price_raw", None),
-                               pricing_offer_price=item.get("pricing", {}).get("offer", {}).get("price", None),
-                               pricing_currency=item.get("pricing", {}).get("currency", None),
-                               pricing_currency_rules_code=item.get("pricing", {}).get("currency_rules", {}).get("code", None),
-                               pricing_currency_rules_text=item.get("pricing", {}).get("currency_rules", {}).get("text", None),
-                               pricing_currency_rules_template=item.get("pricing", {}).get("currency_rules", {}).get("template", None),
-                               pricing_currency_rules_sign=item.get("pricing", {}).get("currency_rules", {}).get("sign", None),
-                               pricing_final_price=item.get("pricing", {}).get("final_price", None),
-                               available_cancel_state=item.get("available_cancel_state", None),
-                               client_requirements_taxi_class=item.get("client_requirements", {}).get("taxi_class", None),
-                               client_requirements_cargo_type=item.get("client_requirements", {}).get("cargo_type", None),
-                               client_requirements_cargo_loaders=item.get("client_requirements", {}).get("cargo_loaders", None),
-                               client_requirements_cargo_options=item.get("client_requirements", {}).get("cargo_options", None),
-                               matched_cars=item.get("matched_cars", None),
-                               warnings=item.get("warnings", None),
-                               performer_info_courier_name=item.get("performer_info", {}).get("courier_name", None),
-                               performer_info_legal_name=item.get("performer_info", {}).get("legal_name", None),
-                               performer_info_car_model=item.get("performer_info", {}).get("car_model", None),
-                               performer_info_car_number=item.get("performer_info", {}).get("car_number", None),
-                               callback_properties_callback_url=item.get("callback_properties", {}).get("callback_url", None),
-                               due=item.get("due", None),
-                               shipping_document=item.get("shipping_document", None),
-                               comment=item.get("comment", None),
-                               revision=item.get("revision", None),
-                               )
+        return self._call(resource="/b2b/cargo/integration/v2/claims/edit", params=params, body=body, method="post", response=SearchedClaimMP)
 
     def claim_info(self,
                    claim_id: str = None,
@@ -829,62 +915,14 @@ class YCAPI:
         if claim_id is None:
             raise InputParamError("<claim_id> (=>claim_id) of <claim_info> is a required parameter of <str> type")
 
-        item = self._request(resource="/b2b/cargo/integration/v2/claims/info", params=params, body=body, method="post")
-        return SearchedClaimMP(id=item.get("id", None),
-                               corp_client_id=item.get("corp_client_id", None),
-                               yandex_uid=item.get("yandex_uid", None),
-                               items=item.get("items", None),
-                               route_points=item.get("route_points", None),
-                               current_point_id=item.get("current_point_id", None),
-                               status=item.get("status", None),
-                               version=item.get("version", None),
-                               error_messages=item.get("error_messages", None),
-                               emergency_contact_name=item.get("emergency_contact", {}).get("name", None),
-                               emergency_contact_phone=item.get("emergency_contact", {}).get("phone", None),
-                               skip_door_to_door=item.get("skip_door_to_door", None),
-                               skip_client_notify=item.get("skip_client_notify", None),
-                               skip_emergency_notify=item.get("skip_emergency_notify", None),
-                               skip_act=item.get("skip_act", None),
-                               optional_return=item.get("optional_return", None),
-                               eta=item.get("eta", None),
-                               created_ts=item.get("created_ts", None),
-                               updated_ts=item.get("updated_ts", None),
-                               taxi_offer_offer_id=item.get("taxi_offer", {}).get("offer_id", None),
-                               taxi_offer_price_raw=item.get("taxi_offer", {}).get("price_raw", None),
-                               taxi_offer_price=item.get("taxi_offer", {}).get("price", None),
-                               pricing_offer_offer_id=item.get("pricing", {}).get("offer", {}).get("offer_id", None),
-                               pricing_offer_price_raw=item.get("pricing", {}).get("offer", {}).get("price_raw", None),
-                               pricing_offer_price=item.get("pricing", {}).get("offer", {}).get("price", None),
-                               pricing_currency=item.get("pricing", {}).get("currency", None),
-                               pricing_currency_rules_code=item.get("pricing", {}).get("currency_rules", {}).get("code", None),
-                               pricing_currency_rules_text=item.get("pricing", {}).get("currency_rules", {}).get("text", None),
-                               pricing_currency_rules_template=item.get("pricing", {}).get("currency_rules", {}).get("template", None),
-                               pricing_currency_rules_sign=item.get("pricing", {}).get("currency_rules", {}).get("sign", None),
-                               pricing_final_price=item.get("pricing", {}).get("final_price", None),
-                               available_cancel_state=item.get("available_cancel_state", None),
-                               client_requirements_taxi_class=item.get("client_requirements", {}).get("taxi_class", None),
-                               client_requirements_cargo_type=item.get("client_requirements", {}).get("cargo_type", None),
-                               client_requirements_cargo_loaders=item.get("client_requirements", {}).get("cargo_loaders", None),
-                               client_requirements_cargo_options=item.get("client_requirements", {}).get("cargo_options", None),
-                               matched_cars=item.get("matched_cars", None),
-                               warnings=item.get("warnings", None),
-                               performer_info_courier_name=item.get("performer_info", {}).get("courier_name", None),
-                               performer_info_legal_name=item.get("performer_info", {}).get("legal_name", None),
-                               performer_info_car_model=item.get("performer_info", {}).get("car_model", None),
-                               performer_info_car_number=item.get("performer_info", {}).get("car_number", None),
-                               callback_properties_callback_url=item.get("callback_properties", {}).get("callback_url", None),
-                               due=item.get("due", None),
-                               shipping_document=item.get("shipping_document", None),
-                               comment=item.get("comment", None),
-                               revision=item.get("revision", None),
-                               )
+        return self._call(resource="/b2b/cargo/integration/v2/claims/info", params=params, body=body, method="post", response=SearchedClaimMP)
 
     def claim_search(self,
                      offset: int = None,
                      limit: int = None,
-                     claim_id: str = None,
+                     claim_id: Optional[str] = None,
                      phone: str = None,
-                     status: str = None,
+                     status: Optional[str] = None,
                      created_from: str = None,
                      created_to: str = None,
                      state: str = None,
@@ -900,9 +938,9 @@ class YCAPI:
 
         :param int offset: Смещение (пагинация) выдачи заявок по заданному фильтру (заявки отсортированы по дате создания) *(Обязательный параметр)* (50)
         :param int limit: Максимальное число заявок в ответе *(Обязательный параметр)* (50)
-        :param str claim_id: Идентификатор заявки, полученный на этапе создания заявки *(Обязательный параметр)* (741cedf82cd464fa6fa16d87155c636)
+        :param Optional[str] claim_id: Идентификатор заявки, полученный на этапе создания заявки (741cedf82cd464fa6fa16d87155c636)
         :param Optional[str] phone: Фильтр по номеру телефона (+79099999998)
-        :param str status: Статус заявки *(Обязательный параметр)* (new)
+        :param Optional[str] status: Статус заявки (new)
 
             * **new** - новая заявка
             * **estimating** - идет процесс оценки заявки (подбор типа автомобиля по параметрам груза и расчет стоимости)
@@ -965,18 +1003,14 @@ class YCAPI:
 
         if claim_id is not None:
             body["claim_id"] = validate_fields('claim_id', claim_id, str)
-        if claim_id is None:
-            raise InputParamError("<claim_id> (=>claim_id) of <claim_search> is a required parameter of <str> type")
 
         if phone is not None:
             body["phone"] = validate_fields('phone', phone, str)
 
         if status is not None:
             body["status"] = validate_fields('status', status, str)
-        if status is None:
-            raise InputParamError("<status> (=>status) of <claim_search> is a required parameter of <str> type")
 
-        if status not in ['new', 'estimating', 'estimating_failed', 'ready_for_approval', 'accepted', 'performer_lookup', 'performer_draft', 'performer_found', 'performer_not_found', 'pickup_arrived',
+        if status is not None and status not in ['new', 'estimating', 'estimating_failed', 'ready_for_approval', 'accepted', 'performer_lookup', 'performer_draft', 'performer_found', 'performer_not_found', 'pickup_arrived',
                           'ready_for_pickup_confirmation', 'pickuped', 'delivery_arrived', 'ready_for_delivery_confirmation', 'pay_waiting', 'delivered', 'delivered_finish', 'returning',
                           'return_arrived', 'ready_for_return_confirmation', 'returned', 'returned_finish', 'failed', 'cancelled', 'cancelled_with_payment', 'cancelled_by_taxi',
                           'cancelled_with_items_on_hands']:
@@ -992,7 +1026,7 @@ class YCAPI:
         if state is not None:
             body["state"] = validate_fields('state', state, str)
 
-        if state not in ['active']:
+        if state is not None and state not in ['active']:
             raise InputParamError("<state> of <claim_search> should be in ['active']")
 
         if due_from is not None:
@@ -1004,9 +1038,7 @@ class YCAPI:
         if external_order_id is not None:
             body["external_order_id"] = validate_fields('external_order_id', external_order_id, str)
 
-        item = self._request(resource="/b2b/cargo/integration/v2/claims/search", params=params, body=body, method="post")
-        return SearchClaimsResponseMP(claims=item.get("claims", None),
-                                      )
+        return self._call(resource="/b2b/cargo/integration/v2/claims/search", params=params, body=body, method="post", response=SearchClaimsResponseMP)
 
     def search_active(self,
                       offset: int = None,
@@ -1042,9 +1074,7 @@ class YCAPI:
         if limit and limit > 1000:
             raise InputParamError("<limit> of <search_active> should be less than 1000")
 
-        item = self._request(resource="/b2b/cargo/integration/v2/claims/search/active", params=params, body=body, method="post")
-        return SearchClaimsResponseMP(claims=item.get("claims", None),
-                                      )
+        return self._call(resource="/b2b/cargo/integration/v2/claims/search/active", params=params, body=body, method="post", response=SearchClaimsResponseMP)
 
     def claim_confirmation_code(self,
                                 claim_id: str = None,
@@ -1067,10 +1097,7 @@ class YCAPI:
         if claim_id is None:
             raise InputParamError("<claim_id> (=>claim_id) of <claim_confirmation_code> is a required parameter of <str> type")
 
-        item = self._request(resource="/b2b/cargo/integration/v2/claims/confirmation_code", params=params, body=body, method="post")
-        return ConfirmationCodeResponse(code=item.get("code", None),
-                                        attempts=item.get("attempts", None),
-                                        )
+        return self._call(resource="/b2b/cargo/integration/v2/claims/confirmation_code", params=params, body=body, method="post", response=ConfirmationCodeResponse)
 
     def claim_bulk(self,
                    claim_ids: List['str'] = None,
@@ -1097,6 +1124,749 @@ class YCAPI:
         if claim_ids and len(claim_ids) > 1000:
             raise InputParamError("<claim_ids> of <claim_bulk> should not contain more than 1000 element")
 
-        item = self._request(resource="/b2b/cargo/integration/v2/claims/bulk_info", params=params, body=body, method="post")
-        return SearchClaimsResponseMP(claims=item.get("claims", None),
-                                      )
+        return self._call(resource="/b2b/cargo/integration/v2/claims/bulk_info", params=params, body=body, method="post", response=SearchClaimsResponseMP)
+
+
+class YCAPI(YCBaseAPI):
+    """
+
+    :param str authorization_key: Авторизационный ключ
+    :param bool test_server: Использовать ли тестовый сервер?
+    :param bool strict: Проверять типы всех полей ответов сервера (медленно, для отладки)
+    :param RetryPolicy retry: Политика повторов запросов
+    :param rate_limit: Ограничения частоты запросов по ресурсам
+    :param int pool_connections: Количество хостов, для которых хранятся пулы соединений
+    :param int pool_maxsize: Максимальное количество keep-alive соединений к одному хосту.
+        Должно быть не меньше числа потоков, одновременно использующих клиент
+    :param bool pool_block: Ждать свободного соединения вместо открытия лишнего, которое будет закрыто после запроса
+    :param timeout: Таймаут по умолчанию в секундах: число или пара (connect, read)
+    :param dict timeouts: Таймауты по ресурсам: окончание пути ресурса (``/v2/claims/search``) => таймаут
+    :param hooks: Обработчики запросов и ответов
+    :param codec: Кодек JSON
+    :param bool singleflight: Объединять одинаковые одновременные запросы на чтение в один
+    :param ClaimCache cache: Кэш ответов claim_info
+    :param Metrics metrics: Метрики запросов (:class:`yacargo.metrics.Metrics`)
+    """
+
+    _singleflight_class = SingleFlight
+
+    def __init__(self, authorization_key=None, test_server=False, strict=False, retry=None, rate_limit=None,
+                 pool_connections=10, pool_maxsize=10, pool_block=False, timeout=TIMEOUT, timeouts=None, hooks=(),
+                 codec=None, singleflight=False, cache=None, metrics=None):
+        super().__init__(authorization_key=authorization_key, test_server=test_server, strict=strict, retry=retry,
+                         rate_limit=rate_limit, hooks=hooks, codec=codec, singleflight=singleflight, cache=cache)
+        self.session = requests.Session()
+        self.session.headers = self.headers
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.timeouts = timeouts or {}
+        self._resource_timeouts = {}
+        self.metrics = metrics
+        if metrics is not None:
+            instrument(self.adapter)
+
+    def _timeout(self, resource):
+        """
+        Таймаут запроса к ресурсу
+
+        :param str resource: Запрашиваемый ресурс
+
+        :return: Таймаут в формате ``requests``
+        """
+        try:
+            return self._resource_timeouts[resource]
+        except KeyError:
+            pass
+        matches = [key for key in self.timeouts if resource.endswith(key)]
+        timeout = self.timeouts[max(matches, key=len)] if matches else self.timeout
+        self._resource_timeouts[resource] = timeout
+        return timeout
+
+    def _pool(self, url):
+        """
+        Пул соединений, который адаптер выберет для запроса к ``url``.
+        Ключ пула включает параметры TLS (``verify``, ``cert``) с учетом переменных окружения
+        (``REQUESTS_CA_BUNDLE``), поэтому они берутся так же, как при ``session.request``
+
+        :param str url: Адрес
+
+        :rtype: urllib3.HTTPConnectionPool
+        """
+        get_connection = getattr(self.adapter, 'get_connection_with_tls_context', None)
+        if get_connection is None:
+            return self.adapter.get_connection(url)
+        settings = self.session.merge_environment_settings(url, {}, None, None, None)
+        return get_connection(requests.Request('POST', url).prepare(), verify=settings['verify'],
+                              cert=settings['cert'])
+
+    def warmup(self, connections=None):
+        """
+
+        Открытие соединений (TCP + TLS) к серверу API до начала работы,
+        чтобы первые запросы не тратили время на установку соединения.
+
+        :param int connections: Количество соединений (по умолчанию - ``pool_maxsize``)
+
+        :return: Количество открытых соединений
+        :rtype: int
+        """
+        connections = min(connections or self.pool_maxsize, self.pool_maxsize)
+        url = self._url('/')
+        pool = self._pool(url)
+        timeout = self.timeout[0] if isinstance(self.timeout, tuple) else self.timeout
+        opened = [pool._get_conn() for _ in range(connections)]
+
+        def connect(conn):
+            conn.timeout = timeout
+            conn.connect()
+
+        try:
+            with ThreadPoolExecutor(max_workers=connections) as executor:
+                list(executor.map(connect, opened))
+        except (ConnectionError, ssl.SSLError, socket.error) as exception:
+            logger.error(exception)
+            raise NetworkAPIError()
+        finally:
+            for conn in opened:
+                pool._put_conn(conn)
+        logger.debug('Opened %d connections to %s', connections, url)
+        return connections
+
+    def _request(self, resource, params, body, method='post'):
+        """
+
+        :param str resource: Запрашиваемый ресурс
+        :param dict params: Параметры
+        :param dict body: Тело запроса
+
+        :return:
+        """
+        # if resource not in RESOURCES:
+        #    raise Exception('Resource "%s" unsupported' % resource)
+
+        url = self._url(resource)
+        payload = self.codec.encode(body)
+        metrics = self.metrics
+
+        try:
+            logger.debug('Requesting resource %s', url)
+            logger.debug('Requesting params %s', params)
+            logger.debug('Requesting body %s', body)
+            if self.hooks:
+                self._hook_request(method, url, params, body)
+                started = time.monotonic()
+            if metrics is not None:
+                take_connect_time()
+                timer = metrics.start(resource, method, len(payload))
+            req = self.session.request(
+                method=method,
+                url=url,
+                params=params,
+                data=payload,
+                headers=JSON_HEADERS,
+                timeout=self._timeout(resource)
+            )
+
+        except (ConnectionError, ReadTimeout, SSLError, ssl.SSLError,
+                socket.error) as exception:
+            logger.error(exception)
+            if metrics is not None:
+                timer.failed()
+            raise NetworkAPIError()
+        else:
+            logger.debug('Status code %d', req.status_code)
+            logger.debug('Received headers: %s', req.headers)
+
+            if metrics is not None:
+                timer.headers(req.elapsed.total_seconds())
+                timer.received()
+            data = self.codec.loads(req.content) if req.status_code == 200 else _error_data(req.status_code, req.text)
+            logger.debug('Received JSON: %s', data)
+
+            if metrics is not None:
+                timer.connect = take_connect_time()
+                timer.finish(req.status_code, data, len(req.content))
+
+            if self.hooks:
+                self._hook_response(method, url, req.status_code, req.headers, data, started)
+
+            self._check_status(req.status_code, data, req.headers)
+
+            return data
+
+    def _call(self, resource, params, body, method='post', response=None):
+        if self.cache is not None:
+            cached = self.cache.before(resource, params)
+            if cached is not None:
+                return cached
+        key = self._shared(resource, params, body, method)
+        if key is not None:
+            result = self.singleflight.do(key, lambda: self._send(resource, params, body, method, response))
+        else:
+            result = self._send(resource, params, body, method, response)
+        if self.cache is not None:
+            self.cache.after(resource, params, result)
+        return result
+
+    def _send(self, resource, params, body, method, response):
+        retry = self.retry.start(is_idempotent(resource, params, body))
+        while True:
+            delay = self._reserve(resource)
+            if delay:
+                time.sleep(delay)
+            try:
+                item = self._request(resource=resource, params=params, body=body, method=method)
+            except RETRYABLE_ERRORS as exception:
+                delay = retry.next_delay(exception)
+                if delay is None:
+                    raise
+                logger.warning('Retrying %s in %.2fs (attempt %d)', resource, delay, retry.attempt)
+                time.sleep(delay)
+            else:
+                return self._build(response, item) if response else item
+
+    def _download(self, resource, params, body, method, file, chunk_size, progress, checksum):
+        url = self._url(resource)
+        delay = self._reserve(resource)
+        if delay:
+            time.sleep(delay)
+
+        payload = self.codec.encode(body)
+        metrics = self.metrics
+        try:
+            logger.debug('Downloading resource %s', url)
+            logger.debug('Requesting params %s', params)
+            if self.hooks:
+                self._hook_request(method, url, params, body)
+                started = time.monotonic()
+            if metrics is not None:
+                take_connect_time()
+                timer = metrics.start(resource, method, len(payload))
+            with self.session.request(method=method, url=url, params=params, data=payload,
+                                      headers=JSON_HEADERS, stream=True,
+                                      timeout=self._timeout(resource)) as req:
+                logger.debug('Status code %d', req.status_code)
+                logger.debug('Received headers: %s', req.headers)
+                if metrics is not None:
+                    timer.headers(req.elapsed.total_seconds())
+                    timer.connect = take_connect_time()
+                if self.hooks:
+                    self._hook_response(method, url, req.status_code, req.headers, None, started)
+
+                if req.status_code != 200:
+                    data = _error_data(req.status_code, req.text)
+                    if metrics is not None:
+                        timer.finish(req.status_code, data, len(req.content))
+                    self._check_status(req.status_code, data, req.headers)
+                    raise BaseAPIError(data)
+
+                sink = _DownloadSink(file, progress, checksum, req.headers)
+                try:
+                    for chunk in req.iter_content(chunk_size=chunk_size):
+                        sink.write(chunk)
+                except BaseException:
+                    sink.close(failed=True)
+                    raise
+                sink.close()
+                if metrics is not None:
+                    timer.finish(req.status_code, None, sink.size)
+
+        # только ошибки транспорта: OSError при открытии и записи файла пробрасывается как есть
+        except (requests.RequestException, ssl.SSLError) as exception:
+            logger.error(exception)
+            if metrics is not None:
+                timer.failed()
+            raise NetworkAPIError()
+
+        logger.debug('Downloaded %d bytes', sink.size)
+        return sink.result()
+
+    def _iter_pages(self, fetch, limit):
+        """
+        Постраничный обход выдачи с фоновой загрузкой следующей страницы
+
+        :param fetch: Функция offset => SearchClaimsResponseMP
+        :param int limit: Размер страницы
+
+        :rtype: Iterator[SearchedClaimMP]
+        """
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            offset = 0
+            future = executor.submit(fetch, offset)
+            while future is not None:
+                page = future.result()
+                claims = page.claims
+                offset += len(claims)
+                future = executor.submit(fetch, offset) if len(claims) >= limit else None
+                del page
+                for claim in claims:
+                    yield claim
+        finally:
+            executor.shutdown(wait=False)
+
+    def iter_claim_search(self,
+                          limit: int = 1000,
+                          claim_id: Optional[str] = None,
+                          phone: Optional[str] = None,
+                          status: Optional[str] = None,
+                          created_from: Optional[str] = None,
+                          created_to: Optional[str] = None,
+                          state: Optional[str] = None,
+                          due_from: Optional[str] = None,
+                          due_to: Optional[str] = None,
+                          external_order_id: Optional[str] = None,
+                          ) -> Iterator[SearchedClaimMP]:
+        """
+
+        Постраничный обход результатов :meth:`claim_search`
+
+        В памяти держится только текущая страница, следующая загружается в фоне,
+        пока обрабатывается текущая.
+
+        :param int limit: Размер страницы (не больше 1000) (1000)
+
+        Остальные параметры совпадают с :meth:`claim_search`.
+
+        :rtype: Iterator[SearchedClaimMP]
+        """
+        _check_page_limit('iter_claim_search', limit)
+
+        def fetch(offset):
+            return self.claim_search(offset=offset,
+                                     limit=limit,
+                                     claim_id=claim_id,
+                                     phone=phone,
+                                     status=status,
+                                     created_from=created_from,
+                                     created_to=created_to,
+                                     state=state,
+                                     due_from=due_from,
+                                     due_to=due_to,
+                                     external_order_id=external_order_id)
+
+        return self._iter_pages(fetch, limit)
+
+    def iter_search_active(self,
+                           limit: int = 1000,
+                           ) -> Iterator[SearchedClaimMP]:
+        """
+
+        Постраничный обход результатов :meth:`search_active`
+
+        В памяти держится только текущая страница, следующая загружается в фоне,
+        пока обрабатывается текущая.
+
+        :param int limit: Размер страницы (не больше 1000) (1000)
+
+        :rtype: Iterator[SearchedClaimMP]
+        """
+        _check_page_limit('iter_search_active', limit)
+        return self._iter_pages(lambda offset: self.search_active(offset=offset, limit=limit), limit)
+
+    def claim_search_sharded(self,
+                             created_from: str = None,
+                             created_to: str = None,
+                             shards: int = 8,
+                             max_workers: int = 4,
+                             limit: int = 1000,
+                             retries: int = 3,
+                             phone: Optional[str] = None,
+                             status: Optional[str] = None,
+                             state: Optional[str] = None,
+                             due_from: Optional[str] = None,
+                             due_to: Optional[str] = None,
+                             external_order_id: Optional[str] = None,
+                             ) -> Iterator[SearchedClaimMP]:
+        """
+
+        Параллельный поиск заявок за длинный период
+
+        Период ``created_from``..``created_to`` делится на ``shards`` равных интервалов, которые выгружаются
+        через :meth:`claim_search` параллельно в ``max_workers`` потоков. Каждый интервал хранит свое смещение
+        и уже полученные заявки, поэтому ошибка повторяет только этот интервал, начиная с упавшей страницы.
+        Повторяются только сетевые ошибки и ошибки сервера (429, 5xx), ошибки запроса (4xx) выбрасываются сразу.
+
+        Заявки отдаются в порядке ``created_ts`` без повторов (по ``id``).
+
+        :param str created_from: Начало периода поиска (isoformat) *(Обязательный параметр)* (2020-01-01T00:00:00+00:00)
+        :param str created_to: Окончание периода поиска (isoformat) *(Обязательный параметр)* (2020-02-01T00:00:00+00:00)
+        :param int shards: Количество интервалов (8)
+        :param int max_workers: Количество параллельных потоков (4)
+        :param int limit: Размер страницы (не больше 1000) (1000)
+        :param int retries: Количество повторов для одного интервала (3)
+
+        Остальные параметры совпадают с :meth:`claim_search`.
+
+        :rtype: Iterator[SearchedClaimMP]
+        """
+        if created_from is None:
+            raise InputParamError("<created_from> (=>created_from) of <claim_search_sharded> is a required parameter of <str> type")
+        if created_to is None:
+            raise InputParamError("<created_to> (=>created_to) of <claim_search_sharded> is a required parameter of <str> type")
+        if shards < 1:
+            raise InputParamError("<shards> of <claim_search_sharded> should be more than 1")
+        if max_workers < 1:
+            raise InputParamError("<max_workers> of <claim_search_sharded> should be more than 1")
+        _check_page_limit('claim_search_sharded', limit)
+
+        since = _parse_ts('created_from', created_from)
+        till = _parse_ts('created_to', created_to)
+        if since >= till:
+            raise InputParamError("<created_from> of <claim_search_sharded> should be less than <created_to>")
+
+        step = (till - since) / shards
+        bounds = [since + step * i for i in range(shards)] + [till]
+        intervals = [_SearchShard(bounds[i].isoformat(), bounds[i + 1].isoformat()) for i in range(shards)]
+
+        def fetch(shard):
+            return self.claim_search(offset=shard.offset,
+                                     limit=limit,
+                                     phone=phone,
+                                     status=status,
+                                     created_from=shard.created_from,
+                                     created_to=shard.created_to,
+                                     state=state,
+                                     due_from=due_from,
+                                     due_to=due_to,
+                                     external_order_id=external_order_id)
+
+        def run(shard):
+            while True:
+                try:
+                    while not shard.done:
+                        claims = fetch(shard).claims
+                        shard.claims.extend(claims)
+                        shard.offset += len(claims)
+                        shard.done = len(claims) < limit
+                    return shard
+                except RETRYABLE_ERRORS as exception:
+                    shard.attempts += 1
+                    if shard.attempts > retries:
+                        raise
+                    logger.warning('Shard %s..%s failed at offset %d (%r), retrying',
+                                   shard.created_from, shard.created_to, shard.offset, exception)
+
+        return self._merge_shards(intervals, run, max_workers)
+
+    @staticmethod
+    def _merge_shards(intervals, run, max_workers):
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [executor.submit(run, shard) for shard in intervals]
+            seen = set()
+            for future in futures:
+                shard = future.result()
+                claims, shard.claims = shard.claims, []
+                claims.sort(key=_created_key)
+                for claim in claims:
+                    if claim.id in seen:
+                        continue
+                    seen.add(claim.id)
+                    yield claim
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def claim_bulk_many(self,
+                        claim_ids: Iterable[str] = None,
+                        max_workers: int = 4,
+                        on_error: Optional[Callable] = None,
+                        ) -> Iterator[SearchedClaimMP]:
+        """
+
+        Получение информации по любому количеству заявок
+
+        Идентификаторы очищаются от повторов и делятся на пачки по 1000, которые запрашиваются через
+        :meth:`claim_bulk` параллельно в ``max_workers`` потоков. Заявки отдаются по мере готовности пачек;
+        в работе не больше ``max_workers * 2`` пачек, обработанные пачки не хранятся.
+
+        Ошибка одной пачки не прерывает остальные: она передается в ``on_error(claim_ids, exception)``,
+        а если обработчик не указан - после обработки всех пачек выбрасывается :class:`yacargo.exceptions.BulkRequestError`
+        со списком неудачных пачек.
+
+        :param Iterable[str] claim_ids: Идентификаторы заявок *(Обязательный параметр)*
+        :param int max_workers: Количество параллельных запросов (4)
+        :param Callable on_error: Обработчик ошибки пачки
+
+        :rtype: Iterator[SearchedClaimMP]
+        """
+        if claim_ids is None:
+            raise InputParamError("<claim_ids> (=>claim_ids) of <claim_bulk_many> is a required parameter of <Iterable[str]> type")
+        if max_workers < 1:
+            raise InputParamError("<max_workers> of <claim_bulk_many> should be more than 1")
+
+        claim_ids = list(dict.fromkeys(claim_ids))
+        validate_fields('claim_ids', claim_ids, List[str])
+        chunks = [claim_ids[i:i + BULK_CHUNK_SIZE] for i in range(0, len(claim_ids), BULK_CHUNK_SIZE)]
+        return self._bulk_chunks(chunks, max_workers, on_error)
+
+    def _bulk_chunks(self, chunks, max_workers, on_error):
+        failures = []
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = {}
+        pending = iter(chunks)
+        try:
+            while True:
+                for chunk in itertools.islice(pending, max_workers * 2 - len(futures)):
+                    futures[executor.submit(self.claim_bulk, claim_ids=chunk)] = chunk
+                if not futures:
+                    break
+                future = next(as_completed(futures))
+                # готовая пачка больше не нужна пулу: после обхода ее заявки освобождаются
+                chunk = futures.pop(future)
+                try:
+                    claims = future.result().claims
+                except (NetworkAPIError, BaseAPIError, NotAuthorized) as exception:
+                    logger.error('claim_bulk for %d claims failed: %r', len(chunk), exception)
+                    if on_error is None:
+                        failures.append((chunk, exception))
+                    else:
+                        on_error(chunk, exception)
+                    continue
+                for claim in claims:
+                    yield claim
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if failures:
+            raise BulkRequestError(failures)
+
+    def create_many(self,
+                    claims: Iterable[dict] = None,
+                    max_workers: int = 8,
+                    processes: int = 0,
+                    namespace: str = '',
+                    ) -> Iterator['CreateResult']:
+        """
+
+        Создание большого количества заявок
+
+        Сначала проверяются параметры всех заявок (при ``processes`` > 0 и больше 256 заявках - в пуле процессов),
+        затем заявки создаются через :meth:`claim_create` параллельно в ``max_workers`` потоков.
+        Результаты отдаются по мере готовности в порядке входных заявок.
+
+        Если ``request_id`` не указан, он вычисляется из параметров заявки и ``namespace`` (uuid5),
+        поэтому повторный запуск той же волны не создаст дубликатов, а повторы запросов безопасны.
+        Одинаковые заявки одной волны получают один ``request_id`` и создаются один раз;
+        чтобы создать несколько одинаковых заявок, передайте им разные ``request_id``.
+
+            >>> for result in ya.create_many([{'items': [...], 'route_points': [...]}, ...], namespace='wave-42'):
+            >>>     if result.error:
+            >>>         ...
+
+        :param Iterable[dict] claims: Параметры :meth:`claim_create` для каждой заявки *(Обязательный параметр)*
+        :param int max_workers: Количество параллельных запросов (8)
+        :param int processes: Количество процессов для проверки параметров (0 - в текущем процессе)
+        :param str namespace: Пространство имен для вычисления request_id (например, номер волны)
+
+        :rtype: Iterator[CreateResult]
+        """
+        if claims is None:
+            raise InputParamError("<claims> (=>claims) of <create_many> is a required parameter of <Iterable[dict]> type")
+        if max_workers < 1:
+            raise InputParamError("<max_workers> of <create_many> should be more than 1")
+
+        jobs = [(namespace, kwargs) for kwargs in claims]
+        if processes > 0 and len(jobs) > PROCESS_THRESHOLD:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                prepared = list(pool.map(_prepare_claim, jobs, chunksize=max(1, len(jobs) // (processes * 4))))
+        else:
+            prepared = [_prepare_claim(job) for job in jobs]
+        return self._create_prepared(prepared, max_workers)
+
+    def fetch_report(self,
+                     since_date: str = None,
+                     till_date: str = None,
+                     lang: Optional[str] = None,
+                     idempotency_token: Optional[str] = None,
+                     cache_dir: str = CACHE_DIR,
+                     timeout: float = 600.0,
+                     ) -> Report:
+        """
+
+        Получение отчета по заявкам за период одним вызовом
+
+        Запускает :meth:`report_generate`, ждет готовности через :meth:`report_status` с растущей паузой
+        и скачивает файл потоком в ``cache_dir``. Отчет за тот же период с тем же токеном берется из ``cache_dir``.
+        Строки отчета: ``fetch_report(...).rows()``. Подробнее - :func:`yacargo.reports.fetch_report`.
+
+        :param str since_date: Дата начала отчетного периода *(Обязательный параметр)* (2020-01-01)
+        :param str till_date: Дата конца отчетного периода *(Обязательный параметр)* (2020-01-02)
+        :param Optional[str] lang: Язык отчета
+        :param Optional[str] idempotency_token: Токен идемпотентности (по умолчанию вычисляется из периода и языка)
+        :param str cache_dir: Каталог для скачанных отчетов
+        :param float timeout: Максимальное время ожидания отчета в секундах
+
+        :rtype: Report
+        """
+        if since_date is None:
+            raise InputParamError("<since_date> (=>since_date) of <fetch_report> is a required parameter of <str> type")
+        if till_date is None:
+            raise InputParamError("<till_date> (=>till_date) of <fetch_report> is a required parameter of <str> type")
+        return fetch_report(self, since_date, till_date, lang=lang, idempotency_token=idempotency_token,
+                            cache_dir=cache_dir, timeout=timeout)
+
+    def _create_prepared(self, prepared, max_workers):
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        window = collections.deque()
+        pending = iter(prepared)
+
+        def submit():
+            for request_id, request, error in pending:
+                if error is not None:
+                    window.append((request_id, None, error))
+                else:
+                    window.append((request_id, executor.submit(self._call, **request), None))
+                    return
+
+        try:
+            for _ in range(max_workers * 2):
+                submit()
+            while window:
+                request_id, future, error = window.popleft()
+                submit()
+                if future is not None:
+                    try:
+                        yield CreateResult(request_id, future.result(), None)
+                    except (NetworkAPIError, BaseAPIError, NotAuthorized) as exception:
+                        logger.error('claim_create %s failed: %r', request_id, exception)
+                        yield CreateResult(request_id, None, exception)
+                else:
+                    yield CreateResult(request_id, None, error)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+CreateResult = collections.namedtuple('CreateResult', ['request_id', 'claim', 'error'])
+CreateResult.__doc__ = """
+    Результат создания заявки в :meth:`YCAPI.create_many`
+
+    :param str request_id: Токен идемпотентности заявки
+    :param Optional[SearchedClaimMP] claim: Созданная заявка
+    :param Optional[BaseException] error: Ошибка проверки параметров или запроса
+"""
+
+
+class _RequestBuilder(YCBaseAPI):
+    """
+    Клиент без транспорта: методы проверяют параметры и возвращают готовый запрос вместо его отправки
+    """
+
+    def __init__(self):
+        pass
+
+    def _call(self, resource, params, body, method='post', response=None):
+        return {'resource': resource, 'params': params, 'body': _plain(body), 'method': method, 'response': response}
+
+
+def _plain(value):
+    """
+    Тело запроса из вложенных ``defaultdict`` в обычные dict (для передачи между процессами)
+    """
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _request_id(namespace, kwargs):
+    """
+    Детерминированный request_id: uuid5 от параметров заявки
+
+    :param str namespace: Пространство имен
+    :param dict kwargs: Параметры claim_create
+
+    :rtype: str
+    """
+    data = json.dumps(kwargs, sort_keys=True, ensure_ascii=False, default=_json_default)
+    return uuid.uuid5(uuid.NAMESPACE_URL, '{}:{}'.format(namespace, data)).hex
+
+
+def _json_default(obj):
+    """
+    Сериализация объектов библиотеки для :func:`_request_id`. Для остальных типов - TypeError,
+    как у ``json.dumps``, чтобы ошибка попала в результат своей заявки
+    """
+    if isinstance(obj, YCBase):
+        return obj.json()
+    raise TypeError("<{}> is not JSON serializable".format(type(obj).__name__))
+
+
+def _prepare_claim(job):
+    """
+    Проверка параметров одной заявки для :meth:`YCAPI.create_many`
+
+    :param tuple job: Пространство имен и параметры claim_create
+
+    :return: request_id, запрос (или None) и ошибка проверки (или None)
+    :rtype: tuple
+    """
+    namespace, kwargs = job
+    request_id = kwargs.get('request_id')
+    try:
+        if request_id is None:
+            request_id = _request_id(namespace, kwargs)
+            kwargs = dict(kwargs, request_id=request_id)
+        return request_id, _RequestBuilder().claim_create(**kwargs), None
+    except (InputParamError, TypeError, ValueError) as exception:
+        return request_id, None, exception
+
+
+class _SearchShard:
+    """
+    Интервал параллельного поиска и его контрольная точка (смещение и уже полученные заявки)
+
+    :param str created_from: Начало интервала (isoformat)
+    :param str created_to: Окончание интервала (isoformat)
+    """
+
+    def __init__(self, created_from, created_to):
+        self.created_from = created_from
+        self.created_to = created_to
+        self.offset = 0
+        self.claims = []
+        self.done = False
+        self.attempts = 0
+
+
+def _check_page_limit(method_name, limit):
+    """
+    Проверка размера страницы постраничного обхода: при нулевом размере обход не закончится
+
+    :param str method_name: Название метода, передается для ошибки
+    :param int limit: Размер страницы
+    """
+    validate_fields('limit', limit, int)
+    if limit < 1 or limit > 1000:
+        raise InputParamError("<limit> of <{}> should be between 1 and 1000".format(method_name))
+
+
+def _created_key(claim):
+    """
+    Ключ сортировки заявок по времени создания с учетом часового пояса
+
+    :rtype: datetime.datetime
+    """
+    if not claim.created_ts:
+        return MIN_TS
+    created = _parse_ts('created_ts', claim.created_ts)
+    return created if created.tzinfo is not None else created.replace(tzinfo=datetime.timezone.utc)
+
+
+def _parse_ts(field_name, value):
+    """
+    Разбор времени в формате isoformat
+
+    :param str field_name: Название поля, передается для ошибки
+    :param str value: Время
+
+    :rtype: datetime.datetime
+    """
+    validate_fields(field_name, value, str)
+    try:
+        return datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise InputParamError("<{}> should be in isoformat".format(field_name))
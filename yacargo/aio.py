@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+Модуль с асинхронным клиентом API (asyncio + aiohttp)
+"""
+import asyncio
+import logging
+import socket
+import ssl
+import time
+
+import aiohttp
+
+from yacargo import JSON_HEADERS, TIMEOUT, YCBaseAPI, _DownloadSink, _error_data
+from yacargo.exceptions import BaseAPIError, NetworkAPIError
+from yacargo.retry import RETRYABLE_ERRORS, is_idempotent
+from yacargo.singleflight import AsyncSingleFlight
+
+logger = logging.getLogger('yaCargo')
+
+
+def _client_timeout(timeout):
+    """
+    Таймаут ``aiohttp`` из таймаута в формате ``requests``
+
+    :param timeout: Число, пара (connect, read) или None
+
+    :rtype: aiohttp.ClientTimeout
+    """
+    if timeout is None:
+        return aiohttp.ClientTimeout(total=None)
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    return aiohttp.ClientTimeout(total=None, sock_connect=connect, sock_read=read)
+
+
+class AsyncYCAPI(YCBaseAPI):
+    """
+
+    Асинхронный клиент. Методы совпадают с :class:`yacargo.YCAPI` по сигнатурам,
+    но возвращают корутины:
+
+        >>> async with AsyncYCAPI('SuperDuperToken') as ya:
+        >>>     claim = await ya.claim_info('4c23108d326345e9aba7bbaab4537a21')
+
+    Все запросы клиента идут через общий пул соединений ``aiohttp``.
+
+    :param str authorization_key: Авторизационный ключ
+    :param bool test_server: Использовать ли тестовый сервер?
+    :param bool strict: Проверять типы всех полей ответов сервера (медленно, для отладки)
+    :param int limit: Максимальное количество одновременно открытых соединений
+    :param int limit_per_host: Максимальное количество соединений к одному хосту (0 - без ограничения)
+    :param timeout: Таймаут в секундах, как у :class:`yacargo.YCAPI`: число или пара (connect, read).
+        ``None`` - без таймаута
+    :param RetryPolicy retry: Политика повторов запросов
+    :param rate_limit: Ограничения частоты запросов по ресурсам
+    :param hooks: Обработчики запросов и ответов
+    :param codec: Кодек JSON
+    :param bool singleflight: Объединять одинаковые одновременные запросы на чтение в один
+    :param ClaimCache cache: Кэш ответов claim_info
+    :param Metrics metrics: Метрики запросов (:class:`yacargo.metrics.Metrics`)
+    """
+
+    _singleflight_class = AsyncSingleFlight
+
+    def __init__(self, authorization_key=None, test_server=False, strict=False, limit=100, limit_per_host=0, timeout=TIMEOUT,
+                 retry=None, rate_limit=None, hooks=(), codec=None, singleflight=False, cache=None, metrics=None):
+        super().__init__(authorization_key=authorization_key, test_server=test_server, strict=strict, retry=retry,
+                         rate_limit=rate_limit, hooks=hooks, codec=codec, singleflight=singleflight, cache=cache)
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.metrics = metrics
+        self.session = None
+
+    def _get_session(self):
+        """
+        Ленивое создание сессии: ``aiohttp`` требует запущенный event loop
+
+        :rtype: aiohttp.ClientSession
+        """
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            self.session = aiohttp.ClientSession(connector=connector,
+                                                 headers=self.headers,
+                                                 timeout=_client_timeout(self.timeout),
+                                                 trace_configs=[self.metrics.trace_config()] if self.metrics else None)
+        return self.session
+
+    async def close(self):
+        """
+        Закрытие пула соединений
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _request(self, resource, params, body, method='post'):
+        """
+
+        :param str resource: Запрашиваемый ресурс
+        :param dict params: Параметры
+        :param dict body: Тело запроса
+
+        :return:
+        """
+        url = self._url(resource)
+        payload = self.codec.encode(body)
+        timer = self.metrics.start(resource, method, len(payload)) if self.metrics is not None else None
+
+        try:
+            logger.debug('Requesting resource %s', url)
+            logger.debug('Requesting params %s', params)
+            logger.debug('Requesting body %s', body)
+            if self.hooks:
+                self._hook_request(method, url, params, body)
+                started = time.monotonic()
+            async with self._get_session().request(method=method,
+                                                   url=url,
+                                                   params=params,
+                                                   data=payload,
+                                                   headers=JSON_HEADERS,
+                                                   trace_request_ctx=timer) as req:
+                logger.debug('Status code %d', req.status)
+                logger.debug('Received headers: %s', req.headers)
+                if timer is not None:
+                    timer.headers()
+
+                content = await req.read()
+                if timer is not None:
+                    timer.received()
+                if req.status == 200:
+                    data = self.codec.loads(content)
+                else:
+                    data = _error_data(req.status, content.decode(req.get_encoding(), errors='replace'))
+                status_code = req.status
+                headers = req.headers
+                if timer is not None:
+                    timer.finish(status_code, data, len(content))
+                if self.hooks:
+                    self._hook_response(method, url, status_code, headers, data, started)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError, ssl.SSLError,
+                socket.error) as exception:
+            logger.error(exception)
+            if timer is not None:
+                timer.failed()
+            raise NetworkAPIError()
+
+        logger.debug('Received JSON: %s', data)
+
+        self._check_status(status_code, data, headers)
+
+        return data
+
+    async def _call(self, resource, params, body, method='post', response=None):
+        if self.cache is not None:
+            cached = self.cache.before(resource, params)
+            if cached is not None:
+                return cached
+        key = self._shared(resource, params, body, method)
+        if key is not None:
+            result = await self.singleflight.do(key, lambda: self._send(resource, params, body, method, response))
+        else:
+            result = await self._send(resource, params, body, method, response)
+        if self.cache is not None:
+            self.cache.after(resource, params, result)
+        return result
+
+    async def _send(self, resource, params, body, method, response):
+        retry = self.retry.start(is_idempotent(resource, params, body))
+        while True:
+            delay = self._reserve(resource)
+            if delay:
+                await asyncio.sleep(delay)
+            try:
+                item = await self._request(resource=resource, params=params, body=body, method=method)
+            except RETRYABLE_ERRORS as exception:
+                delay = retry.next_delay(exception)
+                if delay is None:
+                    raise
+                logger.warning('Retrying %s in %.2fs (attempt %d)', resource, delay, retry.attempt)
+                await asyncio.sleep(delay)
+            else:
+                return self._build(response, item) if response else item
+
+    async def _download(self, resource, params, body, method, file, chunk_size, progress, checksum):
+        url = self._url(resource)
+        delay = self._reserve(resource)
+        if delay:
+            await asyncio.sleep(delay)
+
+        payload = self.codec.encode(body)
+        timer = self.metrics.start(resource, method, len(payload)) if self.metrics is not None else None
+        try:
+            logger.debug('Downloading resource %s', url)
+            logger.debug('Requesting params %s', params)
+            if self.hooks:
+                self._hook_request(method, url, params, body)
+                started = time.monotonic()
+            async with self._get_session().request(method=method, url=url, params=params, data=payload,
+                                                   headers=JSON_HEADERS, trace_request_ctx=timer) as req:
+                logger.debug('Status code %d', req.status)
+                logger.debug('Received headers: %s', req.headers)
+                if timer is not None:
+                    timer.headers()
+                if self.hooks:
+                    self._hook_response(method, url, req.status, req.headers, None, started)
+
+                if req.status != 200:
+                    content = await req.read()
+                    data = _error_data(req.status, content.decode(req.get_encoding(), errors='replace'))
+                    if timer is not None:
+                        timer.finish(req.status, data, len(content))
+                    self._check_status(req.status, data, req.headers)
+                    raise BaseAPIError(data)
+
+                sink = _DownloadSink(file, progress, checksum, req.headers)
+                try:
+                    async for chunk in req.content.iter_chunked(chunk_size):
+                        sink.write(chunk)
+                except BaseException:
+                    sink.close(failed=True)
+                    raise
+                sink.close()
+                if timer is not None:
+                    timer.finish(req.status, None, sink.size)
+
+        # только ошибки транспорта: OSError при открытии и записи файла пробрасывается как есть
+        except (aiohttp.ClientError, asyncio.TimeoutError, ssl.SSLError) as exception:
+            logger.error(exception)
+            if timer is not None:
+                timer.failed()
+            raise NetworkAPIError()
+
+        logger.debug('Downloaded %d bytes', sink.size)
+        return sink.result()
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Модуль с объединением одиночных запросов claim_info в пакетные claim_bulk
+"""
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+
+from yacargo.exceptions import BaseAPIError, InputParamError
+from yacargo.objects import SearchedClaimMP, validate_fields
+
+logger = logging.getLogger('yaCargo')
+
+MAX_BULK_SIZE = 1000
+
+
+def _not_found(claim_id):
+    """
+    Ошибка, аналогичная ответу claim_info на несуществующую заявку
+
+    :param str claim_id: Идентификатор заявки
+
+    :rtype: BaseAPIError
+    """
+    return BaseAPIError({'code': 'not_found', 'message': 'Claim {} not found'.format(claim_id)})
+
+
+def _check_claim_id(claim_id):
+    if claim_id is not None:
+        validate_fields('claim_id', claim_id, str)
+    if claim_id is None:
+        raise InputParamError("<claim_id> (=>claim_id) of <claim_info> is a required parameter of <str> type")
+
+
+def _resolve(waiters, response, exception):
+    """
+    Раздача результата claim_bulk ожидающим вызовам
+
+    :param dict waiters: claim_id => список объектов ожидания (Future)
+    :param SearchClaimsResponseMP response: Ответ claim_bulk
+    :param BaseException exception: Ошибка запроса, если была
+    """
+    if exception is not None:
+        for futures in waiters.values():
+            for future in futures:
+                if not future.done():
+                    future.set_exception(exception)
+        return
+
+    claims = {claim.get('id'): claim for claim in response.json().get('claims', [])}
+    for claim_id, futures in waiters.items():
+        for future in futures:
+            if future.done():
+                continue
+            if claim_id in claims:
+                future.set_result(SearchedClaimMP.from_response(claims[claim_id]))
+            else:
+                future.set_exception(_not_found(claim_id))
+
+
+class ClaimInfoBatcher:
+    """
+
+    Объединяет параллельные вызовы ``claim_info`` из разных потоков в один запрос ``claim_bulk``.
+
+    Запрос отправляется по истечении окна ``window`` с момента первого вызова
+    или сразу, как только набралось ``max_batch`` разных заявок.
+
+        >>> batcher = ClaimInfoBatcher(ya, window=0.005)
+        >>> claim = batcher.claim_info('4c23108d326345e9aba7bbaab4537a21')
+
+    :param YCAPI api: Клиент API
+    :param float window: Окно накопления запросов в секундах
+    :param int max_batch: Максимальное количество заявок в одном claim_bulk (не больше 1000)
+    """
+
+    def __init__(self, api, window=0.005, max_batch=MAX_BULK_SIZE):
+        if not 1 <= max_batch <= MAX_BULK_SIZE:
+            raise InputParamError("<max_batch> of <ClaimInfoBatcher> should be between 1 and {}".format(MAX_BULK_SIZE))
+        self.api = api
+        self.window = window
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._timer = None
+
+    def claim_info(self, claim_id: str = None) -> SearchedClaimMP:
+        """
+
+        Получение информации по заявке через общий запрос claim_bulk
+
+        :param str claim_id: Идентификатор заявки *(Обязательный параметр)*
+
+        :rtype: SearchedClaimMP
+        """
+        _check_claim_id(claim_id)
+        future = Future()
+        batch = None
+        with self._lock:
+            self._pending.setdefault(claim_id, []).append(future)
+            if len(self._pending) >= self.max_batch:
+                batch = self._take()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if batch:
+            self._send(batch)
+        return future.result()
+
+    def _take(self):
+        batch, self._pending = self._pending, {}
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def flush(self):
+        """
+        Немедленная отправка накопленных запросов
+        """
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._send(batch)
+
+    def _send(self, batch):
+        logger.debug('Sending claim_bulk for %d claims', len(batch))
+        try:
+            response = self.api.claim_bulk(claim_ids=list(batch))
+        except BaseException as exception:
+            _resolve(batch, None, exception)
+        else:
+            _resolve(batch, response, None)
+
+
+class AsyncClaimInfoBatcher:
+    """
+
+    Асинхронный вариант :class:`ClaimInfoBatcher` для :class:`yacargo.aio.AsyncYCAPI`.
+    Все вызовы должны выполняться в одном event loop.
+
+        >>> batcher = AsyncClaimInfoBatcher(ya, window=0.005)
+        >>> claim = await batcher.claim_info('4c23108d326345e9aba7bbaab4537a21')
+
+    :param AsyncYCAPI api: Асинхронный клиент API
+    :param float window: Окно накопления запросов в секундах
+    :param int max_batch: Максимальное количество заявок в одном claim_bulk (не больше 1000)
+    """
+
+    def __init__(self, api, window=0.005, max_batch=MAX_BULK_SIZE):
+        if not 1 <= max_batch <= MAX_BULK_SIZE:
+            raise InputParamError("<max_batch> of <AsyncClaimInfoBatcher> should be between 1 and {}".format(MAX_BULK_SIZE))
+        self.api = api
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = {}
+        self._handle = None
+        self._tasks = set()
+
+    async def claim_info(self, claim_id: str = None) -> SearchedClaimMP:
+        """
+
+        Получение информации по заявке через общий запрос claim_bulk
+
+        :param str claim_id: Идентификатор заявки *(Обязательный параметр)*
+
+        :rtype: SearchedClaimMP
+        """
+        _check_claim_id(claim_id)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(claim_id, []).append(future)
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._handle is None:
+            self._handle = loop.call_later(self.window, self.flush)
+        return await future
+
+    def flush(self):
+        """
+        Немедленная отправка накопленных запросов
+        """
+        batch, self._pending = self._pending, {}
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if batch:
+            # event loop хранит только слабые ссылки на задачи
+            task = asyncio.ensure_future(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch):
+        logger.debug('Sending claim_bulk for %d claims', len(batch))
+        try:
+            response = await self.api.claim_bulk(claim_ids=list(batch))
+        except asyncio.CancelledError as exception:
+            _resolve(batch, None, exception)
+            raise
+        except BaseException as exception:
+            _resolve(batch, None, exception)
+        else:
+            _resolve(batch, response, None)
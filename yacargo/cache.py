@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Модуль с кэшем ответов claim_info
+"""
+import collections
+import logging
+import threading
+import time
+
+logger = logging.getLogger('yaCargo')
+
+INFO_RESOURCE = '/b2b/cargo/integration/v2/claims/info'
+JOURNAL_RESOURCE = '/b2b/cargo/integration/v1/claims/journal'
+WRITE_RESOURCES = frozenset((
+    '/b2b/cargo/integration/v2/claims/edit',
+    '/b2b/cargo/integration/v1/claims/accept',
+    '/b2b/cargo/integration/v1/claims/cancel',
+))
+
+CacheStats = collections.namedtuple('CacheStats', ['hits', 'misses', 'evictions', 'invalidations', 'size'])
+CacheStats.__doc__ = """
+    Статистика кэша
+
+    :param int hits: Ответов из кэша
+    :param int misses: Запросов к серверу
+    :param int evictions: Записей, вытесненных по размеру или устаревших по времени
+    :param int invalidations: Записей, сброшенных журналом или изменением заявки
+    :param int size: Записей в кэше
+"""
+
+
+class ClaimCache:
+    """
+
+    Кэш ответов ``claim_info`` по ``claim_id`` с ограничением времени жизни и размера (LRU).
+
+    Запись сбрасывается, когда ``claim_journal`` этого же клиента возвращает событие по заявке
+    с ревизией новее закэшированной, и при вызове ``claim_edit``, ``claim_accept``, ``claim_cancel``.
+
+        >>> ya = YCAPI('SuperDuperToken', cache=ClaimCache(maxsize=10000, ttl=60))
+        >>> ya.cache.stats()
+
+    Ответ из кэша - тот же объект, что был получен от сервера.
+
+    :param int maxsize: Максимальное количество заявок в кэше
+    :param float ttl: Время жизни записи в секундах
+    """
+
+    def __init__(self, maxsize=1024, ttl=30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._items = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, claim_id):
+        """
+        Заявка из кэша
+
+        :param str claim_id: Идентификатор заявки
+
+        :rtype: Optional[SearchedClaimMP]
+        """
+        with self._lock:
+            entry = self._items.get(claim_id)
+            if entry is not None and entry[2] < time.monotonic():
+                del self._items[claim_id]
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(claim_id)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, claim_id, claim):
+        """
+        Сохранение заявки
+
+        :param str claim_id: Идентификатор заявки
+        :param SearchedClaimMP claim: Заявка
+        """
+        with self._lock:
+            self._items[claim_id] = (claim, claim.json().get('revision'), time.monotonic() + self.ttl)
+            self._items.move_to_end(claim_id)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, claim_id):
+        """
+        Сброс записи
+
+        :param str claim_id: Идентификатор заявки
+        """
+        with self._lock:
+            if self._items.pop(claim_id, None) is not None:
+                self.invalidations += 1
+
+    def apply_journal(self, events):
+        """
+        Сброс записей, для которых в журнале есть более новая ревизия
+
+        :param list events: События журнала в виде json
+        """
+        with self._lock:
+            for event in events:
+                entry = self._items.get(event.get('claim_id'))
+                if entry is None:
+                    continue
+                revision = event.get('revision')
+                if revision is None or entry[1] is None or revision > entry[1]:
+                    del self._items[event['claim_id']]
+                    self.invalidations += 1
+
+    def clear(self):
+        """
+        Очистка кэша
+        """
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        """
+        :rtype: CacheStats
+        """
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.evictions, self.invalidations, len(self._items))
+
+    def before(self, resource, params):
+        """
+        Обработка запроса клиента до отправки
+
+        :param str resource: Запрашиваемый ресурс
+        :param dict params: Параметры
+
+        :return: Ответ из кэша или None
+        """
+        if resource == INFO_RESOURCE:
+            return self.get(params['claim_id'])
+        if resource in WRITE_RESOURCES:
+            self.invalidate(params['claim_id'])
+        return None
+
+    def after(self, resource, params, result):
+        """
+        Обработка ответа сервера
+
+        :param str resource: Запрашиваемый ресурс
+        :param dict params: Параметры
+        :param result: Объект ответа
+        """
+        if resource == INFO_RESOURCE:
+            self.put(params['claim_id'], result)
+        elif resource == JOURNAL_RESOURCE:
+            self.apply_journal(result.json().get('events') or ())
+        elif resource in WRITE_RESOURCES:
+            # запись могла вернуться в кэш параллельным claim_info, пока шло изменение
+            self.invalidate(params['claim_id'])
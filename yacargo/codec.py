@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Модуль с кодеками JSON для тел запросов и ответов
+"""
+import functools
+import json
+import logging
+
+from yacargo.exceptions import InputParamError
+
+logger = logging.getLogger('yaCargo')
+
+
+class JSONCodec:
+    """
+
+    Пара функций сериализации JSON.
+
+        >>> import orjson
+        >>> ya = YCAPI('SuperDuperToken', codec=JSONCodec(orjson.dumps, orjson.loads, 'orjson'))
+
+    :param dumps: Сериализация: объект => ``str`` или ``bytes``
+    :param loads: Разбор: ``bytes`` => объект
+    :param str name: Название кодека
+    """
+
+    def __init__(self, dumps, loads, name=None):
+        self.dumps = dumps
+        self.loads = loads
+        self.name = name or getattr(dumps, '__module__', None)
+
+    def encode(self, obj):
+        """
+        Сериализация тела запроса
+
+        :param obj: Объект (dict, в том числе ``collections.defaultdict``)
+
+        :return: JSON в кодировке UTF-8
+        :rtype: bytes
+        """
+        data = self.dumps(obj)
+        return data.encode('utf-8') if isinstance(data, str) else data
+
+    def __repr__(self):
+        return 'JSONCodec({})'.format(self.name)
+
+
+def _stdlib():
+    return JSONCodec(functools.partial(json.dumps, ensure_ascii=False, separators=(',', ':')), json.loads, 'json')
+
+
+def _orjson():
+    import orjson
+    return JSONCodec(orjson.dumps, orjson.loads, 'orjson')
+
+
+def _ujson():
+    import ujson
+    return JSONCodec(functools.partial(ujson.dumps, ensure_ascii=False), ujson.loads, 'ujson')
+
+
+CODECS = {'json': _stdlib, 'orjson': _orjson, 'ujson': _ujson}
+
+
+def get_codec(codec=None):
+    """
+
+    Кодек по названию или самый быстрый из установленных: orjson, ujson, json
+
+    :param codec: :class:`JSONCodec`, название (``json``, ``orjson``, ``ujson``) или None
+
+    :rtype: JSONCodec
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec is not None:
+        if codec not in CODECS:
+            raise InputParamError("<codec> should be in {}".format(list(CODECS)))
+        return CODECS[codec]()
+    for name in ('orjson', 'ujson'):
+        try:
+            return CODECS[name]()
+        except ImportError:
+            continue
+    return _stdlib()
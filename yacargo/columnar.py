@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+"""
+Модуль с выгрузкой заявок в колонки: NumPy, pandas, Parquet
+"""
+import datetime
+import logging
+import os
+
+from yacargo.objects import YCBase
+
+logger = logging.getLogger('yaCargo')
+
+STR, FLOAT, INT, BOOL, TS = 'str', 'float', 'int', 'bool', 'ts'
+
+CLAIM_COLUMNS = (
+    ('claim_id', ('id',), STR),
+    ('status', ('status',), STR),
+    ('version', ('version',), INT),
+    ('revision', ('revision',), INT),
+    ('created_ts', ('created_ts',), TS),
+    ('updated_ts', ('updated_ts',), TS),
+    ('due', ('due',), TS),
+    ('corp_client_id', ('corp_client_id',), STR),
+    ('current_point_id', ('current_point_id',), INT),
+    ('eta', ('eta',), INT),
+    ('taxi_class', ('client_requirements', 'taxi_class'), STR),
+    ('final_price', ('pricing', 'final_price'), FLOAT),
+    ('offer_price', ('pricing', 'offer', 'price'), FLOAT),
+    ('currency', ('pricing', 'currency'), STR),
+    ('available_cancel_state', ('available_cancel_state',), STR),
+    ('courier_name', ('performer_info', 'courier_name'), STR),
+    ('car_number', ('performer_info', 'car_number'), STR),
+)
+
+POINT_COLUMNS = (
+    ('point_id', ('id',), INT),
+    ('type', ('type',), STR),
+    ('visit_order', ('visit_order',), INT),
+    ('visit_status', ('visit_status',), STR),
+    ('lon', ('address', 'coordinates', 0), FLOAT),
+    ('lat', ('address', 'coordinates', 1), FLOAT),
+    ('fullname', ('address', 'fullname'), STR),
+    ('city', ('address', 'city'), STR),
+    ('external_order_id', ('external_order_id',), STR),
+    ('payment_cost', ('payment_on_delivery', 'cost'), FLOAT),
+    ('payment_is_paid', ('payment_on_delivery', 'is_paid'), BOOL),
+)
+
+ITEM_COLUMNS = (
+    ('pickup_point', ('pickup_point',), INT),
+    ('droppof_point', ('droppof_point',), INT),
+    ('title', ('title',), STR),
+    ('quantity', ('quantity',), INT),
+    ('weight', ('weight',), FLOAT),
+    ('cost_value', ('cost_value',), FLOAT),
+    ('cost_currency', ('cost_currency',), STR),
+    ('length', ('size', 'length'), FLOAT),
+    ('width', ('size', 'width'), FLOAT),
+    ('height', ('size', 'height'), FLOAT),
+)
+
+# дочерние таблицы: название => (ключ списка в заявке, колонки); первая колонка - claim_id
+TABLES = {
+    'claims': (None, CLAIM_COLUMNS),
+    'points': ('route_points', (('claim_id', ('id',), STR),) + POINT_COLUMNS),
+    'items': ('items', (('claim_id', ('id',), STR),) + ITEM_COLUMNS),
+}
+
+
+def _lookup(item, path):
+    for key in path:
+        if item is None:
+            return None
+        if isinstance(key, int):
+            item = item[key] if len(item) > key else None
+        else:
+            item = item.get(key)
+    return item
+
+
+def _convert(value, kind):
+    if value is None:
+        return None
+    if kind == FLOAT:
+        return float(value)
+    if kind == TS:
+        ts = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+        # время без часового пояса считается UTC, как в сортировке ``YCAPI.claim_search_sharded``
+        if ts.tzinfo is None:
+            return ts.replace(tzinfo=datetime.timezone.utc)
+        return ts.astimezone(datetime.timezone.utc)
+    return value
+
+
+class ColumnarBatch:
+    """
+
+    Накопление заявок в колонки. Значения берутся прямо из тел ответов сервера (json),
+    объекты вложенных полей не создаются.
+
+        >>> batch = ColumnarBatch(ya.iter_claim_search(created_from='2021-01-01T00:00:00+00:00'))
+        >>> frames = batch.to_pandas()
+        >>> frames['points'].merge(frames['claims'], on='claim_id')
+
+    Таблицы: ``claims`` (по строке на заявку), ``points`` (точки маршрута) и ``items`` (грузы),
+    дочерние таблицы связаны с заявкой колонкой ``claim_id``. Цены переводятся в float,
+    время - в UTC (время без часового пояса считается UTC).
+
+    :param claims: Заявки (SearchedClaimMP или json)
+    """
+
+    def __init__(self, claims=()):
+        self.columns = {table: {name: [] for name, _, _ in columns} for table, (_, columns) in TABLES.items()}
+        self.extend(claims)
+
+    def __len__(self):
+        return len(self.columns['claims']['claim_id'])
+
+    def extend(self, claims):
+        """
+        Добавление заявок
+
+        :param claims: Заявки (SearchedClaimMP или json)
+        """
+        claim_columns = self.columns['claims']
+        for claim in claims:
+            item = claim.body if isinstance(claim, YCBase) else claim
+            for name, path, kind in CLAIM_COLUMNS:
+                claim_columns[name].append(_convert(_lookup(item, path), kind))
+            claim_id = item.get('id')
+            for table, (key, columns) in TABLES.items():
+                if key is None:
+                    continue
+                table_columns = self.columns[table]
+                for child in item.get(key) or ():
+                    table_columns['claim_id'].append(claim_id)
+                    for name, path, kind in columns[1:]:
+                        table_columns[name].append(_convert(_lookup(child, path), kind))
+
+    def clear(self):
+        """
+        Очистка накопленных строк
+        """
+        for table in self.columns.values():
+            for values in table.values():
+                values.clear()
+
+    def to_numpy(self):
+        """
+
+        Колонки в виде массивов NumPy. Строки - ``object``, время - ``datetime64[us]`` (UTC, NaT для пустых),
+        целые с пропусками и дробные - ``float64`` с NaN, логические с пропусками - ``object``
+
+        :return: Таблица => колонка => массив
+        :rtype: dict
+        """
+        import numpy as np
+
+        result = {}
+        for table, (_, columns) in TABLES.items():
+            arrays = result[table] = {}
+            for name, _, kind in columns:
+                values = self.columns[table][name]
+                has_missing = None in values
+                if kind == TS:
+                    array = np.array([None if value is None else value.replace(tzinfo=None) for value in values],
+                                     dtype='datetime64[us]')
+                elif kind == FLOAT or (kind == INT and has_missing):
+                    array = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+                elif kind == INT:
+                    array = np.array(values, dtype=np.int64)
+                elif kind == BOOL and not has_missing:
+                    array = np.array(values, dtype=bool)
+                else:
+                    array = np.empty(len(values), dtype=object)
+                    array[:] = values
+                arrays[name] = array
+        return result
+
+    def to_arrow(self):
+        """
+        Таблицы pyarrow с постоянной схемой (:func:`arrow_schema`)
+
+        :return: Таблица => pyarrow.Table
+        :rtype: dict
+        """
+        import pyarrow as pa
+
+        return {table: pa.Table.from_pydict(self.columns[table], schema=arrow_schema(table)) for table in TABLES}
+
+    def to_pandas(self):
+        """
+
+        Таблицы pandas.DataFrame. Если установлен pyarrow, собираются через него,
+        иначе из массивов :meth:`to_numpy`
+
+        :return: Таблица => pandas.DataFrame
+        :rtype: dict
+        """
+        import pandas as pd
+
+        try:
+            tables = self.to_arrow()
+        except ImportError:
+            return {table: pd.DataFrame(arrays) for table, arrays in self.to_numpy().items()}
+        return {table: value.to_pandas() for table, value in tables.items()}
+
+
+def arrow_schema(table):
+    """
+    Схема pyarrow таблицы
+
+    :param str table: Название таблицы (claims, points, items)
+
+    :rtype: pyarrow.Schema
+    """
+    import pyarrow as pa
+
+    types = {STR: pa.string(), FLOAT: pa.float64(), INT: pa.int64(), BOOL: pa.bool_(),
+             TS: pa.timestamp('us', tz='UTC')}
+    return pa.schema([(name, types[kind]) for name, _, kind in TABLES[table][1]])
+
+
+class ParquetWriter:
+    """
+
+    Потоковая запись заявок в Parquet: по файлу на таблицу (``claims.parquet``, ``points.parquet``,
+    ``items.parquet``) в каталоге ``directory``. Заявки копятся в колонки и сбрасываются
+    группами строк по ``batch_size`` заявок, поэтому в памяти не больше одной группы.
+
+        >>> with ParquetWriter('export') as writer:
+        >>>     writer.write(ya.iter_claim_search(created_from='2021-01-01T00:00:00+00:00'))
+
+    :param str directory: Каталог для файлов
+    :param int batch_size: Количество заявок в группе строк
+    :param str compression: Сжатие Parquet
+    """
+
+    def __init__(self, directory, batch_size=10000, compression='zstd'):
+        import pyarrow.parquet as pq
+
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.batch_size = batch_size
+        self.rows = 0
+        self._batch = ColumnarBatch()
+        self._writers = {table: pq.ParquetWriter(os.path.join(directory, table + '.parquet'), arrow_schema(table),
+                                                 compression=compression)
+                         for table in TABLES}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write(self, claims):
+        """
+        Запись заявок
+
+        :param claims: Заявки (SearchedClaimMP или json)
+
+        :return: Количество записанных заявок
+        :rtype: int
+        """
+        count = 0
+        for claim in claims:
+            self._batch.extend((claim,))
+            count += 1
+            if len(self._batch) >= self.batch_size:
+                self.flush()
+        return count
+
+    def flush(self):
+        """
+        Сброс накопленных заявок в файлы
+        """
+        if not len(self._batch):
+            return
+        for table, value in self._batch.to_arrow().items():
+            self._writers[table].write_table(value)
+        self.rows += len(self._batch)
+        logger.debug('Parquet: %d claims written to %s', self.rows, self.directory)
+        self._batch.clear()
+
+    def close(self):
+        """
+        Сброс остатка и закрытие файлов
+        """
+        self.flush()
+        for writer in self._writers.values():
+            writer.close()
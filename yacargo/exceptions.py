@@ -74,3 +74,46 @@ class InputParamError(BaseException):
         Ошибка в передаваемых полях
     """
     pass
+
+
+class BulkRequestError(BaseException):
+    """
+        Ошибка части пачек пакетного запроса
+
+        :param list failures: Список пар (идентификаторы пачки, ошибка)
+    """
+
+    def __init__(self, failures):
+        super().__init__('{} chunk(s) failed'.format(len(failures)))
+        self.failures = failures
+
+
+class ServerAPIError(BaseAPIError):
+    """
+        Временная ошибка сервера (HTTP 429 и 5xx). Такие запросы можно повторять
+
+        :param int status: HTTP-код ответа
+        :param dict data: Тело ответа
+        :param Optional[float] retry_after: Значение заголовка Retry-After в секундах
+    """
+
+    def __init__(self, status, data, retry_after=None):
+        self.status = status
+        self.code = data.get('code')
+        self.message = data.get('message')
+        self.retry_after = retry_after
+        logging.error('Server error %d: %s', status, self.message)
+
+
+class ReportError(BaseException):
+    """
+        Отчет не сформирован: ошибка генерации или превышено время ожидания
+
+        :param str task_id: ID задачи генерации отчета
+        :param str status: Последний статус отчета
+    """
+
+    def __init__(self, task_id, status):
+        super().__init__('Report {} is not ready: {}'.format(task_id, status))
+        self.task_id = task_id
+        self.status = status
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+Модуль с геоиндексом точек маршрута заявок (NumPy)
+
+Требует необязательную зависимость ``numpy`` (см. requirements-optional.txt)
+"""
+import collections
+import logging
+import math
+
+import numpy as np
+
+from yacargo.objects import SearchedClaimMP
+from yacargo.tracking import EARTH_RADIUS
+
+logger = logging.getLogger('yaCargo')
+
+GeoMatch = collections.namedtuple('GeoMatch', ['claim_id', 'point_id', 'type', 'lat', 'lon', 'distance'])
+GeoMatch.__doc__ = """
+    Точка маршрута, найденная в индексе
+
+    :param str claim_id: Идентификатор заявки
+    :param int point_id: Идентификатор точки маршрута
+    :param str type: Тип точки (source, destination, return)
+    :param float lat: Широта
+    :param float lon: Долгота
+    :param Optional[float] distance: Расстояние в метрах до центра поиска
+"""
+
+
+def haversine(lat, lon, lats, lons):
+    """
+    Расстояния от точки до массива точек
+
+    :param float lat: Широта
+    :param float lon: Долгота
+    :param numpy.ndarray lats: Широты
+    :param numpy.ndarray lons: Долготы
+
+    :return: Расстояния в метрах
+    :rtype: numpy.ndarray
+    """
+    phi, phis = math.radians(lat), np.radians(lats)
+    a = (np.sin((phis - phi) / 2) ** 2
+         + math.cos(phi) * np.cos(phis) * np.sin(np.radians(lons - lon) / 2) ** 2)
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class GeoIndex:
+    """
+
+    Индекс точек маршрута по координатам. Строится из результатов ``claim_search``, ``search_active``,
+    ``claim_bulk`` (SearchedClaimMP или json) и обновляется по мере изменения заявок.
+
+        >>> index = GeoIndex(ya.iter_search_active())
+        >>> index.claims_within(55.73, 37.64, 2000, point_type='source')
+        >>> index.nearest(55.73, 37.64, k=5)
+        >>> index.update(ya.claim_bulk_many(changed_ids))
+
+    Координаты хранятся в массивах NumPy, точки разложены по сетке ячеек ``cell_size`` градусов:
+    поиск проверяет только ячейки, пересекающие область, расстояния считаются векторно.
+    Переход через 180-й меридиан не поддерживается.
+
+    Обновление заявки помечает ее прежние точки удаленными и дописывает новые,
+    удаленные точки вычищаются, когда их становится больше половины.
+
+    :param claims: Заявки (SearchedClaimMP или json)
+    :param float cell_size: Размер ячейки сетки в градусах
+    """
+
+    def __init__(self, claims=(), cell_size=0.05):
+        self.cell_size = cell_size
+        self._width = int(math.ceil(360 / cell_size)) + 1
+        self._size = 0
+        self._dead = 0
+        self._lat = np.empty(0)
+        self._lon = np.empty(0)
+        self._cell = np.empty(0, dtype=np.int64)
+        self._point = np.empty(0, dtype=np.int64)
+        self._type = np.empty(0, dtype=np.int8)
+        self._claim = np.empty(0, dtype=np.int64)
+        self._alive = np.empty(0, dtype=bool)
+        self._claim_ids = []
+        self._claim_index = {}
+        self._rows = {}
+        self._type_names = []
+        self._type_codes = {}
+        self._order = None
+        self._keys = None
+        self.update(claims)
+
+    def __len__(self):
+        return self._size - self._dead
+
+    def __contains__(self, claim_id):
+        return claim_id in self._rows
+
+    def update(self, claims):
+        """
+
+        Добавление или замена заявок
+
+        :param claims: Заявки (SearchedClaimMP или json)
+
+        :return: Количество добавленных точек
+        :rtype: int
+        """
+        lats, lons, points, types, owners, replaced = [], [], [], [], [], []
+        for claim in claims:
+            item = claim.json() if isinstance(claim, SearchedClaimMP) else claim
+            claim_id = item['id']
+            replaced.append(claim_id)
+            owner = self._claim_index.get(claim_id)
+            if owner is None:
+                owner = self._claim_index[claim_id] = len(self._claim_ids)
+                self._claim_ids.append(claim_id)
+            for point in item.get('route_points') or ():
+                coordinates = (point.get('address') or {}).get('coordinates')
+                if not coordinates or len(coordinates) != 2:
+                    continue
+                lons.append(coordinates[0])
+                lats.append(coordinates[1])
+                points.append(point.get('id', -1))
+                types.append(self._type_code(point.get('type')))
+                owners.append(owner)
+        self.remove(replaced)
+
+        count = len(lats)
+        if not count:
+            return 0
+        self._reserve(count)
+        rows = slice(self._size, self._size + count)
+        self._lat[rows] = lats
+        self._lon[rows] = lons
+        self._cell[rows] = self._cells(self._lat[rows], self._lon[rows])
+        self._point[rows] = points
+        self._type[rows] = types
+        self._claim[rows] = owners
+        self._alive[rows] = True
+        for row, owner in enumerate(owners, self._size):
+            self._rows.setdefault(self._claim_ids[owner], []).append(row)
+        self._size += count
+        self._order = None
+        return count
+
+    def remove(self, claim_ids):
+        """
+        Удаление заявок
+
+        :param claim_ids: Идентификаторы заявок
+        """
+        for claim_id in claim_ids:
+            rows = self._rows.pop(claim_id, None)
+            if rows:
+                self._alive[rows] = False
+                self._dead += len(rows)
+                self._order = None
+        if self._dead and self._dead * 2 > self._size:
+            self._compact()
+
+    def _type_code(self, name):
+        code = self._type_codes.get(name)
+        if code is None:
+            code = self._type_codes[name] = len(self._type_names)
+            self._type_names.append(name)
+        return code
+
+    def _reserve(self, count):
+        capacity = len(self._lat)
+        if self._size + count <= capacity:
+            return
+        capacity = max(capacity * 2, self._size + count, 64)
+        for name in ('_lat', '_lon', '_cell', '_point', '_type', '_claim', '_alive'):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            setattr(self, name, grown)
+
+    def _compact(self):
+        keep = self._alive[:self._size]
+        moved = np.cumsum(keep) - 1
+        for name in ('_lat', '_lon', '_cell', '_point', '_type', '_claim', '_alive'):
+            column = getattr(self, name)
+            setattr(self, name, column[:self._size][keep].copy())
+        self._rows = {claim_id: moved[rows].tolist() for claim_id, rows in self._rows.items()}
+        self._size = len(self._lat)
+        self._dead = 0
+        self._order = None
+        logger.debug('GeoIndex compacted to %d points', self._size)
+
+    def _cells(self, lats, lons):
+        rows = np.floor((np.asarray(lats) + 90) / self.cell_size).astype(np.int64)
+        columns = np.floor((np.asarray(lons) + 180) / self.cell_size).astype(np.int64)
+        return rows * self._width + columns
+
+    def _grid(self):
+        if self._order is None:
+            alive = np.flatnonzero(self._alive[:self._size])
+            self._order = alive[np.argsort(self._cell[alive], kind='stable')]
+            self._keys = self._cell[self._order]
+        return self._order, self._keys
+
+    def _candidates(self, min_lat, min_lon, max_lat, max_lon, point_type):
+        order, keys = self._grid()
+        min_lat, max_lat = max(min_lat, -90.0), min(max_lat, 90.0)
+        min_lon, max_lon = max(min_lon, -180.0), min(max_lon, 180.0)
+        first = int((min_lat + 90) // self.cell_size)
+        last = int((max_lat + 90) // self.cell_size)
+        rows = np.arange(first, last + 1, dtype=np.int64) * self._width
+        lo = np.searchsorted(keys, rows + int((min_lon + 180) // self.cell_size), side='left')
+        hi = np.searchsorted(keys, rows + int((max_lon + 180) // self.cell_size), side='right')
+        candidates = np.concatenate([order[start:end] for start, end in zip(lo, hi)] or [order[:0]])
+        if point_type is not None:
+            names = [point_type] if isinstance(point_type, str) else point_type
+            codes = [self._type_codes[name] for name in names if name in self._type_codes]
+            candidates = candidates[np.isin(self._type[candidates], codes)]
+        return candidates
+
+    def _matches(self, rows, distances=None):
+        return [GeoMatch(self._claim_ids[claim], int(point), self._type_names[code], float(lat), float(lon),
+                         None if distances is None else float(distances[i]))
+                for i, (claim, point, code, lat, lon) in enumerate(zip(
+                    self._claim[rows], self._point[rows], self._type[rows], self._lat[rows], self._lon[rows]))]
+
+    def within(self, lat, lon, radius, point_type=None):
+        """
+
+        Точки в радиусе от центра, по возрастанию расстояния
+
+        :param float lat: Широта центра
+        :param float lon: Долгота центра
+        :param float radius: Радиус в метрах
+        :param point_type: Тип точки или список типов (source, destination, return)
+
+        :rtype: List[GeoMatch]
+        """
+        lat_delta = math.degrees(radius / EARTH_RADIUS)
+        cos = math.cos(math.radians(lat))
+        lon_delta = 360.0 if cos < 1e-9 else min(360.0, math.degrees(radius / (EARTH_RADIUS * cos)))
+        if lat + lat_delta >= 90 or lat - lat_delta <= -90:
+            lon_delta = 360.0
+        rows = self._candidates(lat - lat_delta, lon - lon_delta, lat + lat_delta, lon + lon_delta, point_type)
+        distances = haversine(lat, lon, self._lat[rows], self._lon[rows])
+        inside = distances <= radius
+        rows, distances = rows[inside], distances[inside]
+        nearest = np.argsort(distances, kind='stable')
+        return self._matches(rows[nearest], distances[nearest])
+
+    def bbox(self, min_lat, min_lon, max_lat, max_lon, point_type=None):
+        """
+        Точки внутри прямоугольника (границы включительно)
+
+        :param float min_lat: Минимальная широта
+        :param float min_lon: Минимальная долгота
+        :param float max_lat: Максимальная широта
+        :param float max_lon: Максимальная долгота
+        :param point_type: Тип точки или список типов
+
+        :rtype: List[GeoMatch]
+        """
+        rows = self._candidates(min_lat, min_lon, max_lat, max_lon, point_type)
+        lats, lons = self._lat[rows], self._lon[rows]
+        inside = (lats >= min_lat) & (lats <= max_lat) & (lons >= min_lon) & (lons <= max_lon)
+        return self._matches(rows[inside])
+
+    def nearest(self, lat, lon, k=1, point_type=None):
+        """
+
+        ``k`` ближайших точек. Радиус поиска удваивается, начиная с размера ячейки, пока не найдется ``k`` точек
+
+        :param float lat: Широта
+        :param float lon: Долгота
+        :param int k: Количество точек
+        :param point_type: Тип точки или список типов
+
+        :rtype: List[GeoMatch]
+        """
+        radius = math.radians(self.cell_size) * EARTH_RADIUS
+        while True:
+            matches = self.within(lat, lon, radius, point_type)
+            if len(matches) >= k or radius > math.pi * EARTH_RADIUS:
+                return matches[:k]
+            radius *= 2
+
+    def claims_within(self, lat, lon, radius, point_type=None):
+        """
+        Заявки, у которых есть точка в радиусе, по возрастанию расстояния до ближайшей из них
+
+        :param float lat: Широта центра
+        :param float lon: Долгота центра
+        :param float radius: Радиус в метрах
+        :param point_type: Тип точки или список типов
+
+        :rtype: List[str]
+        """
+        return list(dict.fromkeys(match.claim_id for match in self.within(lat, lon, radius, point_type)))
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Модуль с обработчиками запросов и ответов (трассировка, отладка)
+"""
+import json
+import logging
+import shlex
+from urllib.parse import urlencode
+
+logger = logging.getLogger('yaCargo')
+
+REDACTED_HEADERS = frozenset(('authorization',))
+
+
+class Hook:
+    """
+
+    Базовый обработчик запросов клиента. Наследники переопределяют нужные методы:
+
+        >>> class Timing(Hook):
+        >>>     def response(self, method, url, status, headers, data, elapsed):
+        >>>         print(url, status, elapsed)
+        >>>
+        >>> ya = YCAPI('SuperDuperToken', hooks=[Timing()])
+
+    Если обработчиков нет, клиент не тратит на них ни времени, ни памяти.
+    """
+
+    def request(self, method, url, params, body, headers):
+        """
+        Вызывается перед отправкой запроса
+
+        :param str method: HTTP-метод
+        :param str url: Адрес ресурса
+        :param dict params: Параметры
+        :param dict body: Тело запроса
+        :param dict headers: Заголовки запроса
+        """
+
+    def response(self, method, url, status, headers, data, elapsed):
+        """
+        Вызывается после получения ответа, до проверки его кода
+
+        :param str method: HTTP-метод
+        :param str url: Адрес ресурса
+        :param int status: HTTP-код ответа
+        :param headers: Заголовки ответа
+        :param dict data: Тело ответа (None для скачиваемых файлов)
+        :param float elapsed: Время запроса в секундах
+        """
+
+
+class CurlHook(Hook):
+    """
+
+    Запись в лог команды ``curl``, повторяющей запрос. Значения заголовков из ``redact``
+    (по умолчанию ``Authorization``) заменяются на ``***``.
+    Команда собирается, только если включен уровень логирования ``level``.
+
+        >>> ya = YCAPI('SuperDuperToken', hooks=[CurlHook()])
+
+    :param int level: Уровень логирования
+    :param redact: Заголовки, значения которых скрываются
+    """
+
+    def __init__(self, level=logging.DEBUG, redact=REDACTED_HEADERS):
+        self.level = level
+        self.redact = frozenset(name.lower() for name in redact)
+
+    def request(self, method, url, params, body, headers):
+        if not logger.isEnabledFor(self.level):
+            return
+        logger.log(self.level, 'CURL: %s', self.render(method, url, params, body, headers))
+
+    def render(self, method, url, params, body, headers):
+        """
+        Команда ``curl`` для запроса
+
+        :param str method: HTTP-метод
+        :param str url: Адрес ресурса
+        :param dict params: Параметры
+        :param dict body: Тело запроса
+        :param dict headers: Заголовки запроса
+
+        :rtype: str
+        """
+        if params:
+            url = '{}?{}'.format(url, urlencode(params))
+        parts = ['curl', '-X', method.upper()]
+        for name, value in sorted(headers.items()):
+            if name.lower() in self.redact:
+                value = '***'
+            parts += ['-H', '{}: {}'.format(name, value)]
+        if body:
+            parts += ['-H', 'Content-Type: application/json', '-d', json.dumps(body, ensure_ascii=False)]
+        parts.append(url)
+        return ' '.join(shlex.quote(part) for part in parts)
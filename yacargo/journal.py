@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+Модуль с чтением журнала изменений заявок (claim_journal) с сохранением позиции
+"""
+import collections
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+
+from yacargo.retry import RETRYABLE_ERRORS
+
+logger = logging.getLogger('yaCargo')
+
+Checkpoint = collections.namedtuple('Checkpoint', ['cursor', 'seen'])
+Checkpoint.__doc__ = """
+    Сохраненная позиция в журнале
+
+    :param Optional[str] cursor: Курсор claim_journal
+    :param list seen: Идентификаторы последних обработанных операций (operation_id)
+"""
+
+
+class MemoryCheckpointStore:
+    """
+    Хранение позиции в памяти процесса (для тестов и одноразовой выгрузки)
+    """
+
+    def __init__(self):
+        self.checkpoint = Checkpoint(None, [])
+
+    def load(self):
+        """
+        :rtype: Checkpoint
+        """
+        return self.checkpoint
+
+    def save(self, checkpoint):
+        """
+        :param Checkpoint checkpoint: Позиция
+        """
+        self.checkpoint = checkpoint
+
+
+class FileCheckpointStore:
+    """
+
+    Хранение позиции в JSON-файле. Файл заменяется атомарно (запись во временный файл и ``os.replace``),
+    поэтому после сбоя в нем всегда целая позиция.
+
+    :param str path: Путь к файлу
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        """
+        :rtype: Checkpoint
+        """
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return Checkpoint(None, [])
+        return Checkpoint(data.get('cursor'), data.get('seen', []))
+
+    def save(self, checkpoint):
+        """
+        :param Checkpoint checkpoint: Позиция
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.journal-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump({'cursor': checkpoint.cursor, 'seen': checkpoint.seen}, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+
+class SQLiteCheckpointStore:
+    """
+
+    Хранение позиции в базе SQLite. Удобно, если обработчик событий пишет в ту же базу:
+    можно передать свое соединение и сохранять позицию в одной транзакции с данными.
+
+    :param str path: Путь к базе
+    :param str name: Название читателя журнала (в одной базе можно хранить несколько позиций)
+    :param sqlite3.Connection connection: Готовое соединение вместо ``path``
+    :param lock: Блокировка, под которой соединение используется из других потоков
+    """
+
+    def __init__(self, path=None, name='default', connection=None, lock=None):
+        self.name = name
+        self.connection = connection if connection is not None else sqlite3.connect(path, check_same_thread=False)
+        self._lock = lock if lock is not None else threading.Lock()
+        with self._lock, self.connection:
+            self.connection.execute('CREATE TABLE IF NOT EXISTS journal_checkpoints '
+                                    '(name TEXT PRIMARY KEY, cursor TEXT, seen TEXT NOT NULL)')
+
+    def load(self):
+        """
+        :rtype: Checkpoint
+        """
+        with self._lock:
+            row = self.connection.execute('SELECT cursor, seen FROM journal_checkpoints WHERE name = ?',
+                                          (self.name,)).fetchone()
+        if row is None:
+            return Checkpoint(None, [])
+        return Checkpoint(row[0], json.loads(row[1]))
+
+    def save(self, checkpoint):
+        """
+        :param Checkpoint checkpoint: Позиция
+        """
+        with self._lock, self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO journal_checkpoints (name, cursor, seen) VALUES (?, ?, ?)',
+                                    (self.name, checkpoint.cursor, json.dumps(checkpoint.seen)))
+
+
+class JournalConsumer:
+    """
+
+    Непрерывное чтение журнала ``claim_journal`` с сохранением курсора.
+
+        >>> consumer = JournalConsumer(ya, FileCheckpointStore('journal.json'))
+        >>> for event in consumer:
+        >>>     handle(event)
+
+    Курсор страницы сохраняется, когда обработаны все ее события (генератор запрошен за следующим событием).
+    После сбоя чтение продолжается с последнего сохраненного курсора, поэтому событие может прийти повторно
+    (at-least-once). Повторы операций с уже обработанным ``operation_id`` отбрасываются: последние
+    ``dedup_size`` идентификаторов сохраняются вместе с курсором.
+
+    Пауза между запросами подстраивается под поток событий: полная страница (не меньше ``page_size`` событий) -
+    следующий запрос сразу, неполная - через ``min_interval``, пустая - пауза удваивается до ``max_interval``.
+    Сетевые ошибки и ошибки сервера не прерывают чтение, а увеличивают паузу.
+
+    :param YCAPI api: Клиент API
+    :param store: Хранилище позиции: :class:`FileCheckpointStore`, :class:`SQLiteCheckpointStore` или свое
+        с методами ``load()`` и ``save(checkpoint)``
+    :param float min_interval: Пауза после неполной страницы в секундах
+    :param float max_interval: Максимальная пауза в секундах
+    :param int page_size: Размер страницы, начиная с которого она считается полной
+    :param int dedup_size: Количество запоминаемых operation_id
+    """
+
+    def __init__(self, api, store, min_interval=1.0, max_interval=30.0, page_size=100, dedup_size=10000):
+        self.api = api
+        self.store = store
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.page_size = page_size
+        self.dedup_size = dedup_size
+        self._stopped = threading.Event()
+
+    def stop(self):
+        """
+        Остановка чтения: генератор завершится после текущей страницы или паузы
+        """
+        self._stopped.set()
+
+    def wait(self, timeout):
+        """
+        Пауза, прерываемая :meth:`stop`
+
+        :param float timeout: Время в секундах
+
+        :return: Чтение остановлено
+        :rtype: bool
+        """
+        return self._stopped.wait(timeout)
+
+    def __iter__(self):
+        return self.events()
+
+    def events(self):
+        """
+        События журнала
+
+        :rtype: Iterator[Event]
+        """
+        for page in self.pages():
+            yield from page
+
+    def pages(self):
+        """
+        Новые события журнала постранично. Курсор страницы сохраняется, когда генератор запрошен за следующей
+
+        :rtype: Iterator[List[Event]]
+        """
+        checkpoint = self.store.load()
+        cursor = checkpoint.cursor
+        seen = collections.OrderedDict.fromkeys(checkpoint.seen)
+        interval = self.min_interval
+        while not self._stopped.is_set():
+            try:
+                page = self.api.claim_journal(cursor=cursor)
+            except RETRYABLE_ERRORS as exception:
+                interval = min(self.max_interval, max(interval, self.min_interval) * 2)
+                logger.warning('claim_journal failed (%r), next poll in %.1fs', exception, interval)
+                self._stopped.wait(interval)
+                continue
+
+            events = page.events or []
+            new = list({event.operation_id: event for event in events if event.operation_id not in seen}.values())
+            if new:
+                yield new
+                for event in new:
+                    seen[event.operation_id] = None
+                while len(seen) > self.dedup_size:
+                    seen.popitem(last=False)
+
+            if page.cursor != cursor or events:
+                cursor = page.cursor
+                self.store.save(Checkpoint(cursor, list(seen)))
+
+            if len(events) >= self.page_size:
+                interval = 0
+            elif events:
+                interval = self.min_interval
+            else:
+                interval = min(self.max_interval, max(interval, self.min_interval) * 2)
+            if interval:
+                self._stopped.wait(interval)
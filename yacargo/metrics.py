@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+"""
+Модуль с метриками запросов клиента в формате Prometheus
+"""
+import bisect
+import collections
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+logger = logging.getLogger('yaCargo')
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PHASES = ('connect', 'server', 'transfer', 'parse')
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_local = threading.local()
+
+
+def take_connect_time():
+    """
+    Время установки соединений в текущем потоке с прошлого вызова
+
+    :return: Секунды или None, если новых соединений не было
+    :rtype: Optional[float]
+    """
+    elapsed = getattr(_local, 'connect', None)
+    _local.connect = None
+    return elapsed
+
+
+class _TimedConnectionMixin:
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _local.connect = (getattr(_local, 'connect', None) or 0.0) + time.perf_counter() - started
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+def instrument(adapter):
+    """
+    Замер времени установки соединений адаптера ``requests`` (TCP и TLS)
+
+    :param requests.adapters.HTTPAdapter adapter: Адаптер
+    """
+    adapter.poolmanager.pool_classes_by_scheme = {'http': _TimedHTTPConnectionPool,
+                                                  'https': _TimedHTTPSConnectionPool}
+
+
+class RequestTimer:
+    """
+
+    Замер одного запроса. Создается :meth:`Metrics.start` перед отправкой запроса;
+    клиент отмечает получение заголовков (:meth:`headers`) и тела (:meth:`received`),
+    а затем записывает результат (:meth:`finish`) или сетевую ошибку (:meth:`failed`).
+
+    Время установки соединения (``connect``) заполняет клиент: синхронный - из :func:`take_connect_time`,
+    асинхронный - через :meth:`Metrics.trace_config`.
+    """
+
+    __slots__ = ('metrics', 'resource', 'method', 'sent', 'started', 'headers_at', 'received_at', 'connect')
+
+    def __init__(self, metrics, resource, method, sent):
+        self.metrics = metrics
+        self.resource = resource
+        self.method = method
+        self.sent = sent
+        self.headers_at = None
+        self.received_at = None
+        self.connect = None
+        self.started = time.perf_counter()
+
+    def headers(self, elapsed=None):
+        """
+        Получены заголовки ответа
+
+        :param float elapsed: Время от начала запроса, если оно уже измерено (``requests.Response.elapsed``)
+        """
+        self.headers_at = time.perf_counter() if elapsed is None else self.started + elapsed
+
+    def received(self):
+        """
+        Получено тело ответа
+        """
+        self.received_at = time.perf_counter()
+
+    def finish(self, status, data, received):
+        """
+        Запись ответа
+
+        :param int status: HTTP-код ответа
+        :param data: Тело ответа (для ошибок - dict с полем ``code``)
+        :param int received: Размер тела ответа в байтах
+        """
+        finished = time.perf_counter()
+        received_at = self.received_at or finished
+        headers_at = min(self.headers_at or received_at, received_at)
+        connect = self.connect
+        code = data.get('code') if status != 200 and isinstance(data, dict) else None
+        self.metrics.observe(self.resource, self.method, status, code, self.sent, received, connect,
+                             max(headers_at - self.started - (connect or 0.0), 0.0), received_at - headers_at,
+                             finished - received_at)
+
+    def failed(self):
+        """
+        Запись сетевой ошибки
+        """
+        self.metrics.network_error(self.resource, self.sent)
+
+
+class _Histogram:
+    __slots__ = ('counts', 'sum')
+
+    def __init__(self, size):
+        self.counts = [0] * size
+        self.sum = 0.0
+
+
+def _labels(**labels):
+    return '{' + ','.join('{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"')
+                                            .replace('\n', '\\n'))
+                          for key, value in labels.items()) + '}'
+
+
+class Metrics:
+    """
+
+    Счетчики и гистограммы запросов клиента:
+
+    * ``yacargo_requests_total{resource, method, status}`` - ответы по HTTP-кодам
+    * ``yacargo_api_errors_total{resource, code}`` - ошибки API по полю ``code`` (:class:`BaseAPIError.code`)
+    * ``yacargo_network_errors_total{resource}`` - сетевые ошибки
+    * ``yacargo_sent_bytes_total{resource}``, ``yacargo_received_bytes_total{resource}`` - тела запросов и ответов
+    * ``yacargo_request_duration_seconds{resource, phase}`` - время по фазам: ``connect`` (установка соединения,
+      только для новых соединений), ``server`` (от отправки до заголовков ответа), ``transfer`` (тело ответа),
+      ``parse`` (разбор JSON)
+
+    .. code-block:: python
+
+        >>> metrics = Metrics()
+        >>> ya = YCAPI('SuperDuperToken', metrics=metrics)
+        >>> metrics.serve(9100)     # http://127.0.0.1:9100/metrics
+        >>> print(metrics.render())
+
+    Учитываются обычные запросы и скачивание файлов (``claim_document``, ``report_download``)
+    в :class:`yacargo.YCAPI` и :class:`yacargo.aio.AsyncYCAPI`.
+
+    Запись одного запроса - несколько операций со словарями под одной блокировкой,
+    количество серий ограничено набором ресурсов API (см. ``benchmarks/bench_metrics.py``).
+
+    :param tuple buckets: Границы корзин гистограммы в секундах
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._requests = collections.Counter()
+        self._errors = collections.Counter()
+        self._network = collections.Counter()
+        self._sent = collections.Counter()
+        self._received = collections.Counter()
+        self._durations = {}
+
+    def start(self, resource, method, sent):
+        """
+        Начало замера запроса
+
+        :param str resource: Запрашиваемый ресурс
+        :param str method: HTTP-метод
+        :param int sent: Размер тела запроса в байтах
+
+        :rtype: RequestTimer
+        """
+        return RequestTimer(self, resource, method, sent)
+
+    @staticmethod
+    def trace_config():
+        """
+        Замер времени установки соединений ``aiohttp``: время добавляется в :class:`RequestTimer`,
+        переданный в запрос как ``trace_request_ctx``
+
+        :rtype: aiohttp.TraceConfig
+        """
+        import aiohttp
+
+        async def connection_start(session, context, params):
+            context.connect_started = time.perf_counter()
+
+        async def connection_end(session, context, params):
+            timer = context.trace_request_ctx
+            if isinstance(timer, RequestTimer):
+                timer.connect = (timer.connect or 0.0) + time.perf_counter() - context.connect_started
+
+        config = aiohttp.TraceConfig()
+        config.on_connection_create_start.append(connection_start)
+        config.on_connection_create_end.append(connection_end)
+        return config
+
+    def _observe(self, resource, phase, value):
+        histogram = self._durations.get((resource, phase))
+        if histogram is None:
+            histogram = self._durations[(resource, phase)] = _Histogram(len(self.buckets) + 1)
+        histogram.counts[bisect.bisect_left(self.buckets, value)] += 1
+        histogram.sum += value
+
+    def observe(self, resource, method, status, code, sent, received, connect, server, transfer, parse):
+        """
+
+        Запись ответа сервера
+
+        :param str resource: Запрашиваемый ресурс
+        :param str method: HTTP-метод
+        :param int status: HTTP-код ответа
+        :param Optional[str] code: Код ошибки API из тела ответа
+        :param int sent: Размер тела запроса в байтах
+        :param int received: Размер тела ответа в байтах
+        :param Optional[float] connect: Время установки соединения или None, если соединение взято из пула
+        :param float server: Время от отправки запроса до получения заголовков ответа
+        :param float transfer: Время получения тела ответа
+        :param float parse: Время разбора тела ответа
+        """
+        with self._lock:
+            self._requests[(resource, method.upper(), status)] += 1
+            if code is not None:
+                self._errors[(resource, code)] += 1
+            self._sent[resource] += sent
+            self._received[resource] += received
+            if connect is not None:
+                self._observe(resource, 'connect', connect)
+            self._observe(resource, 'server', server)
+            self._observe(resource, 'transfer', transfer)
+            self._observe(resource, 'parse', parse)
+
+    def network_error(self, resource, sent=0):
+        """
+        Запись сетевой ошибки
+
+        :param str resource: Запрашиваемый ресурс
+        :param int sent: Размер тела запроса в байтах
+        """
+        with self._lock:
+            self._network[resource] += 1
+            self._sent[resource] += sent
+
+    def render(self):
+        """
+        Метрики в текстовом формате Prometheus
+
+        :rtype: str
+        """
+        with self._lock:
+            requests = sorted(self._requests.items())
+            errors = sorted(self._errors.items())
+            network = sorted(self._network.items())
+            sent = sorted(self._sent.items())
+            received = sorted(self._received.items())
+            durations = sorted((key, list(value.counts), value.sum) for key, value in self._durations.items())
+
+        lines = ['# HELP yacargo_requests_total Responses by HTTP status.',
+                 '# TYPE yacargo_requests_total counter']
+        lines.extend('yacargo_requests_total{} {}'.format(_labels(resource=resource, method=method, status=status),
+                                                          value)
+                     for (resource, method, status), value in requests)
+        lines += ['# HELP yacargo_api_errors_total API errors by error code.',
+                  '# TYPE yacargo_api_errors_total counter']
+        lines.extend('yacargo_api_errors_total{} {}'.format(_labels(resource=resource, code=code), value)
+                     for (resource, code), value in errors)
+        lines += ['# HELP yacargo_network_errors_total Requests failed without a response.',
+                  '# TYPE yacargo_network_errors_total counter']
+        lines.extend('yacargo_network_errors_total{} {}'.format(_labels(resource=resource), value)
+                     for resource, value in network)
+        for name, values, title in (('yacargo_sent_bytes_total', sent, 'Request body bytes.'),
+                                    ('yacargo_received_bytes_total', received, 'Response body bytes.')):
+            lines += ['# HELP {} {}'.format(name, title), '# TYPE {} counter'.format(name)]
+            lines.extend('{}{} {}'.format(name, _labels(resource=resource), value) for resource, value in values)
+
+        lines += ['# HELP yacargo_request_duration_seconds Request time by phase.',
+                  '# TYPE yacargo_request_duration_seconds histogram']
+        for (resource, phase), counts, total in durations:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append('yacargo_request_duration_seconds_bucket{} {}'.format(
+                    _labels(resource=resource, phase=phase, le=bound), cumulative))
+            lines.append('yacargo_request_duration_seconds_sum{} {!r}'.format(
+                _labels(resource=resource, phase=phase), total))
+            lines.append('yacargo_request_duration_seconds_count{} {}'.format(
+                _labels(resource=resource, phase=phase), cumulative))
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port=9100, host='127.0.0.1'):
+        """
+
+        Локальный HTTP-сервер с метриками в фоновом потоке. Отдает :meth:`render` на любой путь
+
+        :param int port: Порт (0 - любой свободный)
+        :param str host: Адрес
+
+        :return: Сервер, остановка - ``server.shutdown()``
+        :rtype: http.server.ThreadingHTTPServer
+        """
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                payload = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                logger.debug('Metrics: ' + format, *args)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='yacargo-metrics', daemon=True).start()
+        return server
@@ -2,9 +2,11 @@
 """
 Модуль с объектами
 """
+import builtins
 import collections
+import collections.abc
 import logging
-from typing import List, Optional
+from typing import ForwardRef, List, Optional, Union, get_args, get_origin
 
 from typeguard import check_type
 
@@ -17,6 +19,8 @@ def validate_fields(field_name, field, field_type):
     """
     Валидатор полей на соответствие ожидаемому типу
 
+    Проверка выполняется функцией, собранной для типа поля один раз (см. ``_type_validator``).
+
     :param field_name: Название поля, передается для ошибки
 
     :param field: Поле
@@ -25,30 +29,268 @@ def validate_fields(field_name, field, field_type):
 
     :return: Объект в виде json
     """
+    validator = _VALIDATORS.get(field_type)
+    if validator is None:
+        validator = _VALIDATORS.setdefault(field_type, _type_validator(field_type))
+    return validator(field_name, field)
+
+
+_VALIDATORS = {}
+
+
+def _type_error(field_name, field, field_type):
+    """
+    Повторная проверка поля, не прошедшего быструю проверку, через typeguard.
+    Ошибка и ее текст остаются прежними
+
+    :param field_name: Название поля, передается для ошибки
+
+    :param field: Поле
+
+    :param field_type: Тип поля
+    """
     try:
         check_type(field_name, field, field_type)
     except TypeError as exc:
         raise InputParamError(exc)
+
+
+def _resolve_type(field_type):
+    if isinstance(field_type, ForwardRef):
+        name = field_type.__forward_arg__
+        return globals().get(name) or getattr(builtins, name)
+    return field_type
+
+
+def _type_validator(field_type):
+    """
+    Сборка проверки для типа поля: только isinstance без обхода типов typeguard
+
+    Поддерживаются типы, которые используются в полях: str, int, float, bool, объекты YCBase и List[...] из них.
+    Для остальных типов проверка выполняется через typeguard.
+
+    :param field_type: Тип поля
+
+    :return: Функция (field_name, field) => объект в виде json
+    """
+    if getattr(field_type, '__origin__', None) is list:
+        item_type = _resolve_type(field_type.__args__[0])
+        if not isinstance(item_type, type):
+            return _generic_validator(field_type)
+        expected = (float, int) if item_type is float else item_type
+
+        if issubclass(item_type, YCBase):
+            def validator(field_name, field):
+                if not isinstance(field, list):
+                    _type_error(field_name, field, field_type)
+                for item in field:
+                    if not isinstance(item, expected):
+                        _type_error(field_name, field, field_type)
+                return [item.json() for item in field]
+        else:
+            def validator(field_name, field):
+                if not isinstance(field, list):
+                    _type_error(field_name, field, field_type)
+                for item in field:
+                    if not isinstance(item, expected):
+                        _type_error(field_name, field, field_type)
+                return [item for item in field]
+        return validator
+
+    field_type = _resolve_type(field_type)
+    if not isinstance(field_type, type):
+        return _generic_validator(field_type)
+    expected = (float, int) if field_type is float else field_type
+
+    if issubclass(field_type, YCBase):
+        def validator(field_name, field):
+            if not isinstance(field, expected):
+                _type_error(field_name, field, field_type)
+            return field.json()
     else:
-        if isinstance(field, list):
-            return [i if isinstance(i, (bool, str, int, float, tuple, list, dict)) else i.json() for i in field]
-        elif isinstance(field, (bool, str, int, float, tuple, list, dict)):
+        def validator(field_name, field):
+            if not isinstance(field, expected):
+                _type_error(field_name, field, field_type)
             return field
+    return validator
+
+
+def _generic_validator(field_type):
+    def validator(field_name, field):
+        try:
+            check_type(field_name, field, field_type)
+        except TypeError as exc:
+            raise InputParamError(exc)
         else:
-            return field.json()
+            if isinstance(field, list):
+                return [i if isinstance(i, (bool, str, int, float, tuple, list, dict)) else i.json() for i in field]
+            elif isinstance(field, (bool, str, int, float, tuple, list, dict)):
+                return field
+            else:
+                return field.json()
+    return validator
+
+
+def _nested_dict():
+    """
+    Фабрика тела с тремя уровнями вложенности. Функция модуля, а не lambda - чтобы объекты сериализовались pickle
+
+    :rtype: collections.defaultdict
+    """
+    return collections.defaultdict(dict)
+
+
+def _from_dicts(factory, items):
+    """
+    Сборка списка вложенных объектов из ответа сервера
+
+    :param factory: Фабрика объекта (например, ``CargoItemMP.from_dict``)
+
+    :param items: Список объектов в виде json
+
+    :return: Список объектов или None
+    """
+    if items is None:
+        return None
+    return [factory(item) for item in items]
+
+
+class CompactBody(collections.abc.Mapping):
+    """
+        Компактное неизменяемое представление объекта json
+
+        Ключи хранятся один раз на каждый набор ключей (таблица полей), значения - в кортеже.
+        Вложенные объекты тоже переводятся в CompactBody.
+
+        :param dict data: Объект в виде json
+    """
+
+    __slots__ = ('_fields', '_values')
+
+    _tables = {}
+
+    def __init__(self, data: dict):
+        keys = tuple(data)
+        fields = self._tables.get(keys)
+        if fields is None:
+            fields = self._tables.setdefault(keys, {key: index for index, key in enumerate(keys)})
+        self._fields = fields
+        self._values = tuple([_compact(value) for value in data.values()])
+
+    def __getitem__(self, key):
+        return self._values[self._fields[key]]
+
+    def get(self, key, default=None):
+        index = self._fields.get(key)
+        return default if index is None else self._values[index]
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return "<CompactBody {}>".format(self.to_dict())
+
+    def to_dict(self) -> dict:
+        """
+
+        :return: Объект в виде json
+        :rtype: dict
+        """
+        return {key: _expand(value) for key, value in zip(self._fields, self._values)}
+
+
+def _compact(value):
+    if isinstance(value, dict):
+        return CompactBody(value)
+    if isinstance(value, list):
+        return [_compact(item) for item in value]
+    return value
+
+
+def _expand(value):
+    if isinstance(value, CompactBody):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_expand(item) for item in value]
+    return value
 
 
 class YCBase:
     """
         Базовый класс
+
+        Данные объекта хранятся только в ``body`` (тело в виде json) и ``_cache`` (собранные вложенные объекты),
+        у экземпляров нет ``__dict__``.
     """
 
+    __slots__ = ('body', '_cache')
+
+    @classmethod
+    def from_response(cls, item: dict):
+        """
+
+        Быстрое создание объекта из ответа сервера без проверки типов полей.
+        Ответ сервера считается доверенным, объект просто оборачивает его.
+        Для полной проверки используйте ``from_dict``.
+
+        :param dict item: Объект в виде json
+
+        :return: Объект
+        """
+        obj = cls.__new__(cls)
+        obj.body = item
+        return obj
+
+    def _nested(self, key, cls):
+        """
+        Список вложенных объектов. Собирается один раз при первом обращении и далее берется из кэша
+
+        :param str key: Ключ списка в теле объекта
+
+        :param cls: Класс вложенного объекта
+
+        :return: Список объектов или None, если поля нет
+        """
+        try:
+            cache = self._cache
+        except AttributeError:
+            cache = self._cache = {}
+        if key not in cache:
+            items = self.body.get(key)
+            cache[key] = None if items is None else [cls.from_response(item) for item in items]
+        return cache[key]
+
+    def compact(self):
+        """
+
+        Перевод тела объекта в компактное представление :class:`CompactBody`.
+        Имеет смысл для объектов, которые долго хранятся в памяти в большом количестве.
+        Свойства и ``json()`` работают как прежде.
+
+        :return: Этот же объект
+        """
+        if not isinstance(self.body, CompactBody):
+            self.body = CompactBody(self.body)
+            try:
+                del self._cache
+            except AttributeError:
+                pass
+        return self
+
     def json(self) -> dict:
         """
 
         :return: Объект в виде JSON
         :rtype: dict
         """
+        if isinstance(self.body, CompactBody):
+            return self.body.to_dict()
         return self.body
 
 
@@ -114,6 +356,8 @@ class CargoItemMP(YCBase):
     :param str fiscalization_excise: Цена Decimal(19, 4) *(Обязательный параметр)* (12.50)
     """
 
+    __slots__ = ()
+
     def __init__(self,
                  extra_id: Optional[str] = None,
                  pickup_point: int = None,
@@ -233,6 +477,36 @@ class CargoItemMP(YCBase):
     def __repr__(self):
         return "<CargoItemMP>"
 
+    @classmethod
+    def from_dict(cls, item: dict) -> 'CargoItemMP':
+        """
+
+        Создание объекта из ответа сервера
+
+        :param dict item: Объект в виде json
+
+        :rtype: CargoItemMP
+        """
+        return cls(extra_id=item.get("extra_id", None),
+                   pickup_point=item.get("pickup_point", None),
+                   droppof_point=item.get("droppof_point", None),
+                   title=item.get("title", None),
+                   size_length=item.get("size", {}).get("length", None),
+                   size_width=item.get("size", {}).get("width", None),
+                   size_height=item.get("size", {}).get("height", None),
+                   weight=item.get("weight", None),
+                   cost_value=item.get("cost_value", None),
+                   cost_currency=item.get("cost_currency", None),
+                   quantity=item.get("quantity", None),
+                   fiscalization_vat_code=item.get("fiscalization", {}).get("vat_code", None),
+                   fiscalization_payment_subject=item.get("fiscalization", {}).get("payment_subject", None),
+                   fiscalization_payment_mode=item.get("fiscalization", {}).get("payment_mode", None),
+                   fiscalization_product_code=item.get("fiscalization", {}).get("product_code", None),
+                   fiscalization_country_of_origin_code=item.get("fiscalization", {}).get("country_of_origin_code", None),
+                   fiscalization_customs_declaration_number=item.get("fiscalization", {}).get("customs_declaration_number", None),
+                   fiscalization_excise=item.get("fiscalization", {}).get("excise", None),
+                   )
+
     @property
     def extra_id(self) -> Optional[str]:
         """
@@ -276,7 +550,7 @@ class CargoItemMP(YCBase):
         :return: Размер в метрах
         :rtype: float
         """
-        return self.body.get("size_length")
+        return (self.body.get("size") or {}).get("length")
 
     @property
     def size_width(self) -> float:
@@ -285,7 +559,7 @@ class CargoItemMP(YCBase):
         :return: Размер в метрах
         :rtype: float
         """
-        return self.body.get("size_width")
+        return (self.body.get("size") or {}).get("width")
 
     @property
     def size_height(self) -> float:
@@ -294,7 +568,7 @@ class CargoItemMP(YCBase):
         :return: Размер в метрах
         :rtype: float
         """
-        return self.body.get("size_height")
+        return (self.body.get("size") or {}).get("height")
 
     @property
     def weight(self) -> Optional[float]:
@@ -347,7 +621,7 @@ class CargoItemMP(YCBase):
 
         :rtype: int
         """
-        return self.body.get("fiscalization_vat_code")
+        return (self.body.get("fiscalization") or {}).get("vat_code")
 
     @property
     def fiscalization_payment_subject(self) -> str:
@@ -376,7 +650,7 @@ class CargoItemMP(YCBase):
 
         :rtype: str
         """
-        return self.body.get("fiscalization_payment_subject")
+        return (self.body.get("fiscalization") or {}).get("payment_subject")
 
     @property
     def fiscalization_payment_mode(self) -> str:
@@ -394,7 +668,7 @@ class CargoItemMP(YCBase):
 
         :rtype: str
         """
-        return self.body.get("fiscalization_payment_mode")
+        return (self.body.get("fiscalization") or {}).get("payment_mode")
 
     @property
     def fiscalization_product_code(self) -> Optional[str]:
@@ -403,7 +677,7 @@ class CargoItemMP(YCBase):
         :return: Код товара
         :rtype: Optional[str]
         """
-        return self.body.get("fiscalization_product_code")
+        return (self.body.get("fiscalization") or {}).get("product_code")
 
     @property
     def fiscalization_country_of_origin_code(self) -> Optional[str]:
@@ -412,7 +686,7 @@ class CargoItemMP(YCBase):
         :return: Код страны происхождения товара
         :rtype: Optional[str]
         """
-        return self.body.get("fiscalization_country_of_origin_code")
+        return (self.body.get("fiscalization") or {}).get("country_of_origin_code")
 
     @property
     def fiscalization_customs_declaration_number(self) -> Optional[str]:
@@ -421,7 +695,7 @@ class CargoItemMP(YCBase):
         :return: Номер таможенной декларации
         :rtype: Optional[str]
         """
-        return self.body.get("fiscalization_customs_declaration_number")
+        return (self.body.get("fiscalization") or {}).get("customs_declaration_number")
 
     @property
     def fiscalization_excise(self) -> str:
@@ -430,7 +704,7 @@ class CargoItemMP(YCBase):
         :return: Цена Decimal(19, 4)
         :rtype: str
         """
-        return self.body.get("fiscalization_excise")
+        return (self.body.get("fiscalization") or {}).get("excise")
 
 
 class CargoPointMP(YCBase):
@@ -486,6 +760,8 @@ class CargoPointMP(YCBase):
     :param Optional[List['TimeInterval']] time_intervals: Интервалы, навешанные на точку
     """
 
+    __slots__ = ()
+
     def __init__(self,
                  point_id: int = None,
                  visit_order: int = None,
@@ -521,7 +797,7 @@ class CargoPointMP(YCBase):
                  pickup_code: Optional[str] = None,
                  time_intervals: Optional[List['TimeInterval']] = None,
                  ):
-        self.body = collections.defaultdict(dict)
+        self.body = collections.defaultdict(_nested_dict)
 
         if point_id is not None:
             self.body["point_id"] = validate_fields('point_id', point_id, int)
@@ -658,6 +934,51 @@ class CargoPointMP(YCBase):
     def __repr__(self):
         return "<CargoPointMP>"
 
+    @classmethod
+    def from_dict(cls, item: dict) -> 'CargoPointMP':
+        """
+
+        Создание объекта из ответа сервера
+
+        :param dict item: Объект в виде json
+
+        :rtype: CargoPointMP
+        """
+        return cls(point_id=item.get("point_id", None),
+                   visit_order=item.get("visit_order", None),
+                   contact_name=item.get("contact", {}).get("name", None),
+                   contact_phone=item.get("contact", {}).get("phone", None),
+                   contact_email=item.get("contact", {}).get("email", None),
+                   address_fullname=item.get("address", {}).get("fullname", None),
+                   address_shortname=item.get("address", {}).get("shortname", None),
+                   address_coordinates=item.get("address", {}).get("coordinates", None),
+                   address_country=item.get("address", {}).get("country", None),
+                   address_city=item.get("address", {}).get("city", None),
+                   address_street=item.get("address", {}).get("street", None),
+                   address_building=item.get("address", {}).get("building", None),
+                   address_porch=item.get("address", {}).get("porch", None),
+                   address_floor=item.get("address", {}).get("floor", None),
+                   address_flat=item.get("address", {}).get("flat", None),
+                   address_sfloor=item.get("address", {}).get("sfloor", None),
+                   address_sflat=item.get("address", {}).get("sflat", None),
+                   address_door_code=item.get("address", {}).get("door_code", None),
+                   address_comment=item.get("address", {}).get("comment", None),
+                   address_uri=item.get("address", {}).get("uri", None),
+                   skip_confirmation=item.get("skip_confirmation", None),
+                   type=item.get("type", None),
+                   payment_on_delivery_client_order_id=item.get("payment_on_delivery", {}).get("client_order_id", None),
+                   payment_on_delivery_cost=item.get("payment_on_delivery", {}).get("cost", None),
+                   payment_on_delivery_customer_full_name=item.get("payment_on_delivery", {}).get("customer", {}).get("full_name", None),
+                   payment_on_delivery_customer_inn=item.get("payment_on_delivery", {}).get("customer", {}).get("inn", None),
+                   payment_on_delivery_customer_email=item.get("payment_on_delivery", {}).get("customer", {}).get("email", None),
+                   payment_on_delivery_customer_phone=item.get("payment_on_delivery", {}).get("customer", {}).get("phone", None),
+                   payment_on_delivery_tax_system_code=item.get("payment_on_delivery", {}).get("tax_system_code", None),
+                   payment_on_delivery_currency=item.get("payment_on_delivery", {}).get("currency", None),
+                   external_order_id=item.get("external_order_id", None),
+                   pickup_code=item.get("pickup_code", None),
+                   time_intervals=_from_dicts(TimeInterval.from_dict, item.get("time_intervals", None)),
+                   )
+
     @property
     def point_id(self) -> int:
         """
@@ -683,7 +1004,7 @@ class CargoPointMP(YCBase):
         :return: Имя контактного лица
         :rtype: str
         """
-        return self.body.get("contact_name")
+        return (self.body.get("contact") or {}).get("name")
 
     @property
     def contact_phone(self) -> str:
@@ -692,7 +1013,7 @@ class CargoPointMP(YCBase):
         :return: Телефон контактного лица
         :rtype: str
         """
-        return self.body.get("contact_phone")
+        return (self.body.get("contact") or {}).get("phone")
 
     @property
     def contact_email(self) -> Optional[str]:
@@ -701,7 +1022,7 @@ class CargoPointMP(YCBase):
         :return: Email — обязательный параметр для точек source и return
         :rtype: Optional[str]
         """
-        return self.body.get("contact_email")
+        return (self.body.get("contact") or {}).get("email")
 
     @property
     def address_fullname(self) -> str:
@@ -710,7 +1031,7 @@ class CargoPointMP(YCBase):
         :return: Полное название с указанием города (Москва, Садовническая набережная, 82с2, БЦ Аврора)
         :rtype: str
         """
-        return self.body.get("address_fullname")
+        return (self.body.get("address") or {}).get("fullname")
 
     @property
     def address_shortname(self) -> Optional[str]:
@@ -719,7 +1040,7 @@ class CargoPointMP(YCBase):
         :return: Адрес в пределах города, как показывается на Таксометре (Садовническая набережная, 82с2, БЦ Аврора)
         :rtype: Optional[str]
         """
-        return self.body.get("address_shortname")
+        return (self.body.get("address") or {}).get("shortname")
 
     @property
     def address_coordinates(self) -> List['float']:
@@ -728,7 +1049,8 @@ class CargoPointMP(YCBase):
         :return: Массив из двух вещественных чисел [долгота, широта]. Порядок важен!
         :rtype: List['float']
         """
-        return [item for item in self.body.get("address_coordinates")]
+        coordinates = (self.body.get("address") or {}).get("coordinates")
+        return None if coordinates is None else [item for item in coordinates]
 
     @property
     def address_country(self) -> Optional[str]:
@@ -737,7 +1059,7 @@ class CargoPointMP(YCBase):
         :return: Страна
         :rtype: Optional[str]
         """
-        return self.body.get("address_country")
+        return (self.body.get("address") or {}).get("country")
 
     @property
     def address_city(self) -> Optional[str]:
@@ -746,7 +1068,7 @@ class CargoPointMP(YCBase):
         :return: Город
         :rtype: Optional[str]
         """
-        return self.body.get("address_city")
+        return (self.body.get("address") or {}).get("city")
 
     @property
     def address_street(self) -> Optional[str]:
@@ -755,7 +1077,7 @@ class CargoPointMP(YCBase):
         :return: Улица
         :rtype: Optional[str]
         """
-        return self.body.get("address_street")
+        return (self.body.get("address") or {}).get("street")
 
     @property
     def address_building(self) -> Optional[str]:
@@ -764,7 +1086,7 @@ class CargoPointMP(YCBase):
         :return: Строение
         :rtype: Optional[str]
         """
-        return self.body.get("address_building")
+        return (self.body.get("address") or {}).get("building")
 
     @property
     def address_porch(self) -> Optional[str]:
@@ -773,7 +1095,7 @@ class CargoPointMP(YCBase):
         :return: Подъезд (может быть A)
         :rtype: Optional[str]
         """
-        return self.body.get("address_porch")
+        return (self.body.get("address") or {}).get("porch")
 
     @property
     def address_floor(self) -> Optional[int]:
@@ -782,7 +1104,7 @@ class CargoPointMP(YCBase):
         :return: Этаж (DEPRECATED)
         :rtype: Optional[int]
         """
-        return self.body.get("address_floor")
+        return (self.body.get("address") or {}).get("floor")
 
     @property
     def address_flat(self) -> Optional[int]:
@@ -791,7 +1113,7 @@ class CargoPointMP(YCBase):
         :return: Квартира (DEPRECATED)
         :rtype: Optional[int]
         """
-        return self.body.get("address_flat")
+        return (self.body.get("address") or {}).get("flat")
 
     @property
     def address_sfloor(self) -> Optional[str]:
@@ -800,7 +1122,7 @@ class CargoPointMP(YCBase):
         :return: Этаж
         :rtype: Optional[str]
         """
-        return self.body.get("address_sfloor")
+        return (self.body.get("address") or {}).get("sfloor")
 
     @property
     def address_sflat(self) -> Optional[str]:
@@ -809,7 +1131,7 @@ class CargoPointMP(YCBase):
         :return: Квартира
         :rtype: Optional[str]
         """
-        return self.body.get("address_sflat")
+        return (self.body.get("address") or {}).get("sflat")
 
     @property
     def address_door_code(self) -> Optional[str]:
@@ -818,7 +1140,7 @@ class CargoPointMP(YCBase):
         :return: Код домофона
         :rtype: Optional[str]
         """
-        return self.body.get("address_door_code")
+        return (self.body.get("address") or {}).get("door_code")
 
     @property
     def address_comment(self) -> Optional[str]:
@@ -827,7 +1149,7 @@ class CargoPointMP(YCBase):
         :return: Комментарий для курьера Для точки А (откуда забрать отправление) используйте шаблон: "Доставка из магазина <>. Сообщите менеджеру, что заказ по доставке Яндекс.Такси. Назовите номер заказа <> и заберите посылку. Заказ оплачен безналично, при передаче заказа нельзя требовать с получателя деньги за доставку." Для точек Б (куда доставить) в комментарий передавайте пожелания получателя. Например "домофон не работает" / "шлагбаум закрыт, позвонить за 10 минут" / "не звонить, спит ребенок".
         :rtype: Optional[str]
         """
-        return self.body.get("address_comment")
+        return (self.body.get("address") or {}).get("comment")
 
     @property
     def address_uri(self) -> Optional[str]:
@@ -836,7 +1158,7 @@ class CargoPointMP(YCBase):
         :return: Карточный uri геообъекта
         :rtype: Optional[str]
         """
-        return self.body.get("address_uri")
+        return (self.body.get("address") or {}).get("uri")
 
     @property
     def skip_confirmation(self) -> Optional[bool]:
@@ -868,7 +1190,7 @@ class CargoPointMP(YCBase):
         :return: Идентификатор заказа
         :rtype: str
         """
-        return self.body.get("payment_on_delivery_client_order_id")
+        return (self.body.get("payment_on_delivery") or {}).get("client_order_id")
 
     @property
     def payment_on_delivery_cost(self) -> str:
@@ -877,7 +1199,7 @@ class CargoPointMP(YCBase):
         :return: Цена Decimal(19, 4)
         :rtype: str
         """
-        return self.body.get("payment_on_delivery_cost")
+        return (self.body.get("payment_on_delivery") or {}).get("cost")
 
     @property
     def payment_on_delivery_customer_full_name(self) -> Optional[str]:
@@ -886,7 +1208,7 @@ class CargoPointMP(YCBase):
         :return: Для юридического лица — название организации, для ИП и физического лица — ФИО
         :rtype: Optional[str]
         """
-        return self.body.get("payment_on_delivery_customer_full_name")
+        return ((self.body.get("payment_on_delivery") or {}).get("customer") or {}).get("full_name")
 
     @property
     def payment_on_delivery_customer_inn(self) -> Optional[str]:
@@ -895,7 +1217,7 @@ class CargoPointMP(YCBase):
         :return: ИНН пользователя (10 или 12 цифр)
         :rtype: Optional[str]
         """
-        return self.body.get("payment_on_delivery_customer_inn")
+        return ((self.body.get("payment_on_delivery") or {}).get("customer") or {}).get("inn")
 
     @property
     def payment_on_delivery_customer_email(self) -> Optional[str]:
@@ -904,7 +1226,7 @@ class CargoPointMP(YCBase):
         :return: Электронная почта пользователя. Если не указано, будет использована почта получателя из точки
         :rtype: Optional[str]
         """
-        return self.body.get("payment_on_delivery_customer_email")
+        return ((self.body.get("payment_on_delivery") or {}).get("customer") or {}).get("email")
 
     @property
     def payment_on_delivery_customer_phone(self) -> Optional[str]:
@@ -913,7 +1235,7 @@ class CargoPointMP(YCBase):
         :return: Телефон пользователя. Если не указано, будет использован телефон получателя из точки
         :rtype: Optional[str]
         """
-        return self.body.get("payment_on_delivery_customer_phone")
+        return ((self.body.get("payment_on_delivery") or {}).get("customer") or {}).get("phone")
 
     @property
     def payment_on_delivery_tax_system_code(self) -> Optional[int]:
@@ -930,7 +1252,7 @@ class CargoPointMP(YCBase):
 
         :rtype: Optional[int]
         """
-        return self.body.get("payment_on_delivery_tax_system_code")
+        return (self.body.get("payment_on_delivery") or {}).get("tax_system_code")
 
     @property
     def payment_on_delivery_currency(self) -> Optional[str]:
@@ -939,7 +1261,7 @@ class CargoPointMP(YCBase):
         :return: Трехзначный код валюты, в которой ведется расчет
         :rtype: Optional[str]
         """
-        return self.body.get("payment_on_delivery_currency")
+        return (self.body.get("payment_on_delivery") or {}).get("currency")
 
     @property
     def external_order_id(self) -> Optional[str]:
@@ -966,10 +1288,7 @@ class CargoPointMP(YCBase):
         :return: Интервалы, навешанные на точку
         :rtype: Optional[List['TimeInterval']]
         """
-        return [TimeInterval(type=item.get("type", None),
-                             _from=item.get("from", None),
-                             to=item.get("to", None),
-                             ) for item in self.body.get("time_intervals")]
+        return self._nested("time_intervals", TimeInterval)
 
 
 class ClaimRequirement(YCBase):
@@ -982,6 +1301,8 @@ class ClaimRequirement(YCBase):
     :param Optional[str] meta_group: ??? (lavka)
     """
 
+    __slots__ = ()
+
     def __init__(self,
                  type: str = None,
                  logistic_group: str = None,
@@ -1005,6 +1326,21 @@ class ClaimRequirement(YCBase):
     def __repr__(self):
         return "<ClaimRequirement>"
 
+    @classmethod
+    def from_dict(cls, item: dict) -> 'ClaimRequirement':
+        """
+
+        Создание объекта из ответа сервера
+
+        :param dict item: Объект в виде json
+
+        :rtype: ClaimRequirement
+        """
+        return cls(type=item.get("type", None),
+                   logistic_group=item.get("logistic_group", None),
+                   meta_group=item.get("meta_group", None),
+                   )
+
     @property
     def type(self) -> str:
         """
@@ -1051,6 +1387,8 @@ class ClaimWarning(YCBase):
     :param Optional[str] message: Локализованная информация с причиной предупреждения (Предупреждение)
     """
 
+    __slots__ = ()
+
     def __init__(self,
                  source: str = None,
                  code: str = None,
@@ -1080,6 +1418,21 @@ class ClaimWarning(YCBase):
     def __repr__(self):
         return "<ClaimWarning>"
 
+    @classmethod
+    def from_dict(cls, item: dict) -> 'ClaimWarning':
+        """
+
+        Создание объекта из ответа сервера
+
+        :param dict item: Объект в виде json
+
+        :rtype: ClaimWarning
+        """
+        return cls(source=item.get("source", None),
+                   code=item.get("code", None),
+                   message=item.get("message", None),
+                   )
+
     @property
     def source(self) -> str:
         """
@@ -1125,6 +1478,8 @@ class ClaimsJournalResponse(YCBase):
     :param List['Event'] events: Список изменений заказа *(Обязательный параметр)*
     """
 
+    __slots__ = ()
+
     def __init__(self,
                  cursor: str = None,
                  events: List['Event'] = None,
@@ -1144,6 +1499,20 @@ class ClaimsJournalResponse(YCBase):
     def __repr__(self):
         return "<ClaimsJournalResponse>"
 
+    @classmethod
+    def from_dict(cls, item: dict) -> 'ClaimsJournalResponse':
+        """
+
+        Создание объекта из ответа сервера
+
+        :param dict item: Объект в виде json
+
+        :rtype: ClaimsJournalResponse
+        """
+        return cls(cursor=item.get("cursor", None),
+                   events=_from_dicts(Event.from_dict, item.get("events", None)),
+                   )
+
     @property
     def cursor(self) -> str:
         """
@@ -1160,17 +1529,7 @@ class ClaimsJournalResponse(YCBase):
         :return: Список изменений заказа
         :rtype: List['Event']
         """
-        return [Event(operation_id=item.get("operation_id", None),
-                      claim_id=item.get("claim_id", None),
-                      change_type=item.get("change_type", None),
-                      updated_ts=item.get("updated_ts", None),
-                      new_status=item.get("new_status", None),
-                      new_price=item.get("new_price", None),
-                      new_currency=item.get("new_currency", None),
-                      resolution=item.get("resolution", None),
-                      revision=item.get("revision", None),
-                      client_id=item.get("client_id", None),
-                      ) for item in self.body.get("events")]
+        return self._nested("events", Event)
 
 
 class ClaimsReportGenerateResponse(YCBase):
@@ -1181,6 +1540,8 @@ class ClaimsReportGenerateResponse(YCBase):
     :param str task_id: ID, по которому можно запрашивать статус *(Обязательный параметр)* (f9b4825f45f64914affaeb07fbae9757)
     """
 
+    __slots__ = ()
+
     def __init__(self,
                  task_id: str = None,
                  ):
@@ -1194,6 +1555,19 @@ class ClaimsReportGenerateResponse(YCBase):
     def __repr__(self):
         return "<ClaimsReportGenerateResponse>"
 
+    @classmethod
+    def from_dict(cls, item: dict) -> 'ClaimsReportGenerateResponse':
+        """
+
+        Создание объекта из ответа сервера
+
+        :param dict item: Объект в виде json
+
+        :rtype: ClaimsReportGenerateResponse
+        """
+        return cls(task_id=item.get("task_id", None),
+                   )
+
     @property
     def task_id(self) -> str:
         """
@@ -1227,6 +1601,8 @@ class ClaimsReportStatusResponse(YCBase):
     :param Optional[str] url: Временная ссылка для скачивания отчета (https://example.com)
     """
 
+    __slots__ = ()
+
     def __init__(self,
                  task_id: str = None,
                  status: str = None,
@@ -1291,6 +1667,28 @@ class ClaimsReportStatusResponse(YCBase):
     def __repr__(self):
         return "<ClaimsReportStatusResponse>"
 
+    @classmethod
+    def from_dict(cls, item: dict) -> 'ClaimsReportStatusResponse':
+        """
+
+        Создание объекта из ответа сервера
+
+        :param dict item: Объект в виде json
+
+        :rtype: ClaimsReportStatusResponse
+        """
+        return cls(task_id=item.get("task_id", None),
+                   status=item.get("status", None),
+                   author=item.get("author", None),
+                   created_at=item.get("created_at", None),
+                   request_since_date=item.get("request", {}).get("since_date", None),
+                   request_till_date=item.get("request", {}).get("till_date", None),
+                   request_lang=item.get("request", {}).get("lang", None),
+                   request_department_id=item.get("request", {}).get("department_id", None),
+                   request_idempotency_token=item.get("request", {}).get("idempotency_token", None),
+                   url=item.get("url", None),
+                   )
+
     @property
     def task_id(self) -> str:
         """
@@ -1340,7 +1738,7 @@ class ClaimsReportStatusResponse(YCBase):
         :return: Дата начала отчетного периода
         :rtype: str
         """
-        return self.body.get("request_since_date")
+        return (self.body.get("request") or {}).get("since_date")
 
     @property
     def request_till_date(self) -> str:
@@ -1349,7 +1747,7 @@ class ClaimsReportStatusResponse(YCBase):
         :return: Дата конца отчетного периода
         :rtype: str
         """
-        return self.body.get("request_till_date")
+        return (self.body.get("request") or {}).get("till_date")
 
     @property
     def request_lang(self) -> Optional[str]:
@@ -1358,7 +1756,7 @@ class ClaimsReportStatusResponse(YCBase):
         :return: Язык, на котором надо генерировать отчет. Если не указан, будет использован Accept-Language
         :rtype: Optional[str]
         """
-        return self.body.get("request_lang")
+        return (self.body.get("request") or {}).get("lang")
 
     @property
     def request_department_id(self) -> Optional[str]:
@@ -1367,7 +1765,7 @@ class ClaimsReportStatusResponse(YCBase):
         :return: ID отдела (значение игнорируется). Поле нужно для совместимости с API КК
         :rtype: Optional[str]
         """
-        return self.body.get("request_department_id")
+        return (self.body.get("request") or {}).get("department_id")
 
     @property
     def request_idempotency_token(self) -> str:
@@ -1376,7 +1774,7 @@ class ClaimsReportStatusResponse(YCBase):
         :return: Уникальный для данного клиента токен идемпотентности
         :rtype: str
         """
-        return self.body.get("request_idempotency_token")
+        return (self.body.get("request") or {}).get("idempotency_token")
 
     @property
     def url(self) -> Optional[str]:
@@ -1397,6 +1795,8 @@ class ConfirmationCodeResponse(YCBase):
     :param int attempts: Число оставшихся попыток ввода кода *(Обязательный параметр)* (1)
     """
 
+    __slots__ = ()
+
     def __init__(self,
                  code: str = None,
                  attempts: int = None,
@@ -1416,6 +1816,20 @@ class ConfirmationCodeResponse(YCBase):
     def __repr__(self):
         return "<ConfirmationCodeResponse>"
 
+    @classmethod
+    def from_dict(cls, item: dict) -> 'ConfirmationCodeResponse':
+        """
+
+        Создание объекта из ответа сервера
+
+        :param dict item: Объект в виде json
+
+        :rtype: ConfirmationCodeResponse
+        """
+        return cls(code=item.get("code", None),
+                   attempts=item.get("attempts", None),
+                   )
+
     @property
     def code(self) -> str:
         """
@@ -1475,6 +1889,8 @@ class CutClaimResponse(YCBase):
     :param Optional[str] taxi_order_id: taxi_order_id в такси (uuid) (33f95d1a73b84cbcaa06c9ad306dc459)
     """
 
+    __slots__ = ()
+
     def __init__(self,
                  id: str = None,
                  status: str = None,
@@ -1511,6 +1927,22 @@ class CutClaimResponse(YCBase):
     def __repr__(self):
         return "<CutClaimResponse>"
 
+    @classmethod
+    def from_dict(cls, item: dict) -> 'CutClaimResponse':
+        """
+
+        Создание объекта из ответа сервера
+
+        :param dict item: Объект в виде json
+
+        :rtype: CutClaimResponse
+        """
+        return cls(id=item.get("id", None),
+                   status=item.get("status", None),
+                   version=item.get("version", None),
+                   taxi_order_id=item.get("taxi_order_id", None),
+                   )
+
     @property
     def id(self) -> str:
         """
@@ -1627,6 +2059,8 @@ class Event(YCBase):
     :param Optional[str] client_id: Идентификатор клиента (95d010b2471041499b8cb1bfa282692f)
     """
 
+    __slots__ = ()
+
     def __init__(self,
                  operation_id: int = None,
                  claim_id: str = None,
@@ -1696,6 +2130,28 @@ class Event(YCBase):
     def __repr__(self):
         return "<Event>"
 
+    @classmethod
+    def from_dict(cls, item: dict) -> 'Event':
+        """
+
+        Создание объекта из ответа сервера
+
+        :param dict item: Объект в виде json
+
+        :rtype: Event
+        """
+        return cls(operation_id=item.get("operation_id", None),
+                   claim_id=item.get("claim_id", None),
+                   change_type=item.get("change_type", None),
+                   updated_ts=item.get("updated_ts", None),
+                   new_status=item.get("new_status", None),
+                   new_price=item.get("new_price", None),
+                   new_currency=item.get("new_currency", None),
+                   resolution=item.get("resolution", None),
+                   revision=item.get("revision", None),
+                   client_id=item.get("client_id", None),
+                   )
+
     @property
     def operation_id(self) -> int:
         """
@@ -1829,6 +2285,8 @@ class HumanErrorMessage(YCBase):
     :param str message: Человеко-понятный локализованный текст ошибки *(Обязательный параметр)* (Some error)
     """
 
+    __slots__ = ()
+
     def __init__(self,
                  code: str = None,
                  message: str = None,
@@ -1848,6 +2306,20 @@ class HumanErrorMessage(YCBase):
     def __repr__(self):
         return "<HumanErrorMessage>"
 
+    @classmethod
+    def from_dict(cls, item: dict) -> 'HumanErrorMessage':
+        """
+
+        Создание объекта из ответа сервера
+
+        :param dict item: Объект в виде json
+
+        :rtype: HumanErrorMessage
+        """
+        return cls(code=item.get("code", None),
+                   message=item.get("message", None),
+                   )
+
     @property
     def code(self) -> str:
         """
@@ -1880,6 +2352,8 @@ class MatchedCar(YCBase):
     :param Optional[bool] door_to_door: Опция "от двери до двери" для тарифа "доставка"
     """
 
+    __slots__ = ()
+
     def __init__(self,
                  taxi_class: str = None,
                  client_taxi_class: Optional[str] = None,
@@ -1915,6 +2389,24 @@ class MatchedCar(YCBase):
     def __repr__(self):
         return "<MatchedCar>"
 
+    @classmethod
+    def from_dict(cls, item: dict) -> 'MatchedCar':
+        """
+
+        Создание объекта из ответа сервера
+
+        :param dict item: Объект в виде json
+
+        :rtype: MatchedCar
+        """
+        return cls(taxi_class=item.get("taxi_class", None),
+                   client_taxi_class=item.get("client_taxi_class", None),
+                   cargo_type=item.get("cargo_type", None),
+                   cargo_type_int=item.get("cargo_type_int", None),
+                   cargo_loaders=item.get("cargo_loaders", None),
+                   door_to_door=item.get("door_to_door", None),
+                   )
+
     @property
     def taxi_class(self) -> str:
         """
@@ -1983,6 +2475,8 @@ class PerformerPositionResponse(YCBase):
     :param Optional[float] position_direction: Направление. Угол от 0 градусов до 360 градусов от направления на север, по часовой стрелке. 0 - север, 90 - восток, 180 - юг, 270 - запад.
     """
 
+    __slots__ = ()
+
     def __init__(self,
                  position_lat: float = None,
                  position_lon: float = None,
@@ -2028,6 +2522,24 @@ class PerformerPositionResponse(YCBase):
     def __repr__(self):
         return "<PerformerPositionResponse>"
 
+    @classmethod
+    def from_dict(cls, item: dict) -> 'PerformerPositionResponse':
+        """
+
+        Создание объекта из ответа сервера
+
+        :param dict item: Объект в виде json
+
+        :rtype: PerformerPositionResponse
+        """
+        return cls(position_lat=item.get("position", {}).get("lat", None),
+                   position_lon=item.get("position", {}).get("lon", None),
+                   position_timestamp=item.get("position", {}).get("timestamp", None),
+                   position_accuracy=item.get("position", {}).get("accuracy", None),
+                   position_speed=item.get("position", {}).get("speed", None),
+                   position_direction=item.get("position", {}).get("direction", None),
+                   )
+
     @property
     def position_lat(self) -> float:
         """
@@ -2035,7 +2547,7 @@ class PerformerPositionResponse(YCBase):
         :return: Широта
         :rtype: float
         """
-        return self.body.get("position_lat")
+        return (self.body.get("position") or {}).get("lat")
 
     @property
     def position_lon(self) -> float:
@@ -2044,7 +2556,7 @@ class PerformerPositionResponse(YCBase):
         :return: Долгота
         :rtype: float
         """
-        return self.body.get("position_lon")
+        return (self.body.get("position") or {}).get("lon")
 
     @property
     def position_timestamp(self) -> int:
@@ -2053,7 +2565,7 @@ class PerformerPositionResponse(YCBase):
         :return: Время снятия сигнала GPS, unix-time
         :rtype: int
         """
-        return self.body.get("position_timestamp")
+        return (self.body.get("position") or {}).get("timestamp")
 
     @property
     def position_accuracy(self) -> Optional[float]:
@@ -2062,7 +2574,7 @@ class PerformerPositionResponse(YCBase):
         :return: Точность GPS. Пока запрещена к передаче т.к. не решили с единицами измерения.
         :rtype: Optional[float]
         """
-        return self.body.get("position_accuracy")
+        return (self.body.get("position") or {}).get("accuracy")
 
     @property
     def position_speed(self) -> Optional[float]:
@@ -2071,7 +2583,7 @@ class PerformerPositionResponse(YCBase):
         :return: Средняя скорость, в м/с
         :rtype: Optional[float]
         """
-        return self.body.get("position_speed")
+        return (self.body.get("position") or {}).get("speed")
 
     @property
     def position_direction(self) -> Optional[float]:
@@ -2080,7 +2592,7 @@ class PerformerPositionResponse(YCBase):
         :return: Направление. Угол от 0 градусов до 360 градусов от направления на север, по часовой стрелке. 0 - север, 90 - восток, 180 - юг, 270 - запад.
         :rtype: Optional[float]
         """
-        return self.body.get("position_direction")
+        return (self.body.get("position") or {}).get("direction")
 
 
 class ResponseCargoPointMP(YCBase):
@@ -2142,6 +2654,8 @@ class ResponseCargoPointMP(YCBase):
     :param Optional[str] pickup_code: Код выдачи товара (ПВЗ) (2397)
     """
 
+    __slots__ = ()
+
     def __init__(self,
                  id: int = None,
                  contact_name: str = None,
@@ -2177,7 +2691,7 @@ class ResponseCargoPointMP(YCBase):
                  external_order_id: Optional[str] = None,
                  pickup_code: Optional[str] = None,
                  ):
-        self.body = collections.defaultdict(dict)
+        self.body = collections.defaultdict(_nested_dict)
 
         if id is not None:
             self.body["id"] = validate_fields('id', id, int)
@@ -2317,6 +2831,51 @@ class ResponseCargoPointMP(YCBase):
     def __repr__(self):
         return "<ResponseCargoPointMP>"
 
+    @classmethod
+    def from_dict(cls, item: dict) -> 'ResponseCargoPointMP':
+        """
+
+        Создание объекта из ответа сервера
+
+        :param dict item: Объект в виде json
+
+        :rtype: ResponseCargoPointMP
+        """
+        return cls(id=item.get("id", None),
+                   contact_name=item.get("contact", {}).get("name", None),
+                   contact_phone=item.get("contact", {}).get("phone", None),
+                   contact_email=item.get("contact", {}).get("email", None),
+                   address_fullname=item.get("address", {}).get("fullname", None),
+                   address_shortname=item.get("address", {}).get("shortname", None),
+                   address_coordinates=item.get("address", {}).get("coordinates", None),
+                   address_country=item.get("address", {}).get("country", None),
+                   address_city=item.get("address", {}).get("city", None),
+                   address_street=item.get("address", {}).get("street", None),
+                   address_building=item.get("address", {}).get("building", None),
+                   address_porch=item.get("address", {}).get("porch", None),
+                   address_floor=item.get("address", {}).get("floor", None),
+                   address_flat=item.get("address", {}).get("flat", None),
+                   address_sfloor=item.get("address", {}).get("sfloor", None),
+                   address_sflat=item.get("address", {}).get("sflat", None),
+                   address_door_code=item.get("address", {}).get("door_code", None),
+                   address_comment=item.get("address", {}).get("comment", None),
+                   address_uri=item.get("address", {}).get("uri", None),
+                   type=item.get("type", None),
+                   visit_order=item.get("visit_order", None),
+                   visit_status=item.get("visit_status", None),
+                   skip_confirmation=item.get("skip_confirmation", None),
+                   payment_on_delivery_client_order_id=item.get("payment_on_delivery", {}).get("client_order_id", None),
+                   payment_on_delivery_is_paid=item.get("payment_on_delivery", {}).get("is_paid", None),
+                   payment_on_delivery_cost=item.get("payment_on_delivery", {}).get("cost", None),
+                   payment_on_delivery_customer_full_name=item.get("payment_on_delivery", {}).get("customer", {}).get("full_name", None),
+                   payment_on_delivery_customer_inn=item.get("payment_on_delivery", {}).get("customer", {}).get("inn", None),
+                   payment_on_delivery_customer_email=item.get("payment_on_delivery", {}).get("customer", {}).get("email", None),
+                   payment_on_delivery_customer_phone=item.get("payment_on_delivery", {}).get("customer", {}).get("phone", None),
+                   payment_on_delivery_tax_system_code=item.get("payment_on_delivery", {}).get("tax_system_code", None),
+                   external_order_id=item.get("external_order_id", None),
+                   pickup_code=item.get("pickup_code", None),
+                   )
+
     @property
     def id(self) -> int:
         """
@@ -2333,7 +2892,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Имя контактного лица
         :rtype: str
         """
-        return self.body.get("contact_name")
+        return (self.body.get("contact") or {}).get("name")
 
     @property
     def contact_phone(self) -> str:
@@ -2342,7 +2901,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Телефон контактного лица
         :rtype: str
         """
-        return self.body.get("contact_phone")
+        return (self.body.get("contact") or {}).get("phone")
 
     @property
     def contact_email(self) -> Optional[str]:
@@ -2351,7 +2910,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Email — обязательный параметр для точек source и return
         :rtype: Optional[str]
         """
-        return self.body.get("contact_email")
+        return (self.body.get("contact") or {}).get("email")
 
     @property
     def address_fullname(self) -> str:
@@ -2360,7 +2919,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Полное название с указанием города (Москва, Садовническая набережная, 82с2, БЦ Аврора)
         :rtype: str
         """
-        return self.body.get("address_fullname")
+        return (self.body.get("address") or {}).get("fullname")
 
     @property
     def address_shortname(self) -> Optional[str]:
@@ -2369,7 +2928,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Адрес в пределах города, как показывается на Таксометре (Садовническая набережная, 82с2, БЦ Аврора)
         :rtype: Optional[str]
         """
-        return self.body.get("address_shortname")
+        return (self.body.get("address") or {}).get("shortname")
 
     @property
     def address_coordinates(self) -> List['float']:
@@ -2378,7 +2937,8 @@ class ResponseCargoPointMP(YCBase):
         :return: Массив из двух вещественных чисел [долгота, широта]. Порядок важен!
         :rtype: List['float']
         """
-        return [item for item in self.body.get("address_coordinates")]
+        coordinates = (self.body.get("address") or {}).get("coordinates")
+        return None if coordinates is None else [item for item in coordinates]
 
     @property
     def address_country(self) -> Optional[str]:
@@ -2387,7 +2947,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Страна
         :rtype: Optional[str]
         """
-        return self.body.get("address_country")
+        return (self.body.get("address") or {}).get("country")
 
     @property
     def address_city(self) -> Optional[str]:
@@ -2396,7 +2956,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Город
         :rtype: Optional[str]
         """
-        return self.body.get("address_city")
+        return (self.body.get("address") or {}).get("city")
 
     @property
     def address_street(self) -> Optional[str]:
@@ -2405,7 +2965,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Улица
         :rtype: Optional[str]
         """
-        return self.body.get("address_street")
+        return (self.body.get("address") or {}).get("street")
 
     @property
     def address_building(self) -> Optional[str]:
@@ -2414,7 +2974,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Строение
         :rtype: Optional[str]
         """
-        return self.body.get("address_building")
+        return (self.body.get("address") or {}).get("building")
 
     @property
     def address_porch(self) -> Optional[str]:
@@ -2423,7 +2983,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Подъезд (может быть A)
         :rtype: Optional[str]
         """
-        return self.body.get("address_porch")
+        return (self.body.get("address") or {}).get("porch")
 
     @property
     def address_floor(self) -> Optional[int]:
@@ -2432,7 +2992,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Этаж (DEPRECATED)
         :rtype: Optional[int]
         """
-        return self.body.get("address_floor")
+        return (self.body.get("address") or {}).get("floor")
 
     @property
     def address_flat(self) -> Optional[int]:
@@ -2441,7 +3001,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Квартира (DEPRECATED)
         :rtype: Optional[int]
         """
-        return self.body.get("address_flat")
+        return (self.body.get("address") or {}).get("flat")
 
     @property
     def address_sfloor(self) -> Optional[str]:
@@ -2450,7 +3010,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Этаж
         :rtype: Optional[str]
         """
-        return self.body.get("address_sfloor")
+        return (self.body.get("address") or {}).get("sfloor")
 
     @property
     def address_sflat(self) -> Optional[str]:
@@ -2459,7 +3019,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Квартира
         :rtype: Optional[str]
         """
-        return self.body.get("address_sflat")
+        return (self.body.get("address") or {}).get("sflat")
 
     @property
     def address_door_code(self) -> Optional[str]:
@@ -2468,7 +3028,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Код домофона
         :rtype: Optional[str]
         """
-        return self.body.get("address_door_code")
+        return (self.body.get("address") or {}).get("door_code")
 
     @property
     def address_comment(self) -> Optional[str]:
@@ -2477,7 +3037,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Комментарий для курьера Для точки А (откуда забрать отправление) используйте шаблон: "Доставка из магазина <>. Сообщите менеджеру, что заказ по доставке Яндекс.Такси. Назовите номер заказа <> и заберите посылку. Заказ оплачен безналично, при передаче заказа нельзя требовать с получателя деньги за доставку." Для точек Б (куда доставить) в комментарий передавайте пожелания получателя. Например "домофон не работает" / "шлагбаум закрыт, позвонить за 10 минут" / "не звонить, спит ребенок".
         :rtype: Optional[str]
         """
-        return self.body.get("address_comment")
+        return (self.body.get("address") or {}).get("comment")
 
     @property
     def address_uri(self) -> Optional[str]:
@@ -2486,7 +3046,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Карточный uri геообъекта
         :rtype: Optional[str]
         """
-        return self.body.get("address_uri")
+        return (self.body.get("address") or {}).get("uri")
 
     @property
     def type(self) -> str:
@@ -2542,7 +3102,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Идентификатор заказа
         :rtype: str
         """
-        return self.body.get("payment_on_delivery_client_order_id")
+        return (self.body.get("payment_on_delivery") or {}).get("client_order_id")
 
     @property
     def payment_on_delivery_is_paid(self) -> bool:
@@ -2551,7 +3111,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Признак оплаты заказа
         :rtype: bool
         """
-        return self.body.get("payment_on_delivery_is_paid")
+        return (self.body.get("payment_on_delivery") or {}).get("is_paid")
 
     @property
     def payment_on_delivery_cost(self) -> str:
@@ -2560,7 +3120,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Цена Decimal(19, 4)
         :rtype: str
         """
-        return self.body.get("payment_on_delivery_cost")
+        return (self.body.get("payment_on_delivery") or {}).get("cost")
 
     @property
     def payment_on_delivery_customer_full_name(self) -> Optional[str]:
@@ -2569,7 +3129,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Для юридического лица — название организации, для ИП и физического лица — ФИО
         :rtype: Optional[str]
         """
-        return self.body.get("payment_on_delivery_customer_full_name")
+        return ((self.body.get("payment_on_delivery") or {}).get("customer") or {}).get("full_name")
 
     @property
     def payment_on_delivery_customer_inn(self) -> Optional[str]:
@@ -2578,7 +3138,7 @@ class ResponseCargoPointMP(YCBase):
         :return: ИНН пользователя (10 или 12 цифр)
         :rtype: Optional[str]
         """
-        return self.body.get("payment_on_delivery_customer_inn")
+        return ((self.body.get("payment_on_delivery") or {}).get("customer") or {}).get("inn")
 
     @property
     def payment_on_delivery_customer_email(self) -> Optional[str]:
@@ -2587,7 +3147,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Электронная почта пользователя. Если не указано, будет использована почта получателя из точки
         :rtype: Optional[str]
         """
-        return self.body.get("payment_on_delivery_customer_email")
+        return ((self.body.get("payment_on_delivery") or {}).get("customer") or {}).get("email")
 
     @property
     def payment_on_delivery_customer_phone(self) -> Optional[str]:
@@ -2596,7 +3156,7 @@ class ResponseCargoPointMP(YCBase):
         :return: Телефон пользователя. Если не указано, будет использован телефон получателя из точки
         :rtype: Optional[str]
         """
-        return self.body.get("payment_on_delivery_customer_phone")
+        return ((self.body.get("payment_on_delivery") or {}).get("customer") or {}).get("phone")
 
     @property
     def payment_on_delivery_tax_system_code(self) -> Optional[int]:
@@ -2613,7 +3173,7 @@ class ResponseCargoPointMP(YCBase):
 
         :rtype: Optional[int]
         """
-        return self.body.get("payment_on_delivery_tax_system_code")
+        return (self.body.get("payment_on_delivery") or {}).get("tax_system_code")
 
     @property
     def external_order_id(self) -> Optional[str]:
@@ -2642,6 +3202,8 @@ class SearchClaimsResponseMP(YCBase):
     :param List['SearchedClaimMP'] claims: Список найденных заявок *(Обязательный параметр)*
     """
 
+    __slots__ = ()
+
     def __init__(self,
                  claims: List['SearchedClaimMP'] = None,
                  ):
@@ -2655,6 +3217,19 @@ class SearchClaimsResponseMP(YCBase):
     def __repr__(self):
         return "<SearchClaimsResponseMP>"
 
+    @classmethod
+    def from_dict(cls, item: dict) -> 'SearchClaimsResponseMP':
+        """
+
+        Создание объекта из ответа сервера
+
+        :param dict item: Объект в виде json
+
+        :rtype: SearchClaimsResponseMP
+        """
+        return cls(claims=_from_dicts(SearchedClaimMP.from_dict, item.get("claims", None)),
+                   )
+
     @property
     def claims(self) -> List['SearchedClaimMP']:
         """
@@ -2662,54 +3237,7 @@ class SearchClaimsResponseMP(YCBase):
         :return: Список найденных заявок
         :rtype: List['SearchedClaimMP']
         """
-        return [SearchedClaimMP(id=item.get("id", None),
-                                corp_client_id=item.get("corp_client_id", None),
-                                yandex_uid=item.get("yandex_uid", None),
-                                items=item.get("items", None),
-                                route_points=item.get("route_points", None),
-                                current_point_id=item.get("current_point_id", None),
-                                status=item.get("status", None),
-                                version=item.get("version", None),
-                                error_messages=item.get("error_messages", None),
-                                emergency_contact_name=item.get("emergency_contact", {}).get("name", None),
-                                emergency_contact_phone=item.get("emergency_contact", {}).get("phone", None),
-                                skip_door_to_door=item.get("skip_door_to_door", None),
-                                skip_client_notify=item.get("skip_client_notify", None),
-                                skip_emergency_notify=item.get("skip_emergency_notify", None),
-                                skip_act=item.get("skip_act", None),
-                                optional_return=item.get("optional_return", None),
-                                eta=item.get("eta", None),
-                                created_ts=item.get("created_ts", None),
-                                updated_ts=item.get("updated_ts", None),
-                                taxi_offer_offer_id=item.get("taxi_offer", {}).get("offer_id", None),
-                                taxi_offer_price_raw=item.get("taxi_offer", {}).get("price_raw", None),
-                                taxi_offer_price=item.get("taxi_offer", {}).get("price", None),
-                                pricing_offer_offer_id=item.get("pricing", {}).get("offer", {}).get("offer_id", None),
-                                pricing_offer_price_raw=item.get("pricing", {}).get("offer", {}).get("price_raw", None),
-                                pricing_offer_price=item.get("pricing", {}).get("offer", {}).get("price", None),
-                                pricing_currency=item.get("pricing", {}).get("currency", None),
-                                pricing_currency_rules_code=item.get("pricing", {}).get("currency_rules", {}).get("code", None),
-                                pricing_currency_rules_text=item.get("pricing", {}).get("currency_rules", {}).get("text", None),
-                                pricing_currency_rules_template=item.get("pricing", {}).get("currency_rules", {}).get("template", None),
-                                pricing_currency_rules_sign=item.get("pricing", {}).get("currency_rules", {}).get("sign", None),
-                                pricing_final_price=item.get("pricing", {}).get("final_price", None),
-                                available_cancel_state=item.get("available_cancel_state", None),
-                                client_requirements_taxi_class=item.get("client_requirements", {}).get("taxi_class", None),
-                                client_requirements_cargo_type=item.get("client_requirements", {}).get("cargo_type", None),
-                                client_requirements_cargo_loaders=item.get("client_requirements", {}).get("cargo_loaders", None),
-                                client_requirements_cargo_options=item.get("client_requirements", {}).get("cargo_options", None),
-                                matched_cars=item.get("matched_cars", None),
-                                warnings=item.get("warnings", None),
-                                performer_info_courier_name=item.get("performer_info", {}).get("courier_name", None),
-                                performer_info_legal_name=item.get("performer_info", {}).get("legal_name", None),
-                                performer_info_car_model=item.get("performer_info", {}).get("car_model", None),
-                                performer_info_car_number=item.get("performer_info", {}).get("car_number", None),
-                                callback_properties_callback_url=item.get("callback_properties", {}).get("callback_url", None),
-                                due=item.get("due", None),
-                                shipping_document=item.get("shipping_document", None),
-                                comment=item.get("comment", None),
-                                revision=item.get("revision", None),
-                                ) for item in self.body.get("claims")]
+        return self._nested("claims", SearchedClaimMP)
 
 
 class SearchedClaimMP(YCBase):
@@ -2799,6 +3327,8 @@ class SearchedClaimMP(YCBase):
     :param int revision: ??? *(Обязательный параметр)* (1)
     """
 
+    __slots__ = ()
+
     def __init__(self,
                  id: str = None,
                  corp_client_id: Optional[str] = None,
@@ -2848,7 +3378,7 @@ class SearchedClaimMP(YCBase):
                  comment: Optional[str] = None,
                  revision: int = None,
                  ):
-        self.body = collections.defaultdict(dict)
+        self.body = collections.defaultdict(_nested_dict)
 
         if id is not None:
             self.body["id"] = validate_fields('id', id, str)
@@ -3064,6 +3594,65 @@ class SearchedClaimMP(YCBase):
     def __repr__(self):
         return "<SearchedClaimMP>"
 
+    @classmethod
+    def from_dict(cls, item: dict) -> 'SearchedClaimMP':
+        """
+
+        Создание объекта из ответа сервера
+
+        :param dict item: Объект в виде json
+
+        :rtype: SearchedClaimMP
+        """
+        return cls(id=item.get("id", None),
+                   corp_client_id=item.get("corp_client_id", None),
+                   yandex_uid=item.get("yandex_uid", None),
+                   items=_from_dicts(CargoItemMP.from_dict, item.get("items", None)),
+                   route_points=_from_dicts(ResponseCargoPointMP.from_dict, item.get("route_points", None)),
+                   current_point_id=item.get("current_point_id", None),
+                   status=item.get("status", None),
+                   version=item.get("version", None),
+                   error_messages=_from_dicts(HumanErrorMessage.from_dict, item.get("error_messages", None)),
+                   emergency_contact_name=item.get("emergency_contact", {}).get("name", None),
+                   emergency_contact_phone=item.get("emergency_contact", {}).get("phone", None),
+                   skip_door_to_door=item.get("skip_door_to_door", None),
+                   skip_client_notify=item.get("skip_client_notify", None),
+                   skip_emergency_notify=item.get("skip_emergency_notify", None),
+                   skip_act=item.get("skip_act", None),
+                   optional_return=item.get("optional_return", None),
+                   eta=item.get("eta", None),
+                   created_ts=item.get("created_ts", None),
+                   updated_ts=item.get("updated_ts", None),
+                   taxi_offer_offer_id=item.get("taxi_offer", {}).get("offer_id", None),
+                   taxi_offer_price_raw=item.get("taxi_offer", {}).get("price_raw", None),
+                   taxi_offer_price=item.get("taxi_offer", {}).get("price", None),
+                   pricing_offer_offer_id=item.get("pricing", {}).get("offer", {}).get("offer_id", None),
+                   pricing_offer_price_raw=item.get("pricing", {}).get("offer", {}).get("price_raw", None),
+                   pricing_offer_price=item.get("pricing", {}).get("offer", {}).get("price", None),
+                   pricing_currency=item.get("pricing", {}).get("currency", None),
+                   pricing_currency_rules_code=item.get("pricing", {}).get("currency_rules", {}).get("code", None),
+                   pricing_currency_rules_text=item.get("pricing", {}).get("currency_rules", {}).get("text", None),
+                   pricing_currency_rules_template=item.get("pricing", {}).get("currency_rules", {}).get("template", None),
+                   pricing_currency_rules_sign=item.get("pricing", {}).get("currency_rules", {}).get("sign", None),
+                   pricing_final_price=item.get("pricing", {}).get("final_price", None),
+                   available_cancel_state=item.get("available_cancel_state", None),
+                   client_requirements_taxi_class=item.get("client_requirements", {}).get("taxi_class", None),
+                   client_requirements_cargo_type=item.get("client_requirements", {}).get("cargo_type", None),
+                   client_requirements_cargo_loaders=item.get("client_requirements", {}).get("cargo_loaders", None),
+                   client_requirements_cargo_options=item.get("client_requirements", {}).get("cargo_options", None),
+                   matched_cars=_from_dicts(MatchedCar.from_dict, item.get("matched_cars", None)),
+                   warnings=_from_dicts(ClaimWarning.from_dict, item.get("warnings", None)),
+                   performer_info_courier_name=item.get("performer_info", {}).get("courier_name", None),
+                   performer_info_legal_name=item.get("performer_info", {}).get("legal_name", None),
+                   performer_info_car_model=item.get("performer_info", {}).get("car_model", None),
+                   performer_info_car_number=item.get("performer_info", {}).get("car_number", None),
+                   callback_properties_callback_url=item.get("callback_properties", {}).get("callback_url", None),
+                   due=item.get("due", None),
+                   shipping_document=item.get("shipping_document", None),
+                   comment=item.get("comment", None),
+                   revision=item.get("revision", None),
+                   )
+
     @property
     def id(self) -> str:
         """
@@ -3098,25 +3687,7 @@ class SearchedClaimMP(YCBase):
         :return: Перечисление наименований грузов для отправления
         :rtype: List['CargoItemMP']
         """
-        return [CargoItemMP(extra_id=item.get("extra_id", None),
-                            pickup_point=item.get("pickup_point", None),
-                            droppof_point=item.get("droppof_point", None),
-                            title=item.get("title", None),
-                            size_length=item.get("size", {}).get("length", None),
-                            size_width=item.get("size", {}).get("width", None),
-                            size_height=item.get("size", {}).get("height", None),
-                            weight=item.get("weight", None),
-                            cost_value=item.get("cost_value", None),
-                            cost_currency=item.get("cost_currency", None),
-                            quantity=item.get("quantity", None),
-                            fiscalization_vat_code=item.get("fiscalization", {}).get("vat_code", None),
-                            fiscalization_payment_subject=item.get("fiscalization", {}).get("payment_subject", None),
-                            fiscalization_payment_mode=item.get("fiscalization", {}).get("payment_mode", None),
-                            fiscalization_product_code=item.get("fiscalization", {}).get("product_code", None),
-                            fiscalization_country_of_origin_code=item.get("fiscalization", {}).get("country_of_origin_code", None),
-                            fiscalization_customs_declaration_number=item.get("fiscalization", {}).get("customs_declaration_number", None),
-                            fiscalization_excise=item.get("fiscalization", {}).get("excise", None),
-                            ) for item in self.body.get("items")]
+        return self._nested("items", CargoItemMP)
 
     @property
     def route_points(self) -> List['ResponseCargoPointMP']:
@@ -3125,40 +3696,7 @@ class SearchedClaimMP(YCBase):
         :return: Информация по точкам маршрута
         :rtype: List['ResponseCargoPointMP']
         """
-        return [ResponseCargoPointMP(id=item.get("id", None),
-                                     contact_name=item.get("contact", {}).get("name", None),
-                                     contact_phone=item.get("contact", {}).get("phone", None),
-                                     contact_email=item.get("contact", {}).get("email", None),
-                                     address_fullname=item.get("address", {}).get("fullname", None),
-                                     address_shortname=item.get("address", {}).get("shortname", None),
-                                     address_coordinates=item.get("address", {}).get("coordinates", None),
-                                     address_country=item.get("address", {}).get("country", None),
-                                     address_city=item.get("address", {}).get("city", None),
-                                     address_street=item.get("address", {}).get("street", None),
-                                     address_building=item.get("address", {}).get("building", None),
-                                     address_porch=item.get("address", {}).get("porch", None),
-                                     address_floor=item.get("address", {}).get("floor", None),
-                                     address_flat=item.get("address", {}).get("flat", None),
-                                     address_sfloor=item.get("address", {}).get("sfloor", None),
-                                     address_sflat=item.get("address", {}).get("sflat", None),
-                                     address_door_code=item.get("address", {}).get("door_code", None),
-                                     address_comment=item.get("address", {}).get("comment", None),
-                                     address_uri=item.get("address", {}).get("uri", None),
-                                     type=item.get("type", None),
-                                     visit_order=item.get("visit_order", None),
-                                     visit_status=item.get("visit_status", None),
-                                     skip_confirmation=item.get("skip_confirmation", None),
-                                     payment_on_delivery_client_order_id=item.get("payment_on_delivery", {}).get("client_order_id", None),
-                                     payment_on_delivery_is_paid=item.get("payment_on_delivery", {}).get("is_paid", None),
-                                     payment_on_delivery_cost=item.get("payment_on_delivery", {}).get("cost", None),
-                                     payment_on_delivery_customer_full_name=item.get("payment_on_delivery", {}).get("customer", {}).get("full_name", None),
-                                     payment_on_delivery_customer_inn=item.get("payment_on_delivery", {}).get("customer", {}).get("inn", None),
-                                     payment_on_delivery_customer_email=item.get("payment_on_delivery", {}).get("customer", {}).get("email", None),
-                                     payment_on_delivery_customer_phone=item.get("payment_on_delivery", {}).get("customer", {}).get("phone", None),
-                                     payment_on_delivery_tax_system_code=item.get("payment_on_delivery", {}).get("tax_system_code", None),
-                                     external_order_id=item.get("external_order_id", None),
-                                     pickup_code=item.get("pickup_code", None),
-                                     ) for item in self.body.get("route_points")]
+        return self._nested("route_points", ResponseCargoPointMP)
 
     @property
     def current_point_id(self) -> int:
@@ -3223,9 +3761,7 @@ class SearchedClaimMP(YCBase):
         :return: Список сообщений об ошибках
         :rtype: Optional[List['HumanErrorMessage']]
         """
-        return [HumanErrorMessage(code=item.get("code", None),
-                                  message=item.get("message", None),
-                                  ) for item in self.body.get("error_messages")]
+        return self._nested("error_messages", HumanErrorMessage)
 
     @property
     def emergency_contact_name(self) -> str:
@@ -3234,7 +3770,7 @@ class SearchedClaimMP(YCBase):
         :return: Имя контактного лица
         :rtype: str
         """
-        return self.body.get("emergency_contact_name")
+        return (self.body.get("emergency_contact") or {}).get("name")
 
     @property
     def emergency_contact_phone(self) -> str:
@@ -3243,7 +3779,7 @@ class SearchedClaimMP(YCBase):
         :return: Телефон контактного лица
         :rtype: str
         """
-        return self.body.get("emergency_contact_phone")
+        return (self.body.get("emergency_contact") or {}).get("phone")
 
     @property
     def skip_door_to_door(self) -> Optional[bool]:
@@ -3324,7 +3860,7 @@ class SearchedClaimMP(YCBase):
         :return: Идентификатор предложения
         :rtype: str
         """
-        return self.body.get("taxi_offer_offer_id")
+        return (self.body.get("taxi_offer") or {}).get("offer_id")
 
     @property
     def taxi_offer_price_raw(self) -> int:
@@ -3333,7 +3869,7 @@ class SearchedClaimMP(YCBase):
         :return: (deprecated) Цена по офферу в валюте, указанной в договоре
         :rtype: int
         """
-        return self.body.get("taxi_offer_price_raw")
+        return (self.body.get("taxi_offer") or {}).get("price_raw")
 
     @property
     def taxi_offer_price(self) -> str:
@@ -3342,7 +3878,7 @@ class SearchedClaimMP(YCBase):
         :return: Цена Decimal(19, 4)
         :rtype: str
         """
-        return self.body.get("taxi_offer_price")
+        return (self.body.get("taxi_offer") or {}).get("price")
 
     @property
     def pricing_offer_offer_id(self) -> str:
@@ -3351,7 +3887,7 @@ class SearchedClaimMP(YCBase):
         :return: Идентификатор предложения
         :rtype: str
         """
-        return self.body.get("pricing_offer_offer_id")
+        return ((self.body.get("pricing") or {}).get("offer") or {}).get("offer_id")
 
     @property
     def pricing_offer_price_raw(self) -> int:
@@ -3360,7 +3896,7 @@ class SearchedClaimMP(YCBase):
         :return: (deprecated) Цена по предложению в валюте, указанной в договоре
         :rtype: int
         """
-        return self.body.get("pricing_offer_price_raw")
+        return ((self.body.get("pricing") or {}).get("offer") or {}).get("price_raw")
 
     @property
     def pricing_offer_price(self) -> str:
@@ -3369,7 +3905,7 @@ class SearchedClaimMP(YCBase):
         :return: Цена Decimal(19, 4)
         :rtype: str
         """
-        return self.body.get("pricing_offer_price")
+        return ((self.body.get("pricing") or {}).get("offer") or {}).get("price")
 
     @property
     def pricing_currency(self) -> Optional[str]:
@@ -3378,7 +3914,7 @@ class SearchedClaimMP(YCBase):
         :return: Трехзначный код валюты, в которой ведется расчет
         :rtype: Optional[str]
         """
-        return self.body.get("pricing_currency")
+        return (self.body.get("pricing") or {}).get("currency")
 
     @property
     def pricing_currency_rules_code(self) -> str:
@@ -3387,7 +3923,7 @@ class SearchedClaimMP(YCBase):
         :return: Трехзначный код валюты, в которой ведется расчет
         :rtype: str
         """
-        return self.body.get("pricing_currency_rules_code")
+        return ((self.body.get("pricing") or {}).get("currency_rules") or {}).get("code")
 
     @property
     def pricing_currency_rules_text(self) -> str:
@@ -3396,7 +3932,7 @@ class SearchedClaimMP(YCBase):
         :return: Сокращенное наименование валюты
         :rtype: str
         """
-        return self.body.get("pricing_currency_rules_text")
+        return ((self.body.get("pricing") or {}).get("currency_rules") or {}).get("text")
 
     @property
     def pricing_currency_rules_template(self) -> str:
@@ -3405,7 +3941,7 @@ class SearchedClaimMP(YCBase):
         :return: Шаблон
         :rtype: str
         """
-        return self.body.get("pricing_currency_rules_template")
+        return ((self.body.get("pricing") or {}).get("currency_rules") or {}).get("template")
 
     @property
     def pricing_currency_rules_sign(self) -> Optional[str]:
@@ -3414,7 +3950,7 @@ class SearchedClaimMP(YCBase):
         :return: Символ валюты
         :rtype: Optional[str]
         """
-        return self.body.get("pricing_currency_rules_sign")
+        return ((self.body.get("pricing") or {}).get("currency_rules") or {}).get("sign")
 
     @property
     def pricing_final_price(self) -> str:
@@ -3423,7 +3959,7 @@ class SearchedClaimMP(YCBase):
         :return: Цена Decimal(19, 4)
         :rtype: str
         """
-        return self.body.get("pricing_final_price")
+        return (self.body.get("pricing") or {}).get("final_price")
 
     @property
     def available_cancel_state(self) -> Optional[str]:
@@ -3445,7 +3981,7 @@ class SearchedClaimMP(YCBase):
         :return: Класс такси. Возможные значения courier, express, cargo.
         :rtype: str
         """
-        return self.body.get("client_requirements_taxi_class")
+        return (self.body.get("client_requirements") or {}).get("taxi_class")
 
     @property
     def client_requirements_cargo_type(self) -> Optional[str]:
@@ -3454,7 +3990,7 @@ class SearchedClaimMP(YCBase):
         :return: Тип грузовика
         :rtype: Optional[str]
         """
-        return self.body.get("client_requirements_cargo_type")
+        return (self.body.get("client_requirements") or {}).get("cargo_type")
 
     @property
     def client_requirements_cargo_loaders(self) -> Optional[int]:
@@ -3463,7 +3999,7 @@ class SearchedClaimMP(YCBase):
         :return: Требуемое число грузчиков
         :rtype: Optional[int]
         """
-        return self.body.get("client_requirements_cargo_loaders")
+        return (self.body.get("client_requirements") or {}).get("cargo_loaders")
 
     @property
     def client_requirements_cargo_options(self) -> Optional[List['str']]:
@@ -3472,7 +4008,8 @@ class SearchedClaimMP(YCBase):
         :return: Дополнительные опции тарифа
         :rtype: Optional[List['str']]
         """
-        return [item for item in self.body.get("client_requirements_cargo_options")]
+        cargo_options = (self.body.get("client_requirements") or {}).get("cargo_options")
+        return None if cargo_options is None else [item for item in cargo_options]
 
     @property
     def matched_cars(self) -> Optional[List['MatchedCar']]:
@@ -3481,13 +4018,7 @@ class SearchedClaimMP(YCBase):
         :return: Информация об исполнителе (массив, на данный момент всегда 1 элемент)
         :rtype: Optional[List['MatchedCar']]
         """
-        return [MatchedCar(taxi_class=item.get("taxi_class", None),
-                           client_taxi_class=item.get("client_taxi_class", None),
-                           cargo_type=item.get("cargo_type", None),
-                           cargo_type_int=item.get("cargo_type_int", None),
-                           cargo_loaders=item.get("cargo_loaders", None),
-                           door_to_door=item.get("door_to_door", None),
-                           ) for item in self.body.get("matched_cars")]
+        return self._nested("matched_cars", MatchedCar)
 
     @property
     def warnings(self) -> Optional[List['ClaimWarning']]:
@@ -3496,10 +4027,7 @@ class SearchedClaimMP(YCBase):
         :return: Предупреждения по циклу заявки
         :rtype: Optional[List['ClaimWarning']]
         """
-        return [ClaimWarning(source=item.get("source", None),
-                             code=item.get("code", None),
-                             message=item.get("message", None),
-                             ) for item in self.body.get("warnings")]
+        return self._nested("warnings", ClaimWarning)
 
     @property
     def performer_info_courier_name(self) -> str:
@@ -3508,7 +4036,7 @@ class SearchedClaimMP(YCBase):
         :return: Имя курьера, доставляющего посылку
         :rtype: str
         """
-        return self.body.get("performer_info_courier_name")
+        return (self.body.get("performer_info") or {}).get("courier_name")
 
     @property
     def performer_info_legal_name(self) -> str:
@@ -3517,7 +4045,7 @@ class SearchedClaimMP(YCBase):
         :return: Данные о юридическом лице, которое осуществляет доставку
         :rtype: str
         """
-        return self.body.get("performer_info_legal_name")
+        return (self.body.get("performer_info") or {}).get("legal_name")
 
     @property
     def performer_info_car_model(self) -> Optional[str]:
@@ -3526,7 +4054,7 @@ class SearchedClaimMP(YCBase):
         :return: Модель машины
         :rtype: Optional[str]
         """
-        return self.body.get("performer_info_car_model")
+        return (self.body.get("performer_info") or {}).get("car_model")
 
     @property
     def performer_info_car_number(self) -> Optional[str]:
@@ -3535,7 +4063,7 @@ class SearchedClaimMP(YCBase):
         :return: Номер машины
         :rtype: Optional[str]
         """
-        return self.body.get("performer_info_car_number")
+        return (self.body.get("performer_info") or {}).get("car_number")
 
     @property
     def callback_properties_callback_url(self) -> str:
@@ -3544,7 +4072,7 @@ class SearchedClaimMP(YCBase):
         :return: URL, который будет вызываться при смене статусов по заявке.  Данный механизм устарел, вместо него следует использовать операцию v1/claims/journal.
         :rtype: str
         """
-        return self.body.get("callback_properties_callback_url")
+        return (self.body.get("callback_properties") or {}).get("callback_url")
 
     @property
     def due(self) -> Optional[str]:
@@ -3597,6 +4125,8 @@ class TimeInterval(YCBase):
     :param str to: Окончание интервала *(Обязательный параметр)* (2020-01-02T00:00:00+00:00)
     """
 
+    __slots__ = ()
+
     def __init__(self,
                  type: str = None,
                  _from: str = None,
@@ -3625,6 +4155,21 @@ class TimeInterval(YCBase):
     def __repr__(self):
         return "<TimeInterval>"
 
+    @classmethod
+    def from_dict(cls, item: dict) -> 'TimeInterval':
+        """
+
+        Создание объекта из ответа сервера
+
+        :param dict item: Объект в виде json
+
+        :rtype: TimeInterval
+        """
+        return cls(type=item.get("type", None),
+                   _from=item.get("from", None),
+                   to=item.get("to", None),
+                   )
+
     @property
     def type(self) -> str:
         """
@@ -3645,7 +4190,7 @@ class TimeInterval(YCBase):
         :return: Начало интервала
         :rtype: str
         """
-        return self.body.get("_from")
+        return self.body.get("from")
 
     @property
     def to(self) -> str:
@@ -3667,6 +4212,8 @@ class VoiceforwardingResponse(YCBase):
     :param int ttl_seconds: Время, в течение которого этот номер действителен *(Обязательный параметр)*
     """
 
+    __slots__ = ()
+
     def __init__(self,
                  phone: str = None,
                  ext: str = None,
@@ -3694,6 +4241,21 @@ class VoiceforwardingResponse(YCBase):
     def __repr__(self):
         return "<VoiceforwardingResponse>"
 
+    @classmethod
+    def from_dict(cls, item: dict) -> 'VoiceforwardingResponse':
+        """
+
+        Создание объекта из ответа сервера
+
+        :param dict item: Объект в виде json
+
+        :rtype: VoiceforwardingResponse
+        """
+        return cls(phone=item.get("phone", None),
+                   ext=item.get("ext", None),
+                   ttl_seconds=item.get("ttl_seconds", None),
+                   )
+
     @property
     def phone(self) -> str:
         """
@@ -3720,3 +4282,17 @@ class VoiceforwardingResponse(YCBase):
         :rtype: int
         """
         return self.body.get("ttl_seconds")
+
+
+def _build_validators():
+    """
+    Сборка проверок для всех типов полей объектов при импорте модуля
+    """
+    for cls in YCBase.__subclasses__():
+        for field_type in cls.__init__.__annotations__.values():
+            if get_origin(field_type) is Union:
+                field_type = next(arg for arg in get_args(field_type) if arg is not type(None))
+            _VALIDATORS.setdefault(field_type, _type_validator(field_type))
+
+
+_build_validators()
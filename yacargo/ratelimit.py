@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Модуль с ограничением частоты запросов на стороне клиента
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from yacargo.exceptions import InputParamError
+
+logger = logging.getLogger('yaCargo')
+
+
+class TokenBucket:
+    """
+
+    Корзина токенов: в среднем не больше ``rate`` запросов в секунду, всплески до ``burst`` запросов.
+
+    Вызов :meth:`reserve` сразу занимает токен и возвращает, сколько нужно подождать до запроса.
+    Ожидание происходит снаружи, поэтому одна корзина годится и для потоков (``time.sleep``),
+    и для asyncio (``asyncio.sleep``).
+
+    :param float rate: Запросов в секунду
+    :param float burst: Размер всплеска (по умолчанию - ``rate``, но не меньше 1)
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise InputParamError("<rate> of <TokenBucket> should be positive")
+        self.rate = float(rate)
+        self.burst = float(burst) if burst is not None else max(1.0, self.rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Занять токен
+
+        :return: Время ожидания в секундах
+        :rtype: float
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, delay = _take(self._tokens, now - self._updated, self.rate, self.burst)
+            self._updated = now
+        return delay
+
+
+class FileTokenBucket:
+    """
+
+    Корзина токенов, общая для нескольких процессов на одной машине.
+    Состояние хранится в файле ``path`` и изменяется под блокировкой ``fcntl.flock``.
+
+        >>> bucket = FileTokenBucket('/tmp/yacargo-info.bucket', rate=50)
+
+    :param str path: Путь к файлу состояния
+    :param float rate: Запросов в секунду
+    :param float burst: Размер всплеска (по умолчанию - ``rate``, но не меньше 1)
+    """
+
+    def __init__(self, path, rate, burst=None):
+        if fcntl is None:
+            raise InputParamError("<FileTokenBucket> requires fcntl (POSIX only)")
+        if rate <= 0:
+            raise InputParamError("<rate> of <FileTokenBucket> should be positive")
+        self.path = path
+        self.rate = float(rate)
+        self.burst = float(burst) if burst is not None else max(1.0, self.rate)
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Занять токен
+
+        :return: Время ожидания в секундах
+        :rtype: float
+        """
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                now = time.time()
+                raw = os.read(fd, 128)
+                try:
+                    tokens, updated = json.loads(raw)
+                except ValueError:
+                    tokens, updated = self.burst, now
+                tokens, delay = _take(tokens, max(0.0, now - updated), self.rate, self.burst)
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, json.dumps([tokens, now]).encode())
+            finally:
+                os.close(fd)
+        return delay
+
+
+def _take(tokens, elapsed, rate, burst):
+    """
+    Пополнение корзины за прошедшее время и резервирование одного токена
+
+    :param float tokens: Токенов в корзине (отрицательное значение - очередь уже занятых)
+    :param float elapsed: Время с прошлого обновления в секундах
+    :param float rate: Запросов в секунду
+    :param float burst: Размер корзины
+
+    :return: Новое количество токенов и время ожидания
+    :rtype: tuple
+    """
+    tokens = min(burst, tokens + elapsed * rate) - 1
+    return tokens, (-tokens / rate if tokens < 0 else 0.0)
+
+
+class RateLimiter:
+    """
+
+    Ограничения частоты запросов по ресурсам API.
+
+    Ключ - окончание пути ресурса (``/v2/claims/info``), ``*`` - ограничение для остальных ресурсов.
+    Значение - корзина (:class:`TokenBucket`, :class:`FileTokenBucket`), число запросов в секунду
+    или пара (запросов в секунду, всплеск):
+
+        >>> ya = YCAPI('SuperDuperToken', rate_limit={'/v2/claims/info': (20, 40),
+        >>>                                           '/v1/claims/journal': 1,
+        >>>                                           '*': 10})
+
+    Ресурсы без ограничения не ждут.
+
+    :param dict limits: Ограничения по ресурсам
+    """
+
+    def __init__(self, limits):
+        self.limits = {key: _bucket(value) for key, value in limits.items()}
+        self._default = self.limits.get('*')
+        self._resolved = {}
+
+    def bucket(self, resource):
+        """
+        Корзина для ресурса
+
+        :param str resource: Запрашиваемый ресурс
+
+        :rtype: Optional[TokenBucket]
+        """
+        try:
+            return self._resolved[resource]
+        except KeyError:
+            pass
+        matches = [key for key in self.limits if key != '*' and resource.endswith(key)]
+        bucket = self.limits[max(matches, key=len)] if matches else self._default
+        self._resolved[resource] = bucket
+        return bucket
+
+    def reserve(self, resource):
+        """
+        Занять токен для запроса к ресурсу
+
+        :param str resource: Запрашиваемый ресурс
+
+        :return: Время ожидания в секундах
+        :rtype: float
+        """
+        bucket = self.bucket(resource)
+        if bucket is None:
+            return 0.0
+        delay = bucket.reserve()
+        if delay:
+            logger.debug('Rate limit for %s: waiting %.3fs', resource, delay)
+        return delay
+
+
+def _bucket(value):
+    if hasattr(value, 'reserve'):
+        return value
+    if isinstance(value, (tuple, list)):
+        return TokenBucket(*value)
+    return TokenBucket(value)
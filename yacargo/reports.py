@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Модуль с получением отчетов по заявкам: генерация, ожидание, скачивание и разбор
+"""
+import csv
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import time
+import uuid
+
+from yacargo.exceptions import ReportError
+
+logger = logging.getLogger('yaCargo')
+
+CACHE_DIR = os.path.join(tempfile.gettempdir(), 'yacargo-reports')
+
+
+class Report:
+    """
+
+    Скачанный отчет
+
+    :param str path: Путь к файлу отчета
+    :param str token: Токен идемпотентности отчета
+    :param bool cached: Отчет взят из локального кэша без обращения к серверу
+    """
+
+    def __init__(self, path, token, cached):
+        self.path = path
+        self.token = token
+        self.cached = cached
+
+    def __repr__(self):
+        return '<Report {}>'.format(self.path)
+
+    def rows(self, delimiter=None, encoding='utf-8-sig'):
+        """
+
+        Строки отчета в виде словарей (заголовок => значение). Файл читается построчно.
+
+        :param str delimiter: Разделитель полей (по умолчанию определяется по первой строке)
+        :param str encoding: Кодировка файла
+
+        :rtype: Iterator[dict]
+        """
+        with open(self.path, encoding=encoding, newline='') as file:
+            if delimiter is None:
+                header = file.readline()
+                delimiter = max(';,\t', key=header.count)
+                file.seek(0)
+            yield from csv.DictReader(file, delimiter=delimiter)
+
+
+def report_token(since_date, till_date, lang=None):
+    """
+    Токен идемпотентности отчета, одинаковый для одного и того же периода и языка
+
+    :param str since_date: Дата начала отчетного периода
+    :param str till_date: Дата конца отчетного периода
+    :param str lang: Язык отчета
+
+    :rtype: str
+    """
+    return uuid.uuid5(uuid.NAMESPACE_URL, 'report:{}:{}:{}'.format(since_date, till_date, lang or '')).hex
+
+
+def _cache_key(api, since_date, till_date, lang, token):
+    """
+    Имя файла отчета в кэше: учитывает авторизационный ключ и сервер клиента, период, язык и токен
+
+    :rtype: str
+    """
+    key = '\n'.join((api.headers.get('Authorization', ''), api.headers.get('Host', ''),
+                      since_date, till_date, lang or '', token))
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def fetch_report(api, since_date, till_date, lang=None, idempotency_token=None, cache_dir=CACHE_DIR,
+                 poll_interval=1.0, max_interval=30.0, timeout=600.0, progress=None):
+    """
+
+    Получение отчета за период: ``report_generate``, ожидание готовности через ``report_status``
+    и потоковое скачивание ``report_download`` в ``cache_dir``.
+
+    Повторный вызов тем же клиентом (авторизационный ключ и сервер) с тем же периодом, языком
+    и ``idempotency_token`` отдает уже скачанный файл без обращения к серверу.
+    Генерация с тем же токеном на сервере тоже не повторяется.
+
+    :param YCAPI api: Клиент API
+    :param str since_date: Дата начала отчетного периода (2020-01-01)
+    :param str till_date: Дата конца отчетного периода (2020-01-02)
+    :param str lang: Язык отчета
+    :param str idempotency_token: Токен идемпотентности (по умолчанию вычисляется из периода и языка)
+    :param str cache_dir: Каталог для скачанных отчетов
+    :param float poll_interval: Начальная пауза между проверками статуса в секундах
+    :param float max_interval: Максимальная пауза между проверками статуса в секундах
+    :param float timeout: Максимальное время ожидания отчета в секундах
+    :param progress: Функция ``progress(received, total)`` для скачивания
+
+    :rtype: Report
+    """
+    token = idempotency_token or report_token(since_date, till_date, lang)
+    path = os.path.join(cache_dir, '{}.csv'.format(_cache_key(api, since_date, till_date, lang, token)))
+    if os.path.exists(path):
+        logger.debug('Report %s is taken from cache', token)
+        return Report(path, token, True)
+
+    task_id = api.report_generate(since_date=since_date, till_date=till_date, lang=lang,
+                                  idempotency_token=token).task_id
+    deadline = time.monotonic() + timeout
+    interval = poll_interval
+    while True:
+        status = api.report_status(task_id=task_id).status
+        logger.debug('Report %s status: %s', task_id, status)
+        if status == 'complete':
+            break
+        if status == 'failed':
+            raise ReportError(task_id, status)
+        if time.monotonic() + interval > deadline:
+            raise ReportError(task_id, status)
+        time.sleep(interval)
+        interval = min(max_interval, interval * 1.5)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix='.report-')
+    try:
+        with io.open(fd, 'wb') as file:
+            api.report_download(report_id=task_id, file=file, progress=progress)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return Report(path, token, False)
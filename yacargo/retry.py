@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Модуль с политикой повторов запросов
+"""
+import logging
+import random
+import threading
+import time
+
+from yacargo.exceptions import NetworkAPIError, ServerAPIError
+
+logger = logging.getLogger('yaCargo')
+
+RETRYABLE_ERRORS = (NetworkAPIError, ServerAPIError)
+
+# Ресурсы только на чтение: повтор ничего не меняет на сервере
+READ_RESOURCES = frozenset((
+    '/b2b/cargo/integration/v1/claims/journal',
+    '/b2b/cargo/integration/v1/claims/performer-position',
+    '/b2b/cargo/integration/v1/order-report/status',
+    '/b2b/cargo/integration/v2/claims/info',
+    '/b2b/cargo/integration/v2/claims/search',
+    '/b2b/cargo/integration/v2/claims/search/active',
+    '/b2b/cargo/integration/v2/claims/confirmation_code',
+    '/b2b/cargo/integration/v2/claims/bulk_info',
+))
+
+# Изменяющие ресурсы, идемпотентные при наличии поля: токена идемпотентности или версии заявки
+GUARDED_RESOURCES = {
+    '/b2b/cargo/integration/v2/claims/create': 'request_id',
+    '/b2b/cargo/integration/v1/order-report/generate': 'idempotency_token',
+    '/b2b/cargo/integration/v1/claims/accept': 'version',
+    '/b2b/cargo/integration/v1/claims/cancel': 'version',
+    '/b2b/cargo/integration/v2/claims/edit': 'version',
+}
+
+
+def is_idempotent(resource, params, body):
+    """
+    Можно ли безопасно повторить запрос
+
+    :param str resource: Запрашиваемый ресурс
+    :param dict params: Параметры
+    :param dict body: Тело запроса
+
+    :rtype: bool
+    """
+    if resource in READ_RESOURCES:
+        return True
+    field = GUARDED_RESOURCES.get(resource)
+    return field is not None and (field in params or field in body)
+
+
+class RetryPolicy:
+    """
+
+    Политика повторов: экспоненциальная задержка со случайным разбросом (full jitter),
+    ограничение числа попыток, общего времени и бюджет повторов.
+
+    Бюджет общий для всех запросов клиента: каждый запрос пополняет его на ``budget_ratio``,
+    каждый повтор расходует единицу. Так при массовых сбоях повторы не умножают нагрузку на сервер.
+
+        >>> ya = YCAPI('SuperDuperToken', retry=RetryPolicy(max_attempts=5, max_elapsed=10))
+
+    Повторяются только сетевые ошибки, 429 и 5xx, и только для идемпотентных запросов
+    (см. :func:`is_idempotent`). ``RetryPolicy(max_attempts=1)`` отключает повторы.
+
+    :param int max_attempts: Максимальное количество попыток, включая первую
+    :param float backoff: Базовая задержка в секундах
+    :param float max_backoff: Максимальная задержка между попытками в секундах
+    :param float max_elapsed: Максимальное общее время на запрос с повторами в секундах
+    :param float budget: Максимальный запас повторов
+    :param float budget_ratio: Пополнение запаса повторов на каждый запрос
+    """
+
+    def __init__(self, max_attempts=4, backoff=0.2, max_backoff=5.0, max_elapsed=30.0, budget=10.0,
+                 budget_ratio=0.1):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_elapsed = max_elapsed
+        self.budget = budget
+        self.budget_ratio = budget_ratio
+        self._tokens = budget
+        self._lock = threading.Lock()
+
+    def start(self, idempotent):
+        """
+        Начало запроса
+
+        :param bool idempotent: Можно ли повторять запрос
+
+        :rtype: RetryState
+        """
+        with self._lock:
+            self._tokens = min(self.budget, self._tokens + self.budget_ratio)
+        return RetryState(self, idempotent)
+
+    def _withdraw(self):
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def delay(self, attempt):
+        """
+        Задержка перед повтором
+
+        :param int attempt: Номер неудавшейся попытки (с единицы)
+
+        :rtype: float
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+
+class RetryState:
+    """
+    Состояние повторов одного запроса
+
+    :param RetryPolicy policy: Политика повторов
+    :param bool idempotent: Можно ли повторять запрос
+    """
+
+    def __init__(self, policy, idempotent):
+        self.policy = policy
+        self.idempotent = idempotent
+        self.attempt = 0
+        self.started = time.monotonic()
+
+    def next_delay(self, exception):
+        """
+        Задержка перед следующей попыткой или None, если повторять нельзя
+
+        :param BaseException exception: Ошибка попытки
+
+        :rtype: Optional[float]
+        """
+        self.attempt += 1
+        policy = self.policy
+        if not self.idempotent or not isinstance(exception, RETRYABLE_ERRORS):
+            return None
+        if self.attempt >= policy.max_attempts:
+            return None
+        delay = policy.delay(self.attempt)
+        retry_after = getattr(exception, 'retry_after', None)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if time.monotonic() - self.started + delay > policy.max_elapsed:
+            return None
+        if not policy._withdraw():
+            logger.warning('Retry budget exhausted')
+            return None
+        return delay
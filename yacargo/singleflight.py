@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Модуль с объединением одинаковых одновременных запросов (singleflight)
+"""
+import asyncio
+import json
+import logging
+import threading
+from concurrent.futures import Future
+
+logger = logging.getLogger('yaCargo')
+
+
+def request_key(resource, method, params, body):
+    """
+    Ключ запроса: одинаковые запросы дают одинаковый ключ
+
+    :param str resource: Запрашиваемый ресурс
+    :param str method: HTTP-метод
+    :param dict params: Параметры
+    :param dict body: Тело запроса
+
+    :rtype: tuple
+    """
+    return resource, method, tuple(sorted(params.items())), json.dumps(body, sort_keys=True) if body else None
+
+
+class SingleFlight:
+    """
+
+    Пока запрос с ключом выполняется, повторные вызовы с тем же ключом из других потоков
+    не отправляют свой запрос, а ждут и получают тот же результат или ту же ошибку.
+
+    :ivar int hits: Количество вызовов, получивших результат чужого запроса
+    :ivar int flights: Количество выполненных запросов
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.hits = 0
+        self.flights = 0
+
+    def do(self, key, fn):
+        """
+        Выполнение ``fn()`` или ожидание результата уже выполняющегося вызова с тем же ключом
+
+        :param key: Ключ запроса
+        :param fn: Функция без аргументов
+
+        :return: Результат ``fn()``
+        """
+        with self._lock:
+            future = self._flights.get(key)
+            leader = future is None
+            if leader:
+                future = self._flights[key] = Future()
+                self.flights += 1
+            else:
+                self.hits += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as exception:
+            future.set_exception(exception)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+
+class AsyncSingleFlight:
+    """
+
+    Вариант :class:`SingleFlight` для asyncio: одинаковые одновременные запросы из разных задач
+    одного event loop выполняются один раз.
+
+    Запрос выполняется в отдельной задаче, которую все вызывающие ждут через ``asyncio.shield``:
+    отмена одного из них (например, по его ``asyncio.wait_for``) не отменяет запрос для остальных.
+
+    :ivar int hits: Количество вызовов, получивших результат чужого запроса
+    :ivar int flights: Количество выполненных запросов
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self.hits = 0
+        self.flights = 0
+
+    async def do(self, key, fn):
+        """
+        Выполнение ``await fn()`` или ожидание результата уже выполняющегося вызова с тем же ключом
+
+        :param key: Ключ запроса
+        :param fn: Функция без аргументов, возвращающая корутину
+
+        :return: Результат корутины
+        """
+        task = self._flights.get(key)
+        if task is None:
+            task = self._flights[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._done(key, done))
+            self.flights += 1
+        else:
+            self.hits += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key, task):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            # ошибка уже передана ожидающим, их может и не остаться
+            task.exception()
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+Модуль с локальной копией заявок, обновляемой по журналу изменений
+"""
+import json
+import logging
+import sqlite3
+import threading
+
+from yacargo.exceptions import BulkRequestError
+from yacargo.journal import JournalConsumer, SQLiteCheckpointStore
+from yacargo.objects import SearchedClaimMP
+from yacargo.retry import RETRYABLE_ERRORS
+
+logger = logging.getLogger('yaCargo')
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS claims (id TEXT PRIMARY KEY, status TEXT, created_ts TEXT, updated_ts TEXT, '
+    'revision INTEGER, final_price TEXT, body TEXT NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS claims_status ON claims (status)',
+    'CREATE INDEX IF NOT EXISTS claims_created_ts ON claims (created_ts)',
+    'CREATE TABLE IF NOT EXISTS claim_orders (external_order_id TEXT NOT NULL, claim_id TEXT NOT NULL, '
+    'PRIMARY KEY (external_order_id, claim_id))',
+    'CREATE INDEX IF NOT EXISTS claim_orders_claim_id ON claim_orders (claim_id)',
+)
+
+UPSERT = ('INSERT INTO claims (id, status, created_ts, updated_ts, revision, final_price, body) '
+          'VALUES (?, ?, ?, ?, ?, ?, ?) '
+          'ON CONFLICT (id) DO UPDATE SET status = excluded.status, created_ts = excluded.created_ts, '
+          'updated_ts = excluded.updated_ts, revision = excluded.revision, final_price = excluded.final_price, '
+          'body = excluded.body '
+          'WHERE claims.revision IS NULL OR excluded.revision IS NULL OR excluded.revision >= claims.revision')
+
+
+class ClaimStore:
+    """
+
+    Локальная копия заявок (SearchedClaimMP) в SQLite с индексами по статусу, времени создания
+    и external_order_id точек маршрута. Запросы к копии не обращаются к серверу.
+
+        >>> store = ClaimStore('claims.sqlite')
+        >>> store.seed(ya)                  # активные заявки через search_active
+        >>> threading.Thread(target=store.follow, args=(ya,), daemon=True).start()
+        >>> store.query(status=['performer_found', 'pickuped'])
+
+    Заявки обновляются по ``claim_journal``: измененные заявки догружаются пачками через ``claim_bulk``,
+    курсор журнала хранится в той же базе и сохраняется после записи заявок.
+    Более старая ревизия заявки не перезаписывает более новую.
+
+    :param str path: Путь к базе (``:memory:`` - в памяти процесса)
+    """
+
+    def __init__(self, path=':memory:'):
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self.consumer = None
+        with self._lock, self.connection:
+            for statement in SCHEMA:
+                self.connection.execute(statement)
+
+    def upsert(self, claims):
+        """
+        Запись заявок
+
+        :param claims: Заявки (SearchedClaimMP или json)
+
+        :return: Количество записанных заявок
+        :rtype: int
+        """
+        rows, orders = [], []
+        for claim in claims:
+            item = claim.json() if isinstance(claim, SearchedClaimMP) else claim
+            rows.append((item['id'], item.get('status'), item.get('created_ts'), item.get('updated_ts'),
+                         item.get('revision'), (item.get('pricing') or {}).get('final_price'),
+                         json.dumps(item, ensure_ascii=False)))
+            orders.extend((point['external_order_id'], item['id']) for point in item.get('route_points') or ()
+                          if point.get('external_order_id'))
+        with self._lock, self.connection:
+            rows = self._applicable(rows)
+            applied = {row[0] for row in rows}
+            self.connection.executemany('DELETE FROM claim_orders WHERE claim_id = ?', [(row[0],) for row in rows])
+            self.connection.executemany(UPSERT, rows)
+            self.connection.executemany('INSERT OR IGNORE INTO claim_orders (external_order_id, claim_id) VALUES (?, ?)',
+                                        [order for order in orders if order[1] in applied])
+        return len(rows)
+
+    def _applicable(self, rows):
+        """
+        Строки, которые не откатят заявку на более старую ревизию (то же условие, что в UPSERT).
+        Вызывается в транзакции записи, чтобы индекс claim_orders менялся только вместе с заявкой
+
+        :param list rows: Строки таблицы claims
+
+        :rtype: list
+        """
+        latest = {}
+        for row in rows:
+            previous = latest.get(row[0])
+            if previous is None or previous[4] is None or row[4] is None or row[4] >= previous[4]:
+                latest[row[0]] = row
+        stored = {}
+        ids = list(latest)
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            stored.update(self.connection.execute(
+                'SELECT id, revision FROM claims WHERE id IN ({})'.format(','.join('?' * len(chunk))), chunk))
+        return [row for claim_id, row in latest.items()
+                if stored.get(claim_id) is None or row[4] is None or row[4] >= stored[claim_id]]
+
+    def seed(self, api, batch_size=1000, **filters):
+        """
+
+        Первоначальная загрузка: активные заявки через ``search_active``
+        или, если переданы фильтры, заявки ``claim_search``
+
+        :param YCAPI api: Клиент API
+        :param int batch_size: Количество заявок в одной транзакции
+        :param filters: Фильтры :meth:`yacargo.YCAPI.iter_claim_search` (``created_from``, ``status``, ...)
+
+        :return: Количество загруженных заявок
+        :rtype: int
+        """
+        claims = api.iter_claim_search(**filters) if filters else api.iter_search_active()
+        total = 0
+        batch = []
+        for claim in claims:
+            batch.append(claim)
+            if len(batch) >= batch_size:
+                total += self.upsert(batch)
+                batch = []
+        total += self.upsert(batch)
+        logger.debug('Seeded %d claims', total)
+        return total
+
+    def apply_events(self, api, events):
+        """
+        Догрузка заявок, измененных событиями журнала
+
+        :param YCAPI api: Клиент API
+        :param list events: События журнала (Event)
+
+        :return: Количество обновленных заявок
+        :rtype: int
+        """
+        revisions = {}
+        for event in events:
+            revisions[event.claim_id] = max(revisions.get(event.claim_id) or 0, event.revision or 0)
+        with self._lock:
+            known = dict(self.connection.execute(
+                'SELECT id, revision FROM claims WHERE id IN ({})'.format(','.join('?' * len(revisions))),
+                list(revisions)).fetchall()) if revisions else {}
+        stale = [claim_id for claim_id, revision in revisions.items()
+                 if not revision or known.get(claim_id) is None or revision > known[claim_id]]
+        if not stale:
+            return 0
+        return self.upsert(api.claim_bulk_many(stale))
+
+    def follow(self, api, name='claim_store', **options):
+        """
+
+        Обновление копии по журналу, пока не вызван :meth:`stop`.
+        Курсор журнала хранится в этой же базе под названием ``name``.
+
+        Если заявки страницы не загрузились из-за сетевой ошибки или ошибки сервера, загрузка повторяется
+        с растущей паузой, а курсор страницы не сохраняется. Заявки, которые сервер не отдает
+        из-за постоянной ошибки (4xx), пропускаются с записью в лог.
+
+        :param YCAPI api: Клиент API
+        :param str name: Название позиции в журнале
+        :param options: Параметры :class:`yacargo.journal.JournalConsumer` (``min_interval``, ``max_interval``, ...)
+        """
+        checkpoints = SQLiteCheckpointStore(name=name, connection=self.connection, lock=self._lock)
+        self.consumer = JournalConsumer(api, checkpoints, **options)
+        for events in self.consumer.pages():
+            interval = self.consumer.min_interval
+            while True:
+                try:
+                    updated = self.apply_events(api, events)
+                except RETRYABLE_ERRORS + (BulkRequestError,) as exception:
+                    if isinstance(exception, BulkRequestError) and not any(
+                            isinstance(error, RETRYABLE_ERRORS) for _, error in exception.failures):
+                        logger.error('Journal: claims not loaded, skipped: %r', exception.failures)
+                        break
+                    # курсор страницы не сохраняется, пока ее заявки не загружены
+                    interval = min(self.consumer.max_interval, max(interval, self.consumer.min_interval) * 2)
+                    logger.warning('Journal: loading claims failed (%r), retry in %.1fs', exception, interval)
+                    if self.consumer.wait(interval):
+                        return
+                else:
+                    logger.debug('Journal: %d events, %d claims updated', len(events), updated)
+                    break
+
+    def stop(self):
+        """
+        Остановка :meth:`follow`
+        """
+        if self.consumer is not None:
+            self.consumer.stop()
+
+    def get(self, claim_id):
+        """
+        Заявка по идентификатору
+
+        :param str claim_id: Идентификатор заявки
+
+        :rtype: Optional[SearchedClaimMP]
+        """
+        with self._lock:
+            row = self.connection.execute('SELECT body FROM claims WHERE id = ?', (claim_id,)).fetchone()
+        return SearchedClaimMP.from_response(json.loads(row[0])) if row else None
+
+    def query(self, status=None, created_from=None, created_to=None, external_order_id=None, limit=None):
+        """
+
+        Поиск заявок в локальной копии. Заявки отсортированы по времени создания
+
+        :param status: Статус или список статусов
+        :param str created_from: Время создания от (ISO 8601, включительно)
+        :param str created_to: Время создания до (ISO 8601, не включительно)
+        :param str external_order_id: Номер заказа клиента в одной из точек маршрута
+        :param int limit: Максимальное количество заявок
+
+        :rtype: List[SearchedClaimMP]
+        """
+        where, args = [], []
+        if status is not None:
+            statuses = [status] if isinstance(status, str) else list(status)
+            where.append('status IN ({})'.format(','.join('?' * len(statuses))))
+            args.extend(statuses)
+        if created_from is not None:
+            where.append('created_ts >= ?')
+            args.append(created_from)
+        if created_to is not None:
+            where.append('created_ts < ?')
+            args.append(created_to)
+        if external_order_id is not None:
+            where.append('id IN (SELECT claim_id FROM claim_orders WHERE external_order_id = ?)')
+            args.append(external_order_id)
+        sql = 'SELECT body FROM claims'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY created_ts'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            args.append(limit)
+        with self._lock:
+            rows = self.connection.execute(sql, args).fetchall()
+        return [SearchedClaimMP.from_response(json.loads(row[0])) for row in rows]
+
+    def count(self, status=None):
+        """
+        Количество заявок
+
+        :param status: Статус или список статусов
+
+        :rtype: int
+        """
+        if status is None:
+            sql, args = 'SELECT COUNT(*) FROM claims', []
+        else:
+            args = [status] if isinstance(status, str) else list(status)
+            sql = 'SELECT COUNT(*) FROM claims WHERE status IN ({})'.format(','.join('?' * len(args)))
+        with self._lock:
+            return self.connection.execute(sql, args).fetchone()[0]
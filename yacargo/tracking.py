@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+Модуль с отслеживанием положения исполнителей по множеству заявок
+"""
+import logging
+import math
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+from yacargo.exceptions import BaseAPIError, NetworkAPIError, NotAuthorized
+
+logger = logging.getLogger('yaCargo')
+
+EARTH_RADIUS = 6371000.0
+
+
+def distance(lat1, lon1, lat2, lon2):
+    """
+    Расстояние по поверхности Земли (гаверсинус)
+
+    :param float lat1: Широта первой точки
+    :param float lon1: Долгота первой точки
+    :param float lat2: Широта второй точки
+    :param float lon2: Долгота второй точки
+
+    :return: Расстояние в метрах
+    :rtype: float
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(a))
+
+
+class PositionTracker:
+    """
+
+    Отслеживание исполнителей по многим заявкам сразу.
+
+    Положения запрашиваются через ``performer_position`` параллельно в ``max_workers`` потоков,
+    у каждой заявки свой интервал опроса: ``max_interval`` для стоящего исполнителя (скорость меньше ``idle_speed``),
+    ``min_interval`` рядом (ближе ``near_distance``) с непосещенными точками маршрута,
+    в остальных случаях - половина времени пути до этой зоны.
+
+    Между опросами положение экстраполируется по скорости и направлению из последнего ответа.
+
+        >>> tracker = PositionTracker(ya)
+        >>> for claim in ya.iter_search_active():
+        >>>     tracker.track(claim)
+        >>> threading.Thread(target=tracker.run, daemon=True).start()
+        >>> tracker.positions()
+
+    Последние координаты хранятся в массивах ``array('d')``, а не в отдельном объекте на каждую заявку.
+
+    :param YCAPI api: Клиент API
+    :param int max_workers: Количество параллельных запросов
+    :param float min_interval: Минимальный интервал опроса заявки в секундах
+    :param float max_interval: Максимальный интервал опроса заявки в секундах
+    :param float idle_speed: Скорость (м/с), ниже которой исполнитель считается стоящим
+    :param float near_distance: Расстояние (м) до точки маршрута, на котором опрос максимально частый
+    """
+
+    def __init__(self, api, max_workers=16, min_interval=5.0, max_interval=60.0, idle_speed=0.5, near_distance=500.0):
+        self.api = api
+        self.max_workers = max_workers
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.idle_speed = idle_speed
+        self.near_distance = near_distance
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._slots = {}
+        self._free = []
+        self._claims = []
+        self._targets = []
+        self._responses = []
+        self._lat = array('d')
+        self._lon = array('d')
+        self._speed = array('d')
+        self._direction = array('d')
+        self._timestamp = array('d')
+        self._next_poll = array('d')
+
+    def __len__(self):
+        return len(self._slots)
+
+    def track(self, claim, targets=None):
+        """
+
+        Добавление заявки
+
+        :param claim: Заявка (SearchedClaimMP) или ее идентификатор
+        :param targets: Координаты (lon, lat) точек, рядом с которыми опрашивать чаще.
+            По умолчанию - непосещенные точки маршрута заявки
+        """
+        claim_id = claim if isinstance(claim, str) else claim.id
+        if targets is None and not isinstance(claim, str):
+            targets = [tuple(point.get('address', {}).get('coordinates') or ())
+                       for point in claim.json().get('route_points') or ()
+                       if point.get('visit_status') != 'visited']
+        targets = [target for target in targets or () if len(target) == 2]
+        with self._lock:
+            slot = self._slots.get(claim_id)
+            if slot is None:
+                slot = self._free.pop() if self._free else self._grow()
+                self._slots[claim_id] = slot
+                self._claims[slot] = claim_id
+                self._responses[slot] = None
+                for column in (self._lat, self._lon, self._speed, self._direction, self._timestamp):
+                    column[slot] = math.nan
+                self._next_poll[slot] = 0.0
+            self._targets[slot] = targets
+
+    def _grow(self):
+        for column in (self._lat, self._lon, self._speed, self._direction, self._timestamp, self._next_poll):
+            column.append(math.nan)
+        self._claims.append(None)
+        self._targets.append(None)
+        self._responses.append(None)
+        return len(self._claims) - 1
+
+    def untrack(self, claim_id):
+        """
+        Удаление заявки
+
+        :param str claim_id: Идентификатор заявки
+        """
+        with self._lock:
+            slot = self._slots.pop(claim_id, None)
+            if slot is not None:
+                self._claims[slot] = None
+                self._targets[slot] = None
+                self._responses[slot] = None
+                self._free.append(slot)
+
+    def due(self, now=None):
+        """
+        Заявки, которые пора опросить
+
+        :param float now: Время (time.time)
+
+        :rtype: List[str]
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            return [claim_id for claim_id, slot in self._slots.items() if self._next_poll[slot] <= now]
+
+    def poll(self, now=None):
+        """
+
+        Один цикл опроса: запрос положения по всем заявкам, у которых подошло время
+
+        :param float now: Время (time.time)
+
+        :return: Количество запрошенных заявок
+        :rtype: int
+        """
+        claim_ids = self.due(now)
+        if not claim_ids:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(claim_ids))) as executor:
+            results = list(executor.map(self._fetch, claim_ids))
+        now = time.time() if now is None else now
+        for claim_id, response in zip(claim_ids, results):
+            self._update(claim_id, response, now)
+        return len(claim_ids)
+
+    def _fetch(self, claim_id):
+        try:
+            return self.api.performer_position(claim_id=claim_id)
+        except (NetworkAPIError, BaseAPIError, NotAuthorized) as exception:
+            logger.warning('performer_position for %s failed: %r', claim_id, exception)
+            return None
+
+    def _update(self, claim_id, response, now):
+        with self._lock:
+            slot = self._slots.get(claim_id)
+            if slot is None:
+                return
+            if response is None:
+                self._next_poll[slot] = now + self.max_interval
+                return
+            position = response.json().get('position') or {}
+            self._responses[slot] = response
+            self._lat[slot] = position.get('lat', math.nan)
+            self._lon[slot] = position.get('lon', math.nan)
+            self._speed[slot] = position.get('speed') or 0.0
+            self._direction[slot] = position.get('direction', math.nan)
+            self._timestamp[slot] = position.get('timestamp', now)
+            self._next_poll[slot] = now + self._interval(slot)
+
+    def _interval(self, slot):
+        """
+        Интервал до следующего опроса заявки
+
+        :rtype: float
+        """
+        speed = self._speed[slot]
+        if speed < self.idle_speed:
+            return self.max_interval
+        targets = self._targets[slot]
+        if not targets:
+            return self.min_interval
+        lat, lon = self._lat[slot], self._lon[slot]
+        nearest = min(distance(lat, lon, target[1], target[0]) for target in targets)
+        if nearest <= self.near_distance:
+            return self.min_interval
+        return min(self.max_interval, max(self.min_interval, (nearest - self.near_distance) / speed / 2))
+
+    def latest(self, claim_id):
+        """
+        Последний ответ performer_position по заявке
+
+        :param str claim_id: Идентификатор заявки
+
+        :rtype: Optional[PerformerPositionResponse]
+        """
+        with self._lock:
+            slot = self._slots.get(claim_id)
+            return None if slot is None else self._responses[slot]
+
+    def position(self, claim_id, at=None):
+        """
+
+        Положение исполнителя, экстраполированное на момент ``at`` по скорости и направлению.
+        Экстраполяция не дальше ``max_interval`` секунд от последнего сигнала GPS.
+
+        :param str claim_id: Идентификатор заявки
+        :param float at: Время (time.time), по умолчанию - текущее
+
+        :return: Широта и долгота или None, если положение еще не известно
+        :rtype: Optional[tuple]
+        """
+        at = time.time() if at is None else at
+        with self._lock:
+            slot = self._slots.get(claim_id)
+            if slot is None:
+                return None
+            return self._extrapolate(slot, at)
+
+    def positions(self, at=None):
+        """
+        Положения исполнителей по всем заявкам (см. :meth:`position`)
+
+        :param float at: Время (time.time), по умолчанию - текущее
+
+        :return: claim_id => (широта, долгота)
+        :rtype: dict
+        """
+        at = time.time() if at is None else at
+        with self._lock:
+            result = {claim_id: self._extrapolate(slot, at) for claim_id, slot in self._slots.items()}
+        return {claim_id: position for claim_id, position in result.items() if position is not None}
+
+    def _extrapolate(self, slot, at):
+        lat, lon = self._lat[slot], self._lon[slot]
+        if math.isnan(lat) or math.isnan(lon):
+            return None
+        direction = self._direction[slot]
+        elapsed = min(max(0.0, at - self._timestamp[slot]), self.max_interval)
+        if math.isnan(direction) or not elapsed:
+            return lat, lon
+        moved = self._speed[slot] * elapsed
+        angle = math.radians(direction)
+        lat_moved = lat + math.degrees(moved * math.cos(angle) / EARTH_RADIUS)
+        lon_moved = lon + math.degrees(moved * math.sin(angle) / (EARTH_RADIUS * math.cos(math.radians(lat))))
+        return lat_moved, lon_moved
+
+    def run(self, tick=1.0):
+        """
+        Опрос, пока не вызван :meth:`stop`
+
+        :param float tick: Пауза между проверками, пора ли опрашивать, в секундах
+        """
+        while not self._stopped.is_set():
+            self.poll()
+            self._stopped.wait(tick)
+
+    def stop(self):
+        """
+        Остановка :meth:`run`
+        """
+        self._stopped.set()